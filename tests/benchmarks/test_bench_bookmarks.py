@@ -0,0 +1,87 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      tests/benchmarks/test_bench_bookmarks.py
+#
+##################################################################################
+"""
+
+import itertools
+
+import pytest
+
+from websiteapp.bookmarks import BookmarkManager
+
+SIZES = [10, 1000, 10000, 100000]
+# Operations writing the whole file get fewer rounds on big collections.
+WRITE_ROUNDS = 5
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f'{size}')
+def populated(request, storage_path, populate):
+    manager = BookmarkManager(storage_path)
+    populate(manager, request.param)
+    return manager, request.param
+
+
+@pytest.mark.benchmark(group='bookmarks-exists')
+def test_exists(benchmark, populated):
+    manager, size = populated
+    urls = itertools.cycle([f'https://example.com/page/{size // 2}', 'https://example.com/missing'])
+    benchmark(lambda: manager.exists(next(urls)))
+
+
+@pytest.mark.benchmark(group='bookmarks-get-all')
+def test_get_all(benchmark, populated):
+    manager, size = populated
+    assert len(benchmark(manager.get_all)) == size
+
+
+@pytest.mark.benchmark(group='bookmarks-add')
+def test_add(benchmark, populated):
+    manager, _size = populated
+    counter = itertools.count()
+    benchmark.pedantic(lambda: manager.add(f'https://example.com/new/{next(counter)}', 'New'),
+                       rounds=WRITE_ROUNDS, iterations=1)
+
+
+@pytest.mark.benchmark(group='bookmarks-remove')
+def test_remove(benchmark, populated):
+    manager, _size = populated
+    counter = itertools.count()
+    benchmark.pedantic(lambda: manager.remove(f'https://example.com/page/{next(counter)}'),
+                       rounds=WRITE_ROUNDS, iterations=1)
+
+
+@pytest.mark.benchmark(group='bookmarks-load')
+def test_load(benchmark, populated):
+    manager, size = populated
+    reloaded = benchmark.pedantic(BookmarkManager, args=(manager.storage_path,), rounds=WRITE_ROUNDS, iterations=1)
+    assert len(reloaded.get_all()) == size
+
+
+@pytest.mark.benchmark(group='bookmarks-refresh')
+def test_refresh_unchanged(benchmark, populated):
+    # Picking up changes of other instances must cost a stat() only when nothing changed.
+    manager, _size = populated
+    assert not benchmark(manager.refresh)
+
+
+@pytest.mark.benchmark(group='bookmarks-add-many')
+@pytest.mark.parametrize('size', SIZES, ids=lambda size: f'{size}')
+def test_add_many(benchmark, tmp_path_factory, size):
+    entries = [(f'https://example.com/page/{idx}', f'Page {idx}', None) for idx in range(size)]
+
+    def setup():
+        return (BookmarkManager(str(tmp_path_factory.mktemp('bookmarks'))), entries), {}
+
+    benchmark.pedantic(lambda manager, items: manager.add_many(items), setup=setup,
+                       rounds=WRITE_ROUNDS, iterations=1)
@@ -0,0 +1,61 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      tests/benchmarks/test_bench_utils.py
+#
+##################################################################################
+"""
+
+import sys
+
+import pytest
+
+from websiteapp.utils import Utils
+
+URLS = [
+    'https://www.example.com/path/to/page?query=1&other=2#fragment',
+    'http://localhost:8080/app',
+    'http://[::1]:8080/',
+    'not a url at all, just some text copied to the clipboard',
+    'https://' + 'a' * 2000,
+]
+
+
+@pytest.mark.benchmark(group='url-validation')
+@pytest.mark.parametrize('url', URLS, ids=['typical', 'localhost', 'ipv6', 'text', 'long'])
+def test_is_valid_url(benchmark, url):
+    benchmark(Utils.is_valid_url, url)
+
+
+@pytest.mark.benchmark(group='url-validation')
+def test_is_valid_url_long_text(benchmark):
+    # Big clipboard content must not cause catastrophic regex backtracking.
+    text = 'http://' + 'a-' * 50000
+    assert not benchmark(Utils.is_valid_url, text)
+
+
+@pytest.mark.benchmark(group='geometry')
+def test_parse_geometry(benchmark):
+    assert benchmark(Utils.parse_geometry, '1920x1080+100+200') == (100, 200, 1920, 1080)
+
+
+@pytest.mark.benchmark(group='args')
+def test_handle_args(benchmark, monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['webapp', '--profile', 'work', '--name', 'My App', '--tabs',
+                                      '--internal-host', 'a.example.com', 'https://example.com'])
+    assert benchmark(Utils.handle_args).profile == 'work'
+
+
+@pytest.mark.benchmark(group='profile-name')
+@pytest.mark.parametrize('name', ['default', 'work/private:2024 *new*', 'x' * 1000],
+                         ids=['plain', 'special', 'long'])
+def test_sanitize_profile_name(benchmark, name):
+    benchmark(Utils.sanitize_profile_name, name)
@@ -0,0 +1,47 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      tests/conftest.py
+#
+##################################################################################
+"""
+
+import os
+import time
+
+import pytest
+
+# Tests cover non-GUI code only, but modules import Qt, so make sure no display is needed.
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from websiteapp.bookmarks import BookmarkManager  # noqa: E402
+
+
+@pytest.fixture
+def storage_path(tmp_path) -> str:
+    return str(tmp_path)
+
+
+@pytest.fixture
+def bookmark_manager(storage_path) -> BookmarkManager:
+    return BookmarkManager(storage_path)
+
+
+@pytest.fixture
+def populate():
+    """
+    Returns function adding `count` bookmarks to the manager with a single file write.
+    """
+    def _populate(manager: BookmarkManager, count: int) -> None:
+        now = time.time()
+        manager.add_many((f'https://example.com/page/{idx}', f'Page {idx}', now) for idx in range(count))
+
+    return _populate
@@ -0,0 +1,176 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      tests/test_bookmarks.py
+#
+##################################################################################
+"""
+
+import io
+import json
+import os
+
+from hypothesis import example, given, settings, strategies as st
+
+from websiteapp.bookmarks import BookmarkManager
+from websiteapp.bookmarks_io import BookmarksIO
+
+urls = st.text(min_size=1, max_size=200)
+titles = st.one_of(st.none(), st.text(max_size=100))
+
+
+def test_add_exists_remove(bookmark_manager):
+    assert not bookmark_manager.exists('https://example.com/')
+    assert bookmark_manager.add('https://example.com/', 'Example')
+    assert not bookmark_manager.add('https://example.com/', 'Example again')
+    assert bookmark_manager.exists('https://example.com/')
+    assert [bookmark['title'] for bookmark in bookmark_manager.get_all()] == ['Example']
+
+    assert bookmark_manager.remove('https://example.com/')
+    assert not bookmark_manager.remove('https://example.com/')
+    assert not bookmark_manager.exists('https://example.com/')
+    assert bookmark_manager.get_all() == []
+
+
+def test_title_defaults_to_url(bookmark_manager):
+    bookmark_manager.add('https://example.com/')
+    assert bookmark_manager.get_all()[0]['title'] == 'https://example.com/'
+
+
+def test_persisted(storage_path, bookmark_manager):
+    bookmark_manager.add('https://a.example.com/', 'A')
+    bookmark_manager.add('https://b.example.com/', 'B')
+    bookmark_manager.remove('https://a.example.com/')
+
+    reloaded = BookmarkManager(storage_path)
+    assert [bookmark['url'] for bookmark in reloaded.get_all()] == ['https://b.example.com/']
+
+
+def test_deferred_save(storage_path):
+    saves = []
+    manager = BookmarkManager(storage_path, defer_save=saves.append)
+    manager.add('https://a.example.com/', 'A')
+    manager.add('https://b.example.com/', 'B')
+    assert len(saves) == 2
+    assert manager.exists('https://a.example.com/')
+    assert not os.path.exists(manager.bookmarks_file)
+
+    saves[-1]()
+    reloaded = BookmarkManager(storage_path)
+    urls = sorted(bookmark['url'] for bookmark in reloaded.get_all())
+    assert urls == ['https://a.example.com/', 'https://b.example.com/']
+
+
+def test_legacy_format_is_read(storage_path):
+    with open(os.path.join(storage_path, 'bookmarks.json'), 'w', encoding='utf-8') as f:
+        json.dump([{'url': 'https://example.com/', 'title': 'Example', 'added': '2024-01-01T00:00:00'}], f)
+
+    manager = BookmarkManager(storage_path)
+    assert manager.exists('https://example.com/')
+
+
+def test_changes_of_other_instance_are_merged(storage_path):
+    first = BookmarkManager(storage_path)
+    second = BookmarkManager(storage_path)
+    first.add('https://a.example.com/')
+    second.add('https://b.example.com/')
+    first.remove('https://b.example.com/')
+
+    urls_seen = {bookmark['url'] for bookmark in BookmarkManager(storage_path).get_all()}
+    assert urls_seen == {'https://a.example.com/'}
+    assert not second.exists('https://b.example.com/')
+
+
+def test_import_skips_removed_bookmarks(bookmark_manager):
+    bookmark_manager.add('https://a.example.com/', 'A')
+    bookmark_manager.add('https://b.example.com/', 'B')
+    bookmark_manager.remove('https://b.example.com/')
+    with open(bookmark_manager.bookmarks_file, 'r', encoding='utf-8') as f:
+        assert any(entry.get('deleted') for entry in json.load(f)['bookmarks'])
+        f.seek(0)
+        assert [bookmark[:2] for bookmark in BookmarksIO.read_json(f)] == [('https://a.example.com/', 'A')]
+
+
+def test_json_import_keeps_order_and_skips_non_web_urls():
+    chrome = {'roots': {
+        'bookmark_bar': {'type': 'folder', 'children': [
+            {'type': 'url', 'url': 'https://a.example.com/', 'name': 'A'},
+            {'type': 'folder', 'children': [
+                {'type': 'url', 'url': 'javascript:alert(1)', 'name': 'Bookmarklet'},
+                {'type': 'url', 'url': 'https://b.example.com/', 'name': 'B'},
+            ]},
+        ]},
+        'other': {'type': 'folder', 'children': [{'type': 'url', 'url': 'http://c.example.com/', 'name': 'C'}]},
+    }}
+    bookmarks = BookmarksIO.read_json(io.StringIO(json.dumps(chrome)))
+    assert [bookmark[:2] for bookmark in bookmarks] == [
+        ('https://a.example.com/', 'A'), ('https://b.example.com/', 'B'), ('http://c.example.com/', 'C')]
+
+    firefox = {'type': 'text/x-moz-place-container', 'children': [
+        {'type': 'text/x-moz-place', 'uri': 'place:sort=8&maxResults=10', 'title': 'Most Visited'},
+        {'type': 'text/x-moz-place', 'uri': 'https://d.example.com/', 'title': 'D'},
+    ]}
+    bookmarks = BookmarksIO.read_json(io.StringIO(json.dumps(firefox)))
+    assert [bookmark[:2] for bookmark in bookmarks] == [('https://d.example.com/', 'D')]
+
+
+def test_html_import_skips_non_web_urls():
+    content = ('<DL><p>\n<DT><A HREF="javascript:void(0)">Bookmarklet</A>\n'
+               '<DT><A HREF="place:folder=TOOLBAR">Toolbar</A>\n'
+               '<DT><A HREF="https://a.example.com/">A</A>\n</DL>')
+    assert [bookmark[:2] for bookmark in BookmarksIO.read_html(io.StringIO(content))] == [
+        ('https://a.example.com/', 'A')]
+
+
+def test_add_many_skips_duplicates(bookmark_manager, populate):
+    populate(bookmark_manager, 10)
+    added, skipped = bookmark_manager.add_many([
+        ('https://example.com/page/1', 'Dupe', None),
+        ('https://example.com/new', 'New', None),
+        ('https://example.com/new', 'New dupe', None),
+    ])
+    assert (added, skipped) == (1, 2)
+    assert len(bookmark_manager.get_all()) == 11
+
+
+@settings(max_examples=50, deadline=None)
+@given(entries=st.lists(st.tuples(urls, titles), max_size=20))
+def test_roundtrip(tmp_path_factory, entries):
+    storage_path = str(tmp_path_factory.mktemp('bookmarks'))
+    manager = BookmarkManager(storage_path)
+    expected = {}
+    for url, title in entries:
+        if manager.add(url, title):
+            expected[url] = title if title else url
+
+    reloaded = BookmarkManager(storage_path)
+    assert {bookmark['url']: bookmark['title'] for bookmark in reloaded.get_all()} == expected
+
+
+@settings(max_examples=100, deadline=None)
+@given(content=st.one_of(
+    st.binary(max_size=200),
+    st.recursive(st.none() | st.booleans() | st.integers() | st.text(max_size=20),
+                 lambda children: st.lists(children, max_size=5) | st.dictionaries(st.text(max_size=10), children, max_size=5),
+                 max_leaves=20).map(lambda data: json.dumps(data).encode()),
+))
+@example(content=b'{"bookmarks": 5}')
+@example(content=b'{"generation": "x", "bookmarks": []}')
+@example(content=b'[{"url": ["not", "a", "string"]}, {"url": "https://example.com/x", "modified": "now"}]')
+def test_malformed_file_does_not_crash(tmp_path_factory, content):
+    storage_path = str(tmp_path_factory.mktemp('bookmarks'))
+    with open(os.path.join(storage_path, 'bookmarks.json'), 'wb') as f:
+        f.write(content)
+
+    manager = BookmarkManager(storage_path)
+    assert isinstance(manager.get_all(), list)
+    manager.add('https://example.com/')
+    assert manager.exists('https://example.com/')
@@ -0,0 +1,33 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      tests/test_clipboard.py
+#
+##################################################################################
+"""
+
+import pytest
+
+from websiteapp.clipboard import ClipboardWatcher
+
+
+@pytest.mark.parametrize('formats, expected', [
+    (['text/plain'], True),
+    (['TARGETS', 'UTF8_STRING', 'text/plain;charset=utf-8'], True),
+    (['text/plain', 'text/uri-list', 'text/x-moz-url'], True),
+    ([], False),
+    (['UTF8_STRING'], False),
+    (['text/plain', 'text/html'], False),
+    (['text/plain', 'image/png'], False),
+    (['text/plain', 'application/vnd.oasis.opendocument.text'], False),
+])
+def test_is_url_candidate(formats, expected):
+    assert ClipboardWatcher.is_url_candidate(formats) is expected
@@ -0,0 +1,52 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      tests/test_history.py
+#
+##################################################################################
+"""
+
+import os
+import sqlite3
+from contextlib import closing
+
+from websiteapp.history import HistoryStore
+
+
+def auto_vacuum(db_file: str) -> int:
+    with closing(sqlite3.connect(db_file)) as db:
+        return db.execute('PRAGMA auto_vacuum').fetchone()[0]
+
+
+def test_new_database_uses_incremental_vacuum(storage_path):
+    store = HistoryStore(storage_path)
+    store.record_visit('https://example.com/', 'Example')
+    store.close()
+    assert auto_vacuum(store.db_file) == 2
+    assert [entry['url'] for entry in HistoryStore(storage_path).query('example')] == ['https://example.com/']
+
+
+def test_existing_database_is_converted(storage_path):
+    db_file = os.path.join(storage_path, HistoryStore.FILE_NAME)
+    with closing(sqlite3.connect(db_file)) as db:
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute("CREATE TABLE urls (id INTEGER PRIMARY KEY, url TEXT NOT NULL UNIQUE, title TEXT NOT NULL DEFAULT '', "
+                   'visit_count INTEGER NOT NULL DEFAULT 0, first_visit REAL NOT NULL, last_visit REAL NOT NULL)')
+        db.execute("INSERT INTO urls (url, title, visit_count, first_visit, last_visit) "
+                   "VALUES ('https://example.com/', 'Example', 1, 0, 0)")
+        db.commit()
+    assert auto_vacuum(db_file) == 0
+
+    store = HistoryStore(storage_path, max_age_days=100000)
+    store.close()
+    assert auto_vacuum(db_file) == 2
+    with closing(sqlite3.connect(db_file)) as db:
+        assert db.execute('SELECT COUNT(*) FROM urls').fetchone()[0] == 1
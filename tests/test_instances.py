@@ -0,0 +1,113 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      tests/test_instances.py
+#
+##################################################################################
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from websiteapp.commands import Commands
+from websiteapp.instances import InstanceRegistry
+from websiteapp.utils import Utils
+
+
+@pytest.fixture
+def registry(tmp_path) -> InstanceRegistry:
+    return InstanceRegistry(str(tmp_path))
+
+
+def dead_pid() -> int:
+    """Returns PID of a process that already exited."""
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def write_record(registry: InstanceRegistry, record) -> str:
+    os.makedirs(registry.registry_dir, exist_ok=True)
+    record_file = os.path.join(registry.registry_dir, f'{record["pid"] if isinstance(record, dict) else "x"}.json')
+    with open(record_file, 'w', encoding='utf-8') as f:
+        json.dump(record, f)
+    return record_file
+
+
+def test_publish_and_unpublish(registry):
+    registry.publish({'profile': 'work', 'url': 'https://example.com/', 'started': 1.0})
+    registry.publish({'profile': 'work', 'url': 'https://example.com/inbox', 'started': 1.0})
+    records = registry.running()
+    assert len(records) == 1
+    assert records[0]['pid'] == os.getpid()
+    assert records[0]['url'] == 'https://example.com/inbox'
+    assert not [name for name in os.listdir(registry.registry_dir) if name.endswith('.tmp')]
+
+    registry.unpublish()
+    registry.unpublish()
+    assert registry.running() == []
+
+
+def test_stale_records_are_removed(registry):
+    stale_file = write_record(registry, {'pid': dead_pid(), 'profile': 'gone'})
+    broken_file = write_record(registry, [1, 2, 3])
+    registry.publish({'profile': 'work'})
+
+    assert [record['profile'] for record in registry.running()] == ['work']
+    assert not os.path.exists(stale_file)
+    assert not os.path.exists(broken_file)
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='Process start time is read from /proc')
+def test_reused_pid_is_not_mistaken_for_instance(registry):
+    start = InstanceRegistry.process_start(os.getpid())
+    assert start is not None
+    # Our PID, but the process that published the record started at a different time.
+    write_record(registry, {'pid': os.getpid(), 'process_start': start - 1, 'profile': 'old'})
+    assert registry.running() == []
+
+
+def test_find(registry):
+    registry.publish({'profile': 'work'})
+    assert len(registry.find('work')) == 1
+    assert len(registry.find(str(os.getpid()))) == 1
+    assert len(registry.find()) == 1
+    assert registry.find('home') == []
+
+
+def test_instance_commands_do_not_load_qt(tmp_path):
+    code = ('import sys\n'
+            'from websiteapp.commands import Commands\n'
+            'assert Commands.run(["list"]) == 0\n'
+            'assert not [name for name in sys.modules if name.startswith(("PySide6", "PyQt5"))]\n')
+    env = {**os.environ, 'XDG_RUNTIME_DIR': str(tmp_path)}
+    subprocess.run([sys.executable, '-c', code], env=env, check=True, capture_output=True)
+
+
+def test_profile_of_running_instance_is_not_locked(monkeypatch, tmp_path):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+    lock = Commands.lock_profile('work')
+    assert lock is not None
+    lock.release()
+
+    # Instance started with --allow-multiple does not hold the lock, but is in the registry.
+    registry = InstanceRegistry(Utils.get_runtime_dir())
+    registry.publish({'profile': 'work'})
+    assert Commands.lock_profile('work') is None
+    lock = Commands.lock_profile('home')
+    assert lock is not None
+    lock.release()
+    registry.unpublish()
@@ -0,0 +1,44 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      tests/test_log.py
+#
+##################################################################################
+"""
+
+import logging
+
+import pytest
+
+from websiteapp.log import Log
+
+
+@pytest.fixture
+def root():
+    yield
+    logger = logging.getLogger(Log.ROOT)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    Log.ring = None
+
+
+def test_ring_keeps_debug_records_regardless_of_level(root, storage_path):
+    Log.setup(level='warning')
+    log_file = Log.add_file(storage_path)
+    log = logging.getLogger(f'{Log.ROOT}.test')
+    log.debug('debug details')
+    log.warning('something is off')
+
+    dumped = Log.ring.dump()
+    assert [line.split(': ', 1)[1] for line in dumped] == ['debug details', 'something is off']
+    with open(log_file, 'r', encoding='utf-8') as f:
+        assert [line.rstrip('\n').split(': ', 1)[1] for line in f] == ['something is off']
@@ -0,0 +1,159 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      tests/test_notifications.py
+#
+##################################################################################
+"""
+
+from datetime import datetime, time
+from typing import List, Tuple
+
+import pytest
+from PySide6.QtCore import QObject, QUrl, Signal
+from PySide6.QtWidgets import QApplication
+
+from websiteapp.notifications import NotificationCenter, QuietHours
+
+
+class StubTrayIcon(QObject):
+    messageClicked = Signal()  # noqa: N815 - Qt API
+
+    def __init__(self):
+        super().__init__()
+        self.messages: List[Tuple[str, str]] = []
+
+    def icon(self):
+        return None
+
+    def showMessage(self, title, message, _icon, _timeout):  # noqa: N802 - Qt API
+        self.messages.append((title, message))
+
+
+class StubNotification(QObject):
+    """Stands for QWebEngineNotification, which needs running engine."""
+
+    closed = Signal()
+
+    def __init__(self, origin: str, title: str, message: str = '', tag: str = ''):
+        super().__init__()
+        self._origin = QUrl(origin)
+        self._title = title
+        self._message = message
+        self._tag = tag
+        self.shown = False
+
+    def origin(self) -> QUrl:
+        return self._origin
+
+    def title(self) -> str:
+        return self._title
+
+    def message(self) -> str:
+        return self._message
+
+    def tag(self) -> str:
+        return self._tag
+
+    def show(self) -> None:
+        self.shown = True
+
+    def click(self) -> None:
+        pass
+
+
+class AlwaysQuiet:
+    def is_quiet(self) -> bool:
+        return True
+
+    def seconds_left(self) -> float:
+        return 3600
+
+
+@pytest.fixture
+def tray():
+    QApplication.instance() or QApplication([])
+    return StubTrayIcon()
+
+
+@pytest.fixture
+def center(tray, monkeypatch):
+    monkeypatch.setattr(NotificationCenter, 'BURST_WINDOW_MS', 0)
+    return NotificationCenter(tray, 'App', rate_limit=2)
+
+
+def test_burst_is_coalesced(center, tray):
+    for idx in range(3):
+        center.present(StubNotification('https://chat.example.com', f'Message {idx}', 'text'))
+    center.deliver()
+    assert tray.messages == [('3 new notifications from App', 'Message 2: text')]
+
+
+def test_same_tag_replaces_pending_and_duplicates_are_dropped(center, tray):
+    center.present(StubNotification('https://chat.example.com', 'Old', tag='thread'))
+    center.present(StubNotification('https://chat.example.com', 'New', tag='thread'))
+    center.deliver()
+    assert tray.messages == [('New', '')]
+
+    duplicate = StubNotification('https://chat.example.com', 'New', tag='thread')
+    center.present(duplicate)
+    center.deliver()
+    assert len(tray.messages) == 1 and not duplicate.shown
+
+
+def test_rate_limit_is_per_origin(center, tray):
+    for idx in range(3):
+        center.present(StubNotification('https://a.example.com', f'A{idx}'))
+        center.deliver()
+    assert tray.messages == [('A0', ''), ('A1', '')]
+    # A is held back for up to a minute, which must not delay B.
+    assert center._timer.remainingTime() > 50 * 1000
+
+    center.present(StubNotification('https://b.example.com', 'B'))
+    assert center._timer.remainingTime() <= 100
+    center.deliver()
+    assert tray.messages[-1] == ('B', '')
+    assert center._timer.remainingTime() > 50 * 1000
+
+
+def test_quiet_hours_hold_notifications(tray, monkeypatch):
+    monkeypatch.setattr(NotificationCenter, 'BURST_WINDOW_MS', 0)
+    center = NotificationCenter(tray, 'App', quiet_hours=AlwaysQuiet())
+    center.present(StubNotification('https://chat.example.com', 'Late'))
+    center.deliver()
+    assert tray.messages == []
+    assert center._timer.remainingTime() > 3500 * 1000
+
+    center.quiet_hours = None
+    center.deliver()
+    assert tray.messages == []
+    center._due = {origin: 0.0 for origin in center._due}
+    center.deliver()
+    assert tray.messages == [('Late', '')]
+
+
+@pytest.mark.parametrize('now, expected', [
+    (datetime(2024, 1, 1, 21, 59), False),
+    (datetime(2024, 1, 1, 22, 0), True),
+    (datetime(2024, 1, 1, 23, 30), True),
+    (datetime(2024, 1, 2, 0, 0), True),
+    (datetime(2024, 1, 2, 6, 59), True),
+    (datetime(2024, 1, 2, 7, 0), False),
+    (datetime(2024, 1, 2, 12, 0), False),
+])
+def test_quiet_hours_past_midnight(now, expected):
+    assert QuietHours(time(22, 0), time(7, 0)).is_quiet(now) is expected
+
+
+def test_quiet_hours_seconds_left():
+    quiet_hours = QuietHours(time(22, 0), time(7, 0))
+    assert quiet_hours.seconds_left(datetime(2024, 1, 1, 23, 0)) == 8 * 3600
+    assert quiet_hours.seconds_left(datetime(2024, 1, 2, 6, 30)) == 30 * 60
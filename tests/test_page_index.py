@@ -0,0 +1,121 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      tests/test_page_index.py
+#
+##################################################################################
+"""
+
+import sqlite3
+from contextlib import closing
+
+import pytest
+from hypothesis import given, strategies as st
+
+from websiteapp.page_index import PageIndex
+
+
+def index_pages(storage_path, pages, **kwargs) -> PageIndex:
+    """Indexes given (url, title, text) pages and returns reopened index."""
+    index = PageIndex(storage_path, **kwargs)
+    for url, title, text in pages:
+        index.add(url, title, text)
+    index.close()
+    return PageIndex(storage_path, **kwargs)
+
+
+def test_search(storage_path):
+    index = index_pages(storage_path, [
+        ('https://wiki.example.com/deploy', 'Deploy', 'How to deploy the billing service to staging'),
+        ('https://wiki.example.com/oncall', 'On-call', 'Escalation policy for the billing team'),
+    ])
+    hits = index.search('billing staging')
+    assert [hit['url'] for hit in hits] == ['https://wiki.example.com/deploy']
+    assert hits[0]['title'] == 'Deploy'
+    assert '[staging]' in hits[0]['snippet']
+    # The last word is matched as prefix.
+    assert len(index.search('bill')) == 2
+    assert index.search('nothing like that') == []
+    index.close()
+
+
+def test_same_text_is_indexed_once(storage_path):
+    text = 'Ticket 1234: login page is broken'
+    index = index_pages(storage_path, [
+        ('https://tickets.example.com/1234', 'Ticket', text),
+        ('https://tickets.example.com/1234?tab=details', 'Ticket', text),
+    ])
+    assert len(index.search('broken')) == 2
+    index.close()
+    with closing(sqlite3.connect(index.db_file)) as db:
+        assert db.execute('SELECT COUNT(*) FROM contents').fetchone()[0] == 1
+
+
+def test_non_web_and_empty_pages_are_skipped(storage_path):
+    index = index_pages(storage_path, [
+        ('file:///etc/passwd', 'passwd', 'root'),
+        ('https://example.com/', 'Empty', '   '),
+    ])
+    assert index.search('root') == []
+    index.close()
+
+
+def test_size_is_bounded(storage_path):
+    pages = [(f'https://example.com/{idx}', str(idx), f'page{idx} ' + 'x' * 1000) for idx in range(20)]
+    index = index_pages(storage_path, pages, max_bytes=5000)
+    assert index.search('page0') == []
+    assert len(index.search('page19')) == 1
+    index.close()
+    with closing(sqlite3.connect(index.db_file)) as db:
+        assert db.execute('SELECT SUM(size) FROM contents').fetchone()[0] <= 5000
+        assert db.execute('SELECT COUNT(*) FROM contents_fts').fetchone()[0] == \
+            db.execute('SELECT COUNT(*) FROM contents').fetchone()[0]
+
+
+def test_shared_text_is_counted_once_when_pruning(storage_path):
+    shared = 'shared ' + 'x' * 2000
+    pages = [
+        ('https://example.com/a', 'A', shared),
+        ('https://example.com/b', 'B', shared),
+        ('https://example.com/c', 'C', 'unique c ' + 'x' * 2000),
+        ('https://example.com/d', 'D', 'unique d ' + 'x' * 2000),
+    ]
+    index = index_pages(storage_path, pages, max_bytes=5000)
+    assert index.search('shared') == []
+    assert len(index.search('unique')) == 2
+    index.close()
+    with closing(sqlite3.connect(index.db_file)) as db:
+        assert db.execute('SELECT SUM(size) FROM contents').fetchone()[0] <= 5000
+
+
+def test_uses_incremental_vacuum(storage_path):
+    index = index_pages(storage_path, [('https://example.com/', 'Example', 'Some text')])
+    index.close()
+    with closing(sqlite3.connect(index.db_file)) as db:
+        assert db.execute('PRAGMA auto_vacuum').fetchone()[0] == 2
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('', ''),
+    ('  ', ''),
+    ('billing', '"billing"*'),
+    ('billing OR "staging" NEAR(x)', '"billing" "OR" "staging" "NEAR" "x"*'),
+])
+def test_to_match(text, expected):
+    assert PageIndex.to_match(text) == expected
+
+
+@given(st.text(max_size=50))
+def test_search_never_fails(tmp_path_factory, text):
+    storage_path = str(tmp_path_factory.mktemp('index'))
+    index = index_pages(storage_path, [('https://example.com/', 'Example', 'Some text')])
+    assert isinstance(index.search(text), list)
+    index.close()
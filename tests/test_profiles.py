@@ -0,0 +1,102 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      tests/test_profiles.py
+#
+##################################################################################
+"""
+
+import json
+import os
+
+import pytest
+
+from websiteapp.bookmarks import BookmarkManager
+from websiteapp.profiles import ProfileCloner
+
+
+def write(path: str, content: str = 'x') -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+@pytest.fixture
+def source(tmp_path) -> str:
+    path = str(tmp_path / 'source')
+    write(os.path.join(path, 'Cookies'), 'cookies')
+    write(os.path.join(path, 'Local Storage', 'leveldb', '000003.log'), 'data')
+    write(os.path.join(path, 'Local Storage', 'leveldb', 'LOCK'))
+    write(os.path.join(path, 'GPUCache', 'data_0'))
+    write(os.path.join(path, 'logs', 'webapp.log'))
+    write(os.path.join(path, 'bookmarks.json.lock'))
+    write(os.path.join(path, 'Preferences'), json.dumps({
+        'download': {'default_directory': os.path.join(path, 'Downloads')},
+        'other': ['/elsewhere', path],
+    }))
+    return path
+
+
+def test_clone_skips_caches_and_locks(source, tmp_path):
+    destination = str(tmp_path / 'clone')
+    stats = ProfileCloner(source, destination).clone()
+
+    assert stats['files'] == 3
+    assert stats['skipped'] == 4
+    with open(os.path.join(destination, 'Cookies'), 'r', encoding='utf-8') as f:
+        assert f.read() == 'cookies'
+    assert os.path.exists(os.path.join(destination, 'Local Storage', 'leveldb', '000003.log'))
+    for skipped in ('GPUCache', 'logs', os.path.join('Local Storage', 'leveldb', 'LOCK')):
+        assert not os.path.exists(os.path.join(destination, skipped))
+    assert not [name for name in os.listdir(str(tmp_path)) if name.endswith('.tmp')]
+
+
+def test_clone_rewrites_preferences(source, tmp_path):
+    destination = str(tmp_path / 'clone')
+    ProfileCloner(source, destination).clone()
+
+    with open(os.path.join(destination, 'Preferences'), 'r', encoding='utf-8') as f:
+        preferences = json.load(f)
+    assert preferences['download']['default_directory'] == os.path.join(destination, 'Downloads')
+    assert preferences['other'] == ['/elsewhere', destination]
+
+
+def test_clone_compacts_bookmarks(source, tmp_path):
+    manager = BookmarkManager(source)
+    manager.add('https://example.com/', 'Example')
+    manager.add('https://removed.example.com/')
+    manager.remove('https://removed.example.com/')
+
+    destination = str(tmp_path / 'clone')
+    ProfileCloner(source, destination).clone()
+
+    with open(os.path.join(destination, 'bookmarks.json'), 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    assert 'generation' not in data
+    assert [bookmark['url'] for bookmark in data['bookmarks']] == ['https://example.com/']
+
+
+def test_clone_refuses_existing_destination(source, tmp_path):
+    destination = tmp_path / 'clone'
+    destination.mkdir()
+    with pytest.raises(IOError):
+        ProfileCloner(source, str(destination)).clone()
+
+
+def test_clone_missing_source(tmp_path):
+    with pytest.raises(IOError):
+        ProfileCloner(str(tmp_path / 'missing'), str(tmp_path / 'clone')).clone()
+
+
+@pytest.mark.parametrize('name', ['', ' ', '.', '..', 'a/b', '../work'])
+def test_check_name_invalid(name):
+    with pytest.raises(ValueError):
+        ProfileCloner.check_name(name)
@@ -0,0 +1,130 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      tests/test_scheduler.py
+#
+##################################################################################
+"""
+
+import threading
+import time
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+from PySide6.QtWidgets import QApplication, QWidget
+
+from websiteapp.scheduler import IdleScheduler
+from websiteapp.utils import Utils
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    app = QApplication.instance() or QApplication([])
+    monkeypatch.setattr(IdleScheduler, 'IDLE_AFTER_MS', 0)
+    monkeypatch.setattr(IdleScheduler, 'is_busy', staticmethod(lambda: False))
+    monkeypatch.setattr(Utils, 'is_on_ac_power', staticmethod(lambda: True))
+    window = QWidget()
+    scheduler = IdleScheduler(window)
+    yield scheduler
+    scheduler.close()
+    window.deleteLater()
+    app.processEvents()
+
+
+def wait_for(scheduler: IdleScheduler, timeout: float = 5.0) -> None:
+    """Processes events until all the started tasks are reported as finished."""
+    deadline = time.monotonic() + timeout
+    while scheduler.stats()['running'] and time.monotonic() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.01)
+
+
+def test_runs_tasks_when_idle(scheduler):
+    done = []
+    scheduler.submit('a', lambda: done.append(threading.current_thread().name))
+    scheduler.dispatch()
+    wait_for(scheduler)
+    assert len(done) == 1 and done[0].startswith('idle-task')
+    assert scheduler.stats()['run'] == 1 and scheduler.stats()['pending'] == 0
+
+
+def test_same_key_is_deduplicated(scheduler):
+    done = []
+    for idx in range(10):
+        scheduler.submit('save', lambda idx=idx: done.append(idx))
+    scheduler.dispatch()
+    wait_for(scheduler)
+    assert done == [9]
+    assert scheduler.stats()['replaced'] == 9
+
+
+def test_defers_while_not_idle(scheduler, monkeypatch):
+    monkeypatch.setattr(Utils, 'is_on_ac_power', staticmethod(lambda: False))
+    done = []
+    scheduler.submit('deferred', lambda: done.append('deferred'))
+    scheduler.submit('urgent', lambda: done.append('urgent'), max_delay=0)
+    scheduler.dispatch()
+    wait_for(scheduler)
+    assert done == ['urgent']
+    assert scheduler.stats()['pending'] == 1
+
+    # Pending tasks are run on close regardless of the conditions.
+    scheduler.close()
+    assert done == ['urgent', 'deferred']
+
+
+def test_priority_order(scheduler):
+    scheduler.workers = 1
+    done = []
+    scheduler.submit('low', lambda: done.append('low'), IdleScheduler.PRIORITY_LOW)
+    scheduler.submit('high', lambda: done.append('high'), IdleScheduler.PRIORITY_HIGH)
+    scheduler.dispatch()
+    wait_for(scheduler)
+    scheduler.dispatch()
+    wait_for(scheduler)
+    assert done == ['high', 'low']
+
+
+def test_failed_and_overrun_tasks_are_counted(scheduler):
+    def fail():
+        raise RuntimeError('boom')
+
+    scheduler.submit('fail', fail)
+    scheduler.submit('slow', lambda: time.sleep(0.05), budget_ms=1)
+    scheduler.dispatch()
+    wait_for(scheduler)
+    stats = scheduler.stats()
+    assert stats['failed'] == 1 and stats['run'] == 1 and stats['overrun'] == 1
+
+
+def test_close_waits_for_running_task_with_same_key(scheduler):
+    active = []
+    overlapped = []
+
+    def save(name):
+        overlapped.append(bool(active))
+        active.append(name)
+        time.sleep(0.1)
+        active.remove(name)
+
+    scheduler.submit('save', lambda: save('first'))
+    scheduler.dispatch()
+    scheduler.submit('save', lambda: save('second'))
+    scheduler.close()
+    assert overlapped == [False, False]
+
+
+def test_gui_thread_tasks_run_on_the_calling_thread(scheduler):
+    done = []
+    scheduler.submit('gui', lambda: done.append(threading.current_thread()), gui_thread=True)
+    scheduler.dispatch()
+    assert done == [threading.current_thread()]
+    assert scheduler.stats()['running'] == 0 and scheduler.stats()['run'] == 1
@@ -0,0 +1,70 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      tests/test_trace.py
+#
+##################################################################################
+"""
+
+import json
+import time
+
+import pytest
+
+from websiteapp.trace import Trace
+
+
+@pytest.fixture
+def trace(tmp_path, monkeypatch):
+    monkeypatch.setenv('QTWEBENGINE_CHROMIUM_FLAGS', '')
+    monkeypatch.setattr(Trace, '_events', [])
+    monkeypatch.setattr(Trace, '_open_spans', {})
+    trace_file = tmp_path / 'trace.json'
+    Trace.start(str(trace_file))
+    yield trace_file
+    Trace.finish()
+
+
+def write_chromium_trace(events) -> None:
+    with open(Trace.chromium_trace_file, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events}, f)
+
+
+def test_chromium_events_after_first_load_are_dropped(trace):
+    Trace.stop()
+    stopped_us = Trace.stopped_ns // 1000
+    write_chromium_trace([
+        {'name': 'thread_name', 'ph': 'M', 'ts': 0},
+        {'name': 'startup', 'ph': 'X', 'ts': stopped_us - 1000},
+        {'name': 'late', 'ph': 'X', 'ts': stopped_us + (Trace.STOP_MARGIN_MS + 1) * 1000},
+    ])
+    Trace.finish()
+
+    names = [event['name'] for event in json.loads(trace.read_text(encoding='utf-8'))['traceEvents']]
+    assert 'imports' in names
+    assert 'startup' in names and 'thread_name' in names
+    assert 'late' not in names
+
+
+def test_waits_for_chromium_trace(trace, monkeypatch):
+    monkeypatch.setattr(Trace, 'CHROMIUM_TRACE_DURATION', 0)
+    monkeypatch.setattr(Trace, 'CHROMIUM_WRITE_TIMEOUT', 5)
+    calls = []
+
+    def process_events():
+        calls.append(1)
+        if len(calls) == 3:
+            write_chromium_trace([])
+
+    started = time.monotonic()
+    Trace.wait_for_chromium(process_events)
+    assert len(calls) == 3
+    assert time.monotonic() - started < 5
@@ -0,0 +1,243 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      tests/test_utils.py
+#
+##################################################################################
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from datetime import time
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from websiteapp.const import Const
+from websiteapp.utils import Utils
+
+VALID_URLS = [
+    'http://example.com',
+    'https://www.example.com/path?query=1#fragment',
+    'ftp://files.example.org/pub/',
+    'http://localhost',
+    'http://localhost:8080/app',
+    'http://127.0.0.1:3000/',
+    'http://[::1]:8080/',
+    'https://sub-domain.example.co.uk/a/b',
+]
+
+INVALID_URLS = [
+    '',
+    'example.com',
+    'mailto:user@example.com',
+    'javascript:alert(1)',
+    'http://',
+    'http://example',
+    'https://example.com/with space',
+    'http://-example.com',
+    'file:///etc/passwd',
+]
+
+
+@pytest.mark.parametrize('url', VALID_URLS)
+def test_valid_urls(url):
+    assert Utils.is_valid_url(url)
+
+
+@pytest.mark.parametrize('url', INVALID_URLS)
+def test_invalid_urls(url):
+    assert not Utils.is_valid_url(url)
+
+
+@settings(max_examples=500)
+@given(st.text(max_size=300))
+def test_is_valid_url_fuzz(text):
+    result = Utils.is_valid_url(text)
+    assert isinstance(result, bool)
+    if result:
+        assert text.split('://', 1)[0] in ('http', 'https', 'ftp')
+        assert not any(char.isspace() for char in text)
+
+
+@given(host=st.from_regex(r'[a-z][a-z0-9]{0,20}(\.[a-z][a-z0-9]{0,20}){0,3}\.[a-z]{2,6}', fullmatch=True),
+       scheme=st.sampled_from(['http', 'https', 'ftp']),
+       port=st.one_of(st.none(), st.integers(min_value=1, max_value=65535)),
+       path=st.from_regex(r'(/[a-zA-Z0-9._~-]*){0,4}', fullmatch=True))
+def test_generated_urls_are_valid(scheme, host, port, path):
+    url = f'{scheme}://{host}' + (f':{port}' if port else '') + path
+    assert Utils.is_valid_url(url)
+
+
+def test_webengine_view_delegates_url_validation():
+    # Needs working QtWebEngine (system libraries), skipped otherwise
+    webengine = pytest.importorskip('websiteapp.webengine', exc_type=ImportError)
+    for url in VALID_URLS:
+        assert webengine.CustomWebEngineView.is_valid_url(url)
+    for url in INVALID_URLS:
+        assert not webengine.CustomWebEngineView.is_valid_url(url)
+
+
+# ---------------------------------------------------------------------------------------------
+
+
+def test_parse_geometry():
+    assert Utils.parse_geometry('450x600+10+20') == (10, 20, 450, 600)
+
+
+@pytest.mark.parametrize('geometry', ['', '450x600', '0x600+0+0', '450x0+0+0', '450x600-1+0', 'axb+c+d',
+                                      '450 x 600+0+0', '450x600+0+0+0'])
+def test_parse_geometry_invalid(geometry):
+    with pytest.raises(ValueError):
+        Utils.parse_geometry(geometry)
+
+
+@given(width=st.integers(min_value=1, max_value=100000), height=st.integers(min_value=1, max_value=100000),
+       x=st.integers(min_value=0, max_value=100000), y=st.integers(min_value=0, max_value=100000))
+def test_parse_geometry_roundtrip(width, height, x, y):
+    assert Utils.parse_geometry(f'{width}x{height}+{x}+{y}') == (x, y, width, height)
+
+
+@settings(max_examples=500)
+@given(st.text(max_size=50))
+def test_parse_geometry_fuzz(text):
+    try:
+        x, y, width, height = Utils.parse_geometry(text)
+    except ValueError:
+        return
+    assert width >= 1 and height >= 1 and x >= 0 and y >= 0
+
+
+# ---------------------------------------------------------------------------------------------
+
+
+def test_handle_args_defaults(monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['webapp', 'https://example.com'])
+    args = Utils.handle_args()
+    assert args.url == 'https://example.com'
+    assert args.profile == 'default'
+    assert args.zoom == 1.0
+    assert args.user_agent == Const.APP_USER_AGENT
+    assert args.internal_host == []
+    assert args.resource_profile == 'balanced'
+    assert not args.tabs and not args.debug
+
+
+def test_handle_args_options(monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['webapp', '--profile', 'work', '--name', 'My App', '--zoom', '1.5',
+                                      '--internal-host', 'a.example.com', '--internal-host', 'b.example.com',
+                                      '--tabs', '--max-live-tabs', '5', 'https://example.com'])
+    args = Utils.handle_args()
+    assert args.profile == 'work'
+    assert args.name == 'My App'
+    assert args.zoom == 1.5
+    assert args.internal_host == ['a.example.com', 'b.example.com']
+    assert args.tabs and args.max_live_tabs == 5
+
+
+def test_parse_quiet_hours():
+    assert Utils.parse_quiet_hours('22:00-07:30') == (time(22, 0), time(7, 30))
+    assert Utils.parse_quiet_hours(' 9:05 - 17:00 ') == (time(9, 5), time(17, 0))
+
+
+@pytest.mark.parametrize('spec', ['', '22:00', '22:00-', '25:00-07:00', '22:00-07:00-08:00', 'night'])
+def test_parse_quiet_hours_invalid(spec):
+    with pytest.raises(argparse.ArgumentTypeError):
+        Utils.parse_quiet_hours(spec)
+
+
+@pytest.mark.parametrize('argv', [['webapp'], ['webapp', '--zoom', 'big', 'https://example.com'],
+                                  ['webapp', '--log-level', 'loud', 'https://example.com'],
+                                  ['webapp', '--resource-profile', 'turbo', 'https://example.com'],
+                                  ['webapp', '--quiet-hours', '22:00', 'https://example.com']])
+def test_handle_args_invalid(monkeypatch, argv):
+    monkeypatch.setattr(sys, 'argv', argv)
+    with pytest.raises(SystemExit):
+        Utils.handle_args()
+
+
+@settings(max_examples=200, deadline=None)
+@given(argv=st.lists(st.text(max_size=20), max_size=6))
+def test_handle_args_fuzz(argv):
+    # Any input must either parse or end with argparse's usage error, never crash.
+    original = sys.argv
+    sys.argv = ['webapp', *argv]
+    try:
+        Utils.handle_args()
+    except SystemExit:
+        pass
+    finally:
+        sys.argv = original
+
+
+# ---------------------------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('default', 'default'),
+    ('work/private', 'work_private'),
+    ('a:b*c?d"e<f>g|h\\i', 'a_b_c_d_e_f_g_h_i'),
+    ('  spaced  ', 'spaced'),
+    ('', 'default_profile'),
+    ('   ', 'default_profile'),
+])
+def test_sanitize_profile_name(name, expected):
+    assert Utils.sanitize_profile_name(name) == expected
+
+
+@given(st.text(max_size=100))
+def test_sanitize_profile_name_fuzz(name):
+    sanitized = Utils.sanitize_profile_name(name)
+    assert sanitized
+    assert not any(char in sanitized for char in '\\/:*?"<>|')
+    assert sanitized == sanitized.strip()
+    assert Utils.sanitize_profile_name(sanitized) == sanitized
+
+
+def test_get_runtime_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+    runtime_dir = Utils.get_runtime_dir()
+    assert runtime_dir == str(tmp_path / Const.APP_PROJECT_NAME)
+    assert os.stat(runtime_dir).st_mode & 0o777 == 0o700
+    assert Utils.get_runtime_dir() == runtime_dir
+
+
+@pytest.mark.skipif(not hasattr(os, 'getuid'), reason='POSIX only')
+def test_get_runtime_dir_fallback_is_per_user(monkeypatch, tmp_path):
+    monkeypatch.delenv('XDG_RUNTIME_DIR', raising=False)
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+    assert Utils.get_runtime_dir() == str(tmp_path / f'{Const.APP_PROJECT_NAME}-{os.getuid()}')
+
+
+@pytest.mark.skipif(not hasattr(os, 'getuid'), reason='POSIX only')
+def test_get_runtime_dir_refuses_untrusted(monkeypatch, tmp_path):
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+    shared_dir = tmp_path / Const.APP_PROJECT_NAME
+    shared_dir.mkdir(mode=0o755)
+    shared_dir.chmod(0o755)
+    with pytest.raises(PermissionError):
+        Utils.get_runtime_dir()
+
+    shared_dir.rmdir()
+    (tmp_path / 'elsewhere').mkdir(mode=0o700)
+    shared_dir.symlink_to(tmp_path / 'elsewhere')
+    with pytest.raises(PermissionError):
+        Utils.get_runtime_dir()
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='RSS is read from /proc')
+def test_get_rss_kb():
+    assert Utils.get_rss_kb() > 0
+    assert Utils.get_rss_kb(os.getpid()) > 0
+    # Renderer process that is not running yet is reported with PID 0.
+    assert Utils.get_rss_kb(0) is None
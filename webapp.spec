@@ -33,7 +33,7 @@
 block_cipher = None
 
 a = Analysis(
-    ['websiteapp/webapp.py'],
+    ['websiteapp/main.py'],
     pathex=[],
     binaries=[],
     datas=[
@@ -16,41 +16,181 @@
 
 import json
 import os
+import threading
+import time
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional, Tuple
 
+import fasteners
 
-class BookmarkManager:
-    """Manages bookmarks storage and retrieval."""
+from websiteapp.deferred import DeferredSave, SaveDeferrer
 
-    def __init__(self, storage_path: str):
+
+class BookmarkManager(DeferredSave):
+    """
+    Manages bookmarks storage and retrieval.
+
+    Bookmarks file can be shared by multiple app instances using the same profile. Each entry
+    carries its modification timestamp and removed entries are kept as tombstones for a while,
+    so concurrent changes can be merged per entry (the most recent change wins). Writes are done
+    under advisory lock (re-reading and merging the file first) and the file is replaced
+    atomically. Changes made by other instances are detected by file's stat, so the file is only
+    re-read when it actually changed.
+
+    Saving can be deferred (see DeferredSave). Entries are guarded with a lock, and the file is
+    written outside of it, so a save running in the background does not hold up the lookups.
+    """
+
+    FILE_VERSION = 2
+    # Tombstones of removed bookmarks are kept that long (in seconds).
+    TOMBSTONE_TTL = 30 * 24 * 60 * 60
+
+    def __init__(self, storage_path: str, defer_save: Optional[SaveDeferrer] = None):
         """
         Initialize the bookmark manager.
 
         Args:
             storage_path: Directory path where bookmarks.json will be stored
+            defer_save: Runs saves later (see DeferredSave). Changes are saved immediately if not given.
         """
         self.storage_path = storage_path
+        self.defer_save = defer_save
+        self._lock = threading.RLock()
         self.bookmarks_file = os.path.join(storage_path, 'bookmarks.json')
-        self._bookmarks: List[Dict] = []
+        self.lock_file = f'{self.bookmarks_file}.lock'
+        # URL -> entry (including tombstones of removed bookmarks)
+        self._entries: Dict[str, Dict] = {}
+        self._stamp: Optional[Tuple[int, int, int]] = None
         self._load()
 
+    def _file_stamp(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.bookmarks_file)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _legacy_timestamp(bookmark: Dict) -> float:
+        try:
+            return datetime.fromisoformat(bookmark['added']).timestamp()
+        except (KeyError, TypeError, ValueError):
+            return 0.0
+
+    def _read(self) -> Dict[str, Dict]:
+        """
+        Reads bookmarks file. Returns entries keyed by URL.
+        """
+        try:
+            with open(self.bookmarks_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (ValueError, IOError):
+            # ValueError covers both malformed JSON and undecodable content
+            return {}
+
+        if isinstance(data, list):
+            # Legacy format: plain list of bookmarks
+            bookmarks = data
+        elif isinstance(data, dict):
+            bookmarks = data.get('bookmarks', [])
+        else:
+            return {}
+        if not isinstance(bookmarks, list):
+            return {}
+
+        entries: Dict[str, Dict] = {}
+        for bookmark in bookmarks:
+            if not isinstance(bookmark, dict) or not isinstance(bookmark.get('url'), str):
+                continue
+            if not isinstance(bookmark.get('modified'), (int, float)):
+                bookmark['modified'] = self._legacy_timestamp(bookmark)
+            entries[bookmark['url']] = bookmark
+        return entries
+
     def _load(self) -> None:
         """Load bookmarks from the JSON file."""
-        if os.path.exists(self.bookmarks_file):
-            try:
-                with open(self.bookmarks_file, 'r', encoding='utf-8') as f:
-                    self._bookmarks = json.load(f)
-            except (json.JSONDecodeError, IOError):
-                self._bookmarks = []
-        else:
-            self._bookmarks = []
+        self._stamp = self._file_stamp()
+        self._entries = self._read() if self._stamp else {}
+
+    def _merge(self, entries: Dict[str, Dict]) -> bool:
+        """
+        Merges given entries into ours. For each URL the most recently modified entry wins.
+
+        Returns:
+            True if any of our entries changed
+        """
+        changed = False
+        for url, entry in entries.items():
+            ours = self._entries.get(url)
+            if ours is None or entry['modified'] > ours['modified']:
+                self._entries[url] = entry
+                changed = True
+        return changed
+
+    def refresh(self) -> bool:
+        """
+        Picks up changes made by other instances. Cheap if the file did not change, as it costs
+        single stat() call.
+
+        Returns:
+            True if bookmarks file changed since last seen
+        """
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return False
+        entries = self._read()
+        with self._lock:
+            self._merge(entries)
+            self._stamp = stamp
+        return True
 
     def _save(self) -> None:
-        """Save bookmarks to the JSON file."""
+        """Save bookmarks to the JSON file, merging changes made by other instances."""
         os.makedirs(self.storage_path, exist_ok=True)
-        with open(self.bookmarks_file, 'w', encoding='utf-8') as f:
-            json.dump(self._bookmarks, f, indent=2, ensure_ascii=False)
+        with fasteners.InterProcessLock(self.lock_file):
+            # The file is only re-read (and merged) if other instance wrote it since we last did.
+            entries = self._read() if self._file_stamp() != self._stamp else None
+            with self._lock:
+                if entries is not None:
+                    self._merge(entries)
+
+                deadline = time.time() - self.TOMBSTONE_TTL
+                self._entries = {url: entry for url, entry in self._entries.items()
+                                 if not entry.get('deleted') or entry['modified'] > deadline}
+                data = self._snapshot()
+            self._write(data)
+
+    def _snapshot(self) -> Dict:
+        """Returns file content. Must be called with the lock held."""
+        return {
+            'version': self.FILE_VERSION,
+            'bookmarks': list(self._entries.values()),
+        }
+
+    def _write(self, data: Dict) -> None:
+        """Writes bookmarks file atomically. Must be called with the file lock held."""
+        tmp_file = f'{self.bookmarks_file}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, self.bookmarks_file)
+        stamp = self._file_stamp()
+        with self._lock:
+            self._stamp = stamp
+
+    def compact(self) -> None:
+        """
+        Drops tombstones of removed bookmarks. Meant for a copy of the bookmarks file made for
+        a new profile, as without other instances sharing the file there is nothing to merge the
+        tombstones with.
+        """
+        if self._stamp is None:
+            return
+        with fasteners.InterProcessLock(self.lock_file):
+            entries = self._read()
+            with self._lock:
+                self._entries = {url: entry for url, entry in entries.items() if not entry.get('deleted')}
+                data = self._snapshot()
+            self._write(data)
 
     def add(self, url: str, title: Optional[str] = None) -> bool:
         """
@@ -70,11 +210,46 @@ class BookmarkManager:
             'url': url,
             'title': title if title else url,
             'added': datetime.now().isoformat(),
+            'modified': time.time(),
         }
-        self._bookmarks.append(bookmark)
-        self._save()
+        with self._lock:
+            self._entries.pop(url, None)
+            self._entries[url] = bookmark
+        self.request_save(self._save)
         return True
 
+    def add_many(self, bookmarks: Iterable[Tuple[str, Optional[str], Optional[float]]]) -> Tuple[int, int]:
+        """
+        Adds multiple bookmarks at once, writing the file once at the end. Meant for imports.
+
+        Args:
+            bookmarks: Iterable of (url, title, added timestamp) tuples. Timestamp can be None.
+
+        Returns:
+            Tuple of (number of bookmarks added, number of skipped duplicates)
+        """
+        self.refresh()
+        added = skipped = 0
+        now = time.time()
+        with self._lock:
+            for url, title, added_at in bookmarks:
+                if not url:
+                    continue
+                entry = self._entries.get(url)
+                if entry is not None and not entry.get('deleted'):
+                    skipped += 1
+                    continue
+                self._entries[url] = {
+                    'url': url,
+                    'title': title if title else url,
+                    'added': datetime.fromtimestamp(added_at if added_at else now).isoformat(),
+                    'modified': now,
+                }
+                added += 1
+        if added:
+            self.request_save(self._save)
+        return added, skipped
+
     def get_all(self) -> List[Dict]:
         """
         Get all bookmarks.
@@ -82,7 +257,9 @@ class BookmarkManager:
         Returns:
             List of bookmark dictionaries
         """
-        return self._bookmarks.copy()
+        self.refresh()
+        with self._lock:
+            return [dict(entry) for entry in self._entries.values() if not entry.get('deleted')]
 
     def remove(self, url: str) -> bool:
         """
@@ -94,12 +271,12 @@ class BookmarkManager:
         Returns:
             True if bookmark was found and removed, False otherwise
         """
-        initial_len = len(self._bookmarks)
-        self._bookmarks = [b for b in self._bookmarks if b['url'] != url]
-        if len(self._bookmarks) < initial_len:
-            self._save()
-            return True
-        return False
+        if not self.exists(url):
+            return False
+        with self._lock:
+            self._entries[url] = {'url': url, 'deleted': True, 'modified': time.time()}
+        self.request_save(self._save)
+        return True
 
     def exists(self, url: str) -> bool:
         """
@@ -111,4 +288,6 @@ class BookmarkManager:
         Returns:
             True if URL is bookmarked, False otherwise
         """
-        return any(b['url'] == url for b in self._bookmarks)
+        self.refresh()
+        entry = self._entries.get(url)
+        return entry is not None and not entry.get('deleted')
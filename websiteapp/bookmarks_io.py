@@ -0,0 +1,220 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/bookmarks_io.py
+#
+##################################################################################
+"""
+
+import html
+import json
+import time
+from datetime import datetime
+from html.parser import HTMLParser
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+from urllib.parse import urlsplit
+
+# (url, title, added timestamp)
+BookmarkTuple = tuple
+
+# Seconds between 1601-01-01 (Chrome/WebKit epoch) and 1970-01-01
+WEBKIT_EPOCH_OFFSET = 11644473600
+# Input files are read in chunks of that size.
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class NetscapeBookmarkParser(HTMLParser):
+    """
+    Incremental parser of Netscape bookmark file format (exported by all major browsers).
+    Data is fed in chunks and each bookmark is handed over to the sink as soon as its `</A>`
+    is seen, so memory use does not depend on the file size.
+    """
+
+    def __init__(self, sink: Callable[[BookmarkTuple], None]):
+        super().__init__(convert_charrefs=True)
+        self.sink = sink
+        self._href: Optional[str] = None
+        self._added: Optional[float] = None
+        self._title: List[str] = []
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag != 'a':
+            return
+        attributes = dict(attrs)
+        self._href = attributes.get('href')
+        self._title = []
+        try:
+            self._added = float(attributes.get('add_date') or 0) or None
+        except ValueError:
+            self._added = None
+
+    def handle_data(self, data: str) -> None:
+        if self._href is not None:
+            self._title.append(data)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == 'a' and self._href is not None:
+            self.sink((self._href, ''.join(self._title).strip(), self._added))
+            self._href = None
+
+
+class BookmarksIO:
+    """Streaming import and export of bookmarks in browser HTML and JSON formats."""
+
+    FORMAT_HTML = 'html'
+    FORMAT_JSON = 'json'
+    FORMATS = (FORMAT_HTML, FORMAT_JSON)
+
+    @staticmethod
+    def detect_format(file_name: str, head: str) -> str:
+        """
+        Detects file format based on its beginning (and its name, if content is inconclusive).
+        """
+        stripped = head.lstrip()
+        if stripped.startswith(('{', '[')):
+            return BookmarksIO.FORMAT_JSON
+        if stripped.startswith('<') or file_name.lower().endswith(('.html', '.htm')):
+            return BookmarksIO.FORMAT_HTML
+        return BookmarksIO.FORMAT_JSON
+
+    @staticmethod
+    def is_importable(url: str) -> bool:
+        """
+        Tells whether bookmark of given URL can be imported. Only http(s) ones are, so i.e.
+        `javascript:` bookmarklets or Firefox `place:` queries are skipped.
+        """
+        return urlsplit(url.strip()).scheme.lower() in ('http', 'https')
+
+    @staticmethod
+    def read_html(f: TextIO) -> Iterator[BookmarkTuple]:
+        """
+        Yields bookmarks from Netscape bookmark HTML file, reading it in chunks.
+        """
+        pending: List[BookmarkTuple] = []
+        parser = NetscapeBookmarkParser(pending.append)
+        while True:
+            chunk = f.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            parser.feed(chunk)
+            yield from (bookmark for bookmark in pending if BookmarksIO.is_importable(bookmark[0]))
+            pending.clear()
+        parser.close()
+        yield from (bookmark for bookmark in pending if BookmarksIO.is_importable(bookmark[0]))
+
+    @staticmethod
+    def read_json(f: TextIO) -> Iterator[BookmarkTuple]:
+        """
+        Yields bookmarks from Chrome (`Bookmarks` file) or Firefox (bookmarks backup) JSON.
+
+        The file is read as a whole (json module cannot decode incrementally), then the tree is
+        walked and each bookmark is yielded as soon as it is reached. Walked nodes are emptied,
+        so the parts of the tree already yielded can be freed.
+        """
+        stack = [json.load(f)]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                stack.extend(reversed(node))
+                node.clear()
+                continue
+            if not isinstance(node, dict):
+                continue
+            bookmark = BookmarksIO._json_bookmark(node)
+            if bookmark is not None:
+                if BookmarksIO.is_importable(bookmark[0]):
+                    yield bookmark
+                continue
+            if node.get('deleted'):
+                continue
+            stack.extend(reversed([value for value in node.values() if isinstance(value, (dict, list))]))
+            node.clear()
+
+    @staticmethod
+    def _json_bookmark(node: Dict) -> Optional[BookmarkTuple]:
+        """
+        Returns bookmark described by given JSON node or None if the node is not a bookmark.
+        """
+        if node.get('type') == 'url' and isinstance(node.get('url'), str):
+            # Chrome: date_added is in microseconds since 1601-01-01
+            try:
+                added = int(node.get('date_added', 0)) / 1000000 - WEBKIT_EPOCH_OFFSET
+            except (TypeError, ValueError):
+                added = 0
+            return node['url'], node.get('name', ''), added if added > 0 else None
+        if isinstance(node.get('uri'), str) and node.get('type') == 'text/x-moz-place':
+            # Firefox: dateAdded is in microseconds since epoch
+            try:
+                added = int(node.get('dateAdded', 0)) / 1000000
+            except (TypeError, ValueError):
+                added = 0
+            return node['uri'], node.get('title', ''), added if added > 0 else None
+        if isinstance(node.get('url'), str) and 'type' not in node and not node.get('deleted'):
+            # Flat list of {url, title} objects (i.e. our own bookmarks.json). Removed bookmarks
+            # are kept there as tombstones, which are skipped.
+            return node['url'], node.get('title', ''), None
+        return None
+
+    @staticmethod
+    def read(f: TextIO, file_format: str) -> Iterator[BookmarkTuple]:
+        reader = BookmarksIO.read_html if file_format == BookmarksIO.FORMAT_HTML else BookmarksIO.read_json
+        return reader(f)
+
+    @staticmethod
+    def write_html(f: TextIO, bookmarks: Iterable[Dict]) -> int:
+        """
+        Writes bookmarks in Netscape bookmark file format.
+
+        Returns:
+            Number of bookmarks written
+        """
+        f.write('<!DOCTYPE NETSCAPE-Bookmark-file-1>\n'
+                '<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">\n'
+                '<TITLE>Bookmarks</TITLE>\n<H1>Bookmarks</H1>\n<DL><p>\n')
+        count = 0
+        for bookmark in bookmarks:
+            added = BookmarksIO._timestamp(bookmark)
+            f.write(f'    <DT><A HREF="{html.escape(bookmark["url"])}" ADD_DATE="{int(added)}">'
+                    f'{html.escape(bookmark.get("title") or bookmark["url"], quote=False)}</A>\n')
+            count += 1
+        f.write('</DL><p>\n')
+        return count
+
+    @staticmethod
+    def write_json(f: TextIO, bookmarks: Iterable[Dict]) -> int:
+        """
+        Writes bookmarks in Chrome's `Bookmarks` JSON structure (all in the bookmarks bar).
+        Entries are written one by one, not built as a single document first.
+
+        Returns:
+            Number of bookmarks written
+        """
+        f.write('{"version": 1, "roots": {"bookmark_bar": {"type": "folder", "name": "Bookmarks bar", "children": [\n')
+        count = 0
+        for bookmark in bookmarks:
+            added = BookmarksIO._timestamp(bookmark)
+            node = {
+                'type': 'url',
+                'url': bookmark['url'],
+                'name': bookmark.get('title') or bookmark['url'],
+                'date_added': str(int((added + WEBKIT_EPOCH_OFFSET) * 1000000)),
+            }
+            f.write(('' if count == 0 else ',\n') + json.dumps(node, ensure_ascii=False))
+            count += 1
+        f.write('\n]}}}\n')
+        return count
+
+    @staticmethod
+    def _timestamp(bookmark: Dict) -> float:
+        try:
+            return datetime.fromisoformat(bookmark['added']).timestamp()
+        except (KeyError, TypeError, ValueError):
+            return time.time()
@@ -0,0 +1,216 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/bridge.py
+#
+##################################################################################
+"""
+
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from PySide6.QtCore import QFile, QIODevice, QObject, QTimer, Signal, Slot
+from PySide6.QtWebChannel import QWebChannel
+from PySide6.QtWebEngineCore import QWebEnginePage, QWebEngineScript
+
+log = logging.getLogger(__name__)
+
+# Page-side part of the bridge. Events emitted with `window.__webapp.emit(type, payload)` are
+# queued and sent to Python as a single JSON array of `[type, payload]` pairs, either once the
+# flush interval elapses (and the page is idle) or once the queue grows big enough.
+BRIDGE_JS = """
+(function () {
+    if (window.__webapp) {
+        return;
+    }
+    var FLUSH_MS = %(flush_ms)d;
+    var MAX_BATCH = %(max_batch)d;
+    var queue = [];
+    var timer = null;
+    var bridge = null;
+    var handlers = {};
+    var idle = window.requestIdleCallback || function (callback) { return setTimeout(callback, 0); };
+
+    function flush() {
+        timer = null;
+        if (bridge === null || queue.length === 0) {
+            return;
+        }
+        var batch = queue;
+        queue = [];
+        bridge.push(JSON.stringify(batch));
+    }
+
+    function schedule() {
+        if (queue.length >= MAX_BATCH) {
+            flush();
+        } else if (timer === null) {
+            timer = setTimeout(function () { idle(flush, {timeout: FLUSH_MS}); }, FLUSH_MS);
+        }
+    }
+
+    window.__webapp = {
+        emit: function (type, payload) {
+            queue.push([type, payload === undefined ? null : payload]);
+            schedule();
+        },
+        on: function (type, callback) {
+            (handlers[type] = handlers[type] || []).push(callback);
+        },
+        flush: flush
+    };
+
+    new QWebChannel(qt.webChannelTransport, function (channel) {
+        bridge = channel.objects.%(object_name)s;
+        bridge.message.connect(function (data) {
+            JSON.parse(data).forEach(function (item) {
+                (handlers[item[0]] || []).forEach(function (callback) { callback(item[1]); });
+            });
+        });
+        flush();
+    });
+
+    document.addEventListener('visibilitychange', function () {
+        if (document.visibilityState === 'hidden') {
+            flush();
+        }
+    });
+    window.addEventListener('pagehide', flush);
+})();
+"""
+
+
+class PageBridge(QObject):
+    """
+    Batched Python<->page bridge exposed to the page through QWebChannel.
+
+    The bridge lives in the application's isolated JavaScript world, so it is not reachable
+    by site's own scripts. Other parts of the app can inject their page-side scripts into the
+    same world (with inject()) and emit events with `window.__webapp.emit(type, payload)`, while
+    Python side subscribes to event types with subscribe(). Batching means one IPC per batch
+    instead of one per event.
+    """
+
+    OBJECT_NAME = 'webapp'
+    WORLD_ID = QWebEngineScript.ScriptWorldId.ApplicationWorld
+    # Page-side queue is flushed that often (in milliseconds).
+    FLUSH_INTERVAL_MS = 250
+    # Page-side queue is flushed immediately once it holds that many events.
+    MAX_BATCH = 200
+
+    # Python->page messages: JSON array of `[type, payload]` pairs.
+    message = Signal(str)
+
+    _web_channel_js: Optional[str] = None
+
+    def __init__(self, page: QWebEnginePage):
+        """
+        Initialize the bridge and attach it to given page.
+
+        Args:
+            page: Page to attach the bridge to
+        """
+        super().__init__(page)
+        self.page = page
+        self._subscribers: Dict[str, List[Callable[[Any], None]]] = {}
+        self._outgoing: List[list] = []
+
+        self.channel = QWebChannel(self)
+        self.channel.registerObject(self.OBJECT_NAME, self)
+        page.setWebChannel(self.channel, self.WORLD_ID)
+
+        self.inject('webapp-bridge', self._web_channel_source() + BRIDGE_JS % {
+            'flush_ms': self.FLUSH_INTERVAL_MS,
+            'max_batch': self.MAX_BATCH,
+            'object_name': self.OBJECT_NAME,
+        })
+
+    @classmethod
+    def _web_channel_source(cls) -> str:
+        """
+        Returns source of Qt's qwebchannel.js, read from Qt resources once per process.
+        """
+        if cls._web_channel_js is None:
+            qrc_file = QFile(':/qtwebchannel/qwebchannel.js')
+            if qrc_file.open(QIODevice.OpenModeFlag.ReadOnly):
+                cls._web_channel_js = bytes(qrc_file.readAll().data()).decode('utf-8')
+                qrc_file.close()
+            else:
+                log.error('Unable to load qwebchannel.js from Qt resources')
+                cls._web_channel_js = ''
+        return cls._web_channel_js
+
+    def inject(self, name: str, source: str,
+               injection_point: QWebEngineScript.InjectionPoint = QWebEngineScript.InjectionPoint.DocumentCreation) -> None:
+        """
+        Injects script into bridge's JavaScript world of every document loaded by the page.
+        Scripts are executed in order of injection, so `window.__webapp` is already available.
+
+        Args:
+            name: Script name (script with the same name is replaced)
+            source: JavaScript source
+            injection_point: When to run the script
+        """
+        scripts = self.page.scripts()
+        for existing in scripts.find(name):
+            scripts.remove(existing)
+
+        script = QWebEngineScript()
+        script.setName(name)
+        script.setSourceCode(source)
+        script.setInjectionPoint(injection_point)
+        script.setWorldId(self.WORLD_ID)
+        script.setRunsOnSubFrames(False)
+        scripts.insert(script)
+
+    def subscribe(self, event_type: str, callback: Callable[[Any], None]) -> None:
+        """
+        Registers callback invoked with payload of each page event of given type.
+        """
+        self._subscribers.setdefault(event_type, []).append(callback)
+
+    def unsubscribe(self, event_type: str, callback: Callable[[Any], None]) -> None:
+        callbacks = self._subscribers.get(event_type, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    @Slot(str)
+    def push(self, batch: str) -> None:
+        """
+        Receives batch of page events. Called from the page.
+        """
+        try:
+            events = json.loads(batch)
+        except ValueError:
+            log.warning('Malformed bridge batch received from %s', self.page.url().toString())
+            return
+        for event in events if isinstance(events, list) else []:
+            if not isinstance(event, list) or len(event) != 2:
+                continue
+            for callback in self._subscribers.get(event[0], ()):
+                try:
+                    callback(event[1])
+                except Exception:  # noqa: B902 - subscriber must not break the others
+                    log.exception('Bridge subscriber for "%s" failed', event[0])
+
+    def send(self, event_type: str, payload: Any = None) -> None:
+        """
+        Sends event to the page. Events sent within the same event loop iteration are batched.
+        """
+        if not self._outgoing:
+            QTimer.singleShot(0, self._flush_outgoing)
+        self._outgoing.append([event_type, payload])
+
+    def _flush_outgoing(self) -> None:
+        batch, self._outgoing = self._outgoing, []
+        if batch:
+            self.message.emit(json.dumps(batch, separators=(',', ':'), default=str))
@@ -0,0 +1,99 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/clipboard.py
+#
+##################################################################################
+"""
+
+from typing import Optional
+
+from PySide6.QtCore import QObject, QTimer
+from PySide6.QtGui import QClipboard
+from PySide6.QtWidgets import QApplication
+
+from websiteapp.utils import Utils
+
+
+class ClipboardWatcher(QObject):
+    """
+    Tracks whether the clipboard holds a URL, so the context menu does not need to fetch the
+    clipboard content (which on X11/Wayland means a transfer from the owning app, possibly of
+    megabytes of data) each time it is opened. The menu only reads the cached result.
+
+    The clipboard is probed shortly after its content changes (bursts of changes result in a
+    single probe), outside of any user action. Clipboard offering any MIME type other than
+    plain text or URL list (i.e. image, HTML or office document) is rejected based on the
+    offered types alone. Data sizes are not advertised, so that is what keeps big content from
+    being fetched. Text is fetched once per change and only short enough text is validated.
+    """
+
+    # Longer text is never considered a URL.
+    MAX_URL_LENGTH = 2048
+    # Delay (in milliseconds) between the clipboard change and the probe.
+    PROBE_DELAY_MS = 200
+    # MIME types offered with copied URLs (by browsers' address bars and "Copy link" actions).
+    URL_MIME_TYPES = frozenset({
+        'text/plain', 'text/plain;charset=utf-8', 'text/uri-list', 'text/x-moz-url', 'chromium/x-source-url',
+    })
+
+    _instance: Optional['ClipboardWatcher'] = None
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.url: Optional[str] = None
+        self.clipboard: QClipboard = QApplication.clipboard()
+        self._probe_timer = QTimer(self)
+        self._probe_timer.setSingleShot(True)
+        self._probe_timer.setInterval(self.PROBE_DELAY_MS)
+        self._probe_timer.timeout.connect(self.probe)
+        self.clipboard.dataChanged.connect(self.on_data_changed)
+        # Probe the content present at startup, but outside of the current call stack.
+        self._probe_timer.start()
+
+    @classmethod
+    def instance(cls) -> 'ClipboardWatcher':
+        """
+        Returns watcher shared by all the views.
+        """
+        if cls._instance is None:
+            cls._instance = cls(QApplication.instance())
+        return cls._instance
+
+    @property
+    def has_url(self) -> bool:
+        return self.url is not None
+
+    def on_data_changed(self) -> None:
+        self.url = None
+        self._probe_timer.start()
+
+    @classmethod
+    def is_url_candidate(cls, formats) -> bool:
+        """
+        Checks if clipboard offering given MIME types may hold a URL. Entries without a slash are
+        platform specific aliases (i.e. UTF8_STRING or TARGETS on X11) and are ignored.
+        """
+        types = [mime_type.lower().replace(' ', '') for mime_type in formats if '/' in mime_type]
+        return bool(types) and all(mime_type in cls.URL_MIME_TYPES for mime_type in types)
+
+    def probe(self) -> None:
+        """
+        Checks clipboard content and caches the URL it holds (if any).
+        """
+        self.url = None
+        mime_data = self.clipboard.mimeData(QClipboard.Mode.Clipboard)
+        if mime_data is None or not mime_data.hasText() or not self.is_url_candidate(mime_data.formats()):
+            return
+
+        text = mime_data.text().strip()
+        if len(text) <= self.MAX_URL_LENGTH and Utils.is_valid_url(text):
+            self.url = text
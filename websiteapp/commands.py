@@ -0,0 +1,332 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/commands.py
+#
+##################################################################################
+"""
+
+import argparse
+import json
+import os
+import signal
+import sqlite3
+import sys
+import time
+from typing import List, Optional
+
+import fasteners
+
+from websiteapp.bookmarks import BookmarkManager
+from websiteapp.bookmarks_io import BookmarksIO
+from websiteapp.instances import InstanceRegistry
+from websiteapp.profiles import ProfileCloner
+from websiteapp.utils import Utils
+
+
+class Commands:
+    """
+    Maintenance commands run from the command line instead of opening the app window, i.e.
+    `webapp bookmarks export FILE`. Commands do not create QApplication, and the modules needing
+    Qt are imported only by the commands using them, so i.e. `webapp list` does not load Qt.
+    """
+
+    # Command names. First argument matching any of these is treated as command, not as URL.
+    NAMES = ('bookmarks', 'cookies', 'netstats', 'profile', 'list', 'stop', 'activate')
+
+    @staticmethod
+    def is_command(argv: List[str]) -> bool:
+        return len(argv) > 1 and argv[1] in Commands.NAMES
+
+    @staticmethod
+    def build_parser() -> argparse.ArgumentParser:
+        parser = argparse.ArgumentParser(prog=os.path.basename(sys.argv[0]))
+        commands = parser.add_subparsers(dest='command', required=True)
+
+        bookmarks = commands.add_parser('bookmarks', help='Import or export bookmarks')
+        actions = bookmarks.add_subparsers(dest='action', required=True)
+        for name, help_text in (('import', 'Imports bookmarks from browser export file'),
+                                ('export', 'Exports bookmarks to file')):
+            action = actions.add_parser(name, help=help_text)
+            action.add_argument('file', type=str, help='File to read (import) or write (export). Use "-" for stdio.')
+            action.add_argument('--profile', '-p', type=str, default='default',
+                                help='Profile to use. Default: %(default)s')
+            action.add_argument('--format', '-f', type=str, choices=BookmarksIO.FORMATS, default=None,
+                                help='File format. Default: detected from content (import) or file name (export)')
+
+        cookies = commands.add_parser('cookies', help='Shows or prunes cookies of the profile')
+        actions = cookies.add_subparsers(dest='action', required=True)
+        stats = actions.add_parser('stats', help='Shows number and size of cookies per domain')
+        stats.add_argument('--limit', '-l', type=int, default=20,
+                           help='Max number of domains shown. Default: %(default)s')
+        prune = actions.add_parser('prune', help='Removes cookies of deny-listed domains and cookies over the budgets')
+        prune.add_argument('--dry-run', action='store_true',
+                           help='Only shows how many cookies would be removed')
+        for action in (stats, prune):
+            action.add_argument('--profile', '-p', type=str, default='default',
+                                help='Profile to use. Default: %(default)s')
+
+        netstats = commands.add_parser('netstats', help='Shows network stats recorded with --netstats')
+        netstats.add_argument('--profile', '-p', type=str, default='default',
+                              help='Profile to use. Default: %(default)s')
+        netstats.add_argument('--limit', '-l', type=int, default=20,
+                              help='Max number of origins shown. Default: %(default)s')
+        netstats.add_argument('--json', action='store_true',
+                              help='Prints raw stats as JSON')
+
+        profile = commands.add_parser('profile', help='Creates profiles from existing profiles or templates')
+        actions = profile.add_subparsers(dest='action', required=True)
+        clone = actions.add_parser('clone', help='Creates new profile as a copy of existing profile or template')
+        clone.add_argument('source', type=str, help='Profile (or template, with --template) to copy')
+        clone.add_argument('profile', type=str, help='Name of the new profile')
+        clone.add_argument('--template', '-t', action='store_true',
+                           help='Copies the template of given name instead of the profile')
+        template = actions.add_parser('template', help='Saves copy of the profile as template for new profiles')
+        template.add_argument('profile', type=str, help='Profile to save')
+        template.add_argument('name', type=str, help='Name of the template')
+        actions.add_parser('templates', help='Lists available templates')
+
+        instances = commands.add_parser('list', help='Lists running app instances')
+        instances.add_argument('--json', action='store_true',
+                               help='Prints raw instance records as JSON')
+        stop = commands.add_parser('stop', help='Quits running app instance(s)')
+        stop.add_argument('target', type=str, nargs='?', default=None,
+                          help='Profile name or PID of the instance to quit')
+        stop.add_argument('--all', action='store_true',
+                          help='Quits all the running instances')
+        stop.add_argument('--timeout', type=float, default=10,
+                          help='Number of seconds to wait for the instances to quit. Default: %(default)s')
+        activate = commands.add_parser('activate', help='Brings window of running app instance to front')
+        activate.add_argument('target', type=str, help='Profile name or PID of the instance')
+
+        return parser
+
+    @staticmethod
+    def run(argv: List[str]) -> int:
+        """
+        Runs the command.
+
+        :param argv: Command line arguments (without program name)
+        :return: Process exit code
+        """
+        args = Commands.build_parser().parse_args(argv)
+        handler = getattr(Commands, f'cmd_{args.command}')
+        try:
+            return handler(args)
+        except (IOError, ValueError, sqlite3.Error) as ex:
+            print(f'Error: {ex}', file=sys.stderr)
+            return 1
+
+    @staticmethod
+    def lock_profile(profile: str) -> Optional[fasteners.InterProcessLock]:
+        """
+        Locks the profile, so no app instance can start using it while a command works on its
+        files. Instances started with --allow-multiple do not hold the lock, so the instance
+        registry is checked as well.
+
+        :param profile: Profile name
+        :return: Acquired lock, or None (with the error reported) if the profile is in use
+        """
+        lock = fasteners.InterProcessLock(Utils.get_lock_file(profile))
+        if lock.acquire(blocking=False):
+            if not InstanceRegistry(Utils.get_runtime_dir()).find(profile):
+                return lock
+            lock.release()
+        print(f'Profile "{profile}" is in use. Quit the app first.', file=sys.stderr)
+        return None
+
+    @staticmethod
+    def cmd_bookmarks(args) -> int:
+        manager = BookmarkManager(Utils.get_profile_storage_path(args.profile))
+
+        if args.action == 'import':
+            f = sys.stdin if args.file == '-' else open(args.file, 'r', encoding='utf-8')
+            with f:
+                file_format = args.format
+                if file_format is None:
+                    # Peek the beginning of the file. Stdin is not seekable, so it defaults to JSON.
+                    head = ''
+                    if f.seekable():
+                        head = f.read(512)
+                        f.seek(0)
+                    file_format = BookmarksIO.detect_format(args.file, head)
+                added, skipped = manager.add_many(BookmarksIO.read(f, file_format))
+            print(f'Imported {added} bookmarks ({skipped} duplicates skipped).')
+            return 0
+
+        file_format = args.format
+        if file_format is None:
+            file_format = BookmarksIO.FORMAT_HTML if args.file.lower().endswith(('.html', '.htm')) \
+                else BookmarksIO.FORMAT_JSON
+        writer = BookmarksIO.write_html if file_format == BookmarksIO.FORMAT_HTML else BookmarksIO.write_json
+        if args.file == '-':
+            writer(sys.stdout, manager.get_all())
+            return 0
+        tmp_file = f'{args.file}.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            count = writer(f, manager.get_all())
+        os.replace(tmp_file, args.file)
+        print(f'Exported {count} bookmarks to {args.file}.')
+        return 0
+
+    @staticmethod
+    def cmd_cookies(args) -> int:
+        # Imports Qt WebEngine, which other commands do not need to load.
+        from websiteapp.cookies import CookieDatabase, CookiePolicy
+
+        storage_path = Utils.get_profile_storage_path(args.profile)
+        database = CookieDatabase(storage_path)
+
+        if args.action == 'stats':
+            domains = database.stats()
+            print(f'{"Cookies":>7} {"Bytes":>8}  Domain')
+            for domain, count, size in domains[:args.limit]:
+                print(f'{count:>7} {size:>8}  {domain}')
+            print(f'{sum(count for _domain, count, _size in domains):>7} '
+                  f'{sum(size for _domain, _count, size in domains):>8}  (total, {len(domains)} domains)')
+            return 0
+
+        lock = Commands.lock_profile(args.profile)
+        if lock is None:
+            return 1
+        try:
+            rules = CookiePolicy.load_rules(os.path.join(storage_path, CookiePolicy.RULES_FILE_NAME))
+            removed = database.prune(rules, dry_run=args.dry_run)
+        finally:
+            lock.release()
+        print(f'{"Would remove" if args.dry_run else "Removed"} {removed} cookies.')
+        return 0
+
+    @staticmethod
+    def cmd_netstats(args) -> int:
+        # Imports Qt WebEngine, which other commands do not need to load.
+        from websiteapp.netstats import NetworkStats
+
+        stats_file = os.path.join(Utils.get_profile_storage_path(args.profile), NetworkStats.FILE_NAME)
+        stats = NetworkStats.load(stats_file)
+        if stats is None:
+            print(f'No network stats found for profile "{args.profile}". Run the app with --netstats first.',
+                  file=sys.stderr)
+            return 1
+        if args.json:
+            print(json.dumps(stats, indent=2))
+            return 0
+        started = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stats['started']))
+        updated = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stats['updated']))
+        print(f'Recorded from {started} to {updated}')
+        print(NetworkStats.format_summary(stats['origins'], args.limit))
+        return 0
+
+    @staticmethod
+    def cmd_profile(args) -> int:
+        if args.action == 'templates':
+            templates_dir = os.path.dirname(Utils.get_template_path('_'))
+            names = sorted(os.listdir(templates_dir)) if os.path.isdir(templates_dir) else []
+            for name in names:
+                print(name)
+            if not names:
+                print('No templates found.', file=sys.stderr)
+            return 0
+
+        if args.action == 'clone':
+            source_profile = None if args.template else ProfileCloner.check_name(args.source)
+            source = Utils.get_template_path(ProfileCloner.check_name(args.source)) if args.template \
+                else Utils.get_profile_storage_path(source_profile)
+            destination = Utils.get_profile_storage_path(ProfileCloner.check_name(args.profile))
+            label = f'profile "{args.profile}"'
+        else:
+            source_profile = ProfileCloner.check_name(args.profile)
+            source = Utils.get_profile_storage_path(source_profile)
+            destination = Utils.get_template_path(ProfileCloner.check_name(args.name))
+            label = f'template "{args.name}"'
+
+        # Chromium's databases must not be copied while being written to.
+        lock = Commands.lock_profile(source_profile) if source_profile else None
+        if source_profile and lock is None:
+            return 1
+        started = time.monotonic()
+        try:
+            stats = ProfileCloner(source, destination).clone()
+        finally:
+            if lock:
+                lock.release()
+        print(f'Created {label} in {time.monotonic() - started:.1f} s: {stats["files"]} files, '
+              f'{stats["bytes"] / 1024 / 1024:.1f} MiB ({stats["reflinked"]} reflinked, '
+              f'{stats["skipped"]} caches and locks skipped).')
+        return 0
+
+    @staticmethod
+    def format_duration(seconds: float) -> str:
+        minutes, seconds = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        days, hours = divmod(hours, 24)
+        if days:
+            return f'{days}d {hours:02}h'
+        if hours:
+            return f'{hours}h {minutes:02}m'
+        return f'{minutes}m {seconds:02}s'
+
+    @staticmethod
+    def cmd_list(args) -> int:
+        records = InstanceRegistry(Utils.get_runtime_dir()).running()
+        if args.json:
+            print(json.dumps(records, indent=2))
+            return 0
+        if not records:
+            print('No running instances.', file=sys.stderr)
+            return 0
+        now = time.time()
+        print(f'{"PID":>7}  {"Profile":<16} {"State":<8} {"Memory":>8} {"Uptime":>8}  URL')
+        for record in records:
+            memory_mb = ((record.get('rss_kb') or 0) + (record.get('children_rss_kb') or 0)) / 1024
+            uptime = Commands.format_duration(now - record.get('started', now))
+            state = record.get('state', '?') if record.get('visible', True) else 'hidden'
+            print(f'{record["pid"]:>7}  {str(record.get("profile")):<16} {state:<8} {memory_mb:>6.0f}MB '
+                  f'{uptime:>8}  {record.get("url", "")}')
+        return 0
+
+    @staticmethod
+    def cmd_stop(args) -> int:
+        if args.target is None and not args.all:
+            print('Give profile name or PID of the instance to quit (or use --all).', file=sys.stderr)
+            return 1
+        registry = InstanceRegistry(Utils.get_runtime_dir())
+        records = registry.find(None if args.all else args.target)
+        if not records:
+            print(f'No running instance of "{args.target}" found.', file=sys.stderr)
+            return 1
+        for record in records:
+            try:
+                os.kill(record['pid'], signal.SIGTERM)
+            except ProcessLookupError:
+                # Quit meanwhile.
+                pass
+
+        deadline = time.monotonic() + args.timeout
+        running = records
+        while running and time.monotonic() < deadline:
+            time.sleep(0.05)
+            running = [record for record in running if registry.is_alive(record)]
+        for record in records:
+            status = 'still running' if record in running else 'stopped'
+            print(f'{record["pid"]} ({record.get("profile")}): {status}')
+        return 1 if running else 0
+
+    @staticmethod
+    def cmd_activate(args) -> int:
+        records = InstanceRegistry(Utils.get_runtime_dir()).find(args.target)
+        if not records:
+            print(f'No running instance of "{args.target}" found.', file=sys.stderr)
+            return 1
+        for profile in {record['profile'] for record in records}:
+            with open(Utils.get_activation_signal_file(profile), 'w', encoding='utf-8') as f:
+                f.write('activate')
+        return 0
@@ -26,6 +26,8 @@ class Const(object):
     APP_URL: str = 'https://github.com/MarcinOrlowski/website-as-app/'
     APP_DESCRIPTION: str = 'Opens any web site as standalone desktop app.'
     APP_YEAR: int = 2026
+    # Organization name as set on QApplication. Together with APP_NAME defines data location.
+    APP_ORGANIZATION: str = 'MarcinOrlowski'
 
     APP_DESCRIPTION: List[str] = [
         f'{APP_NAME} v{APP_VERSION} * Copyright 2023-{APP_YEAR} by Marcin Orlowski.',
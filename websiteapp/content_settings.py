@@ -0,0 +1,165 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/content_settings.py
+#
+##################################################################################
+"""
+
+import json
+import logging
+import os
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from PySide6.QtWebEngineCore import QWebEnginePage, QWebEngineSettings
+
+log = logging.getLogger(__name__)
+
+WebAttribute = QWebEngineSettings.WebAttribute
+
+
+class ContentSettings:
+    """
+    Per-host content settings (images, JavaScript, WebGL, autoplay, smooth scrolling, canvas
+    acceleration) applied to the page on each main frame navigation.
+
+    Rules are read from profile's `content-settings.json` once and compiled into a dictionary
+    keyed by host suffix. Resolved settings are memoized per host, so applying them on navigation
+    costs a dictionary lookup plus setting the attributes that actually differ.
+    """
+
+    RULES_FILE_NAME = 'content-settings.json'
+
+    # Setting name -> (web attribute, inverted). Inverted attributes have meaning opposite to
+    # the setting (i.e. "autoplay: false" means "PlaybackRequiresUserGesture: true").
+    ATTRIBUTES = {
+        'images': (WebAttribute.AutoLoadImages, False),
+        'javascript': (WebAttribute.JavascriptEnabled, False),
+        'webgl': (WebAttribute.WebGLEnabled, False),
+        'autoplay': (WebAttribute.PlaybackRequiresUserGesture, True),
+        'smooth_scroll': (WebAttribute.ScrollAnimatorEnabled, False),
+        'accelerated_canvas': (WebAttribute.Accelerated2dCanvasEnabled, False),
+    }
+
+    PRESETS = {
+        # For metered connections and weak machines: no images, no autoplay, no GPU heavy stuff.
+        'lite': {
+            'images': False,
+            'webgl': False,
+            'autoplay': False,
+            'smooth_scroll': False,
+            'accelerated_canvas': False,
+        },
+    }
+
+    def __init__(self, defaults: QWebEngineSettings, lite: bool = False):
+        """
+        Initialize content settings.
+
+        Args:
+            defaults: Settings to take default values from (usually profile's settings)
+            lite: Enables "lite" preset for all the hosts
+        """
+        self.defaults: Dict[str, bool] = {}
+        for name, (attribute, inverted) in self.ATTRIBUTES.items():
+            self.defaults[name] = defaults.testAttribute(attribute) != inverted
+        self.lite = lite
+        self._rules: Dict[str, Dict[str, bool]] = {}
+        self._resolved: Dict[str, Dict[str, bool]] = {}
+
+    def add_rule(self, host: str, settings: Dict[str, bool], preset: Optional[str] = None) -> None:
+        """
+        Adds rule for given host (and its subdomains).
+
+        Args:
+            host: Host suffix the rule applies to
+            settings: Setting name -> value map
+            preset: Optional preset name whose settings are applied first
+
+        Raises:
+            ValueError: If setting or preset is not known
+        """
+        if preset is not None and preset not in self.PRESETS:
+            raise ValueError(f"Unknown preset '{preset}'. Expected one of: {', '.join(self.PRESETS)}")
+        unknown = set(settings) - set(self.ATTRIBUTES)
+        if unknown:
+            raise ValueError(f"Unknown content settings: {', '.join(sorted(unknown))}")
+
+        rule = dict(self.PRESETS[preset]) if preset else {}
+        rule.update({name: bool(value) for name, value in settings.items()})
+        self._rules[host.strip().lower().lstrip('*').lstrip('.')] = rule
+        self._resolved.clear()
+
+    def load_rules(self, rules_file: str) -> None:
+        """
+        Loads rules from JSON file: list of objects with `host` and optional `preset` and
+        `settings` keys. Missing file is silently ignored, invalid rules are skipped.
+        """
+        if not os.path.exists(rules_file):
+            return
+        try:
+            with open(rules_file, 'r', encoding='utf-8') as f:
+                rules = json.load(f)
+        except (json.JSONDecodeError, IOError) as ex:
+            log.warning('Unable to load content settings from %s: %s', rules_file, ex)
+            return
+
+        for rule in rules if isinstance(rules, list) else []:
+            try:
+                self.add_rule(rule['host'], rule.get('settings', {}), rule.get('preset'))
+            except (KeyError, TypeError, AttributeError, ValueError) as ex:
+                log.warning('Skipping invalid content settings rule %s: %s', rule, ex)
+
+    def set_lite(self, lite: bool) -> None:
+        """
+        Enables or disables "lite" preset for all the hosts.
+        """
+        self.lite = lite
+        self._resolved.clear()
+
+    def resolve(self, host: str) -> Dict[str, bool]:
+        """
+        Returns effective settings for given host: defaults, then lite preset (if enabled), then
+        the most specific matching rule.
+        """
+        host = host.lower()
+        resolved = self._resolved.get(host)
+        if resolved is not None:
+            return resolved
+
+        resolved = dict(self.defaults)
+        if self.lite:
+            resolved.update(self.PRESETS['lite'])
+        labels = host.split('.')
+        for idx in range(len(labels)):
+            rule = self._rules.get('.'.join(labels[idx:]))
+            if rule is not None:
+                resolved.update(rule)
+                break
+
+        self._resolved[host] = resolved
+        return resolved
+
+    def apply(self, page: QWebEnginePage, url: str) -> None:
+        """
+        Applies settings for given URL's host to the page. Only attributes whose value differs
+        are touched.
+        """
+        host = urlsplit(url).hostname
+        if not host:
+            return
+        page_settings = page.settings()
+        for name, value in self.resolve(host).items():
+            attribute, inverted = self.ATTRIBUTES[name]
+            if page_settings.testAttribute(attribute) != (value != inverted):
+                page_settings.setAttribute(attribute, value != inverted)
+                log.debug('Content setting for %s: %s=%s', host, name, value)
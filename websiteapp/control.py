@@ -0,0 +1,278 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/control.py
+#
+##################################################################################
+"""
+
+import base64
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, QObject, QUrl
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+log = logging.getLogger(__name__)
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+
+# Callable used by method handlers to send the response: reply(result) or reply(error=(code, msg))
+Reply = Callable[..., None]
+
+
+class ControlConnection(QObject):
+    """
+    Single client connection. Requests are newline-delimited JSON-RPC 2.0 objects. Each response
+    is a single line, except for large payloads, which are sent as a series of `chunk`
+    notifications (each with part of base64 encoded data), followed by the response itself. Next
+    chunk is written only once the previous one has been flushed to the socket, so big payloads
+    never sit in the socket's write buffer at once.
+    """
+
+    def __init__(self, server: 'ControlServer', socket: QLocalSocket):
+        super().__init__(server)
+        self.server = server
+        self.socket = socket
+        self._buffer = b''
+        self._pending_chunks: List[bytes] = []
+        # Set once the client is gone. Replies of requests still being handled (i.e. waiting for
+        # JS evaluation) are then dropped, as the socket may already be deleted.
+        self._closed = False
+        self.socket.readyRead.connect(self.on_ready_read)
+        self.socket.bytesWritten.connect(self.on_bytes_written)
+        self.socket.disconnected.connect(self.on_disconnected)
+
+    def on_ready_read(self) -> None:
+        self._buffer += bytes(self.socket.readAll().data())
+        if len(self._buffer) > ControlServer.MAX_REQUEST_SIZE:
+            self._buffer = b''
+            self.send({'jsonrpc': '2.0', 'id': None,
+                       'error': {'code': INVALID_REQUEST, 'message': 'Request too large'}})
+            return
+        while b'\n' in self._buffer:
+            line, self._buffer = self._buffer.split(b'\n', 1)
+            if line.strip():
+                self.handle_line(line)
+
+    def handle_line(self, line: bytes) -> None:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            self.send({'jsonrpc': '2.0', 'id': None, 'error': {'code': PARSE_ERROR, 'message': 'Parse error'}})
+            return
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            self.send({'jsonrpc': '2.0', 'id': None,
+                       'error': {'code': INVALID_REQUEST, 'message': 'Invalid request'}})
+            return
+        self.server.dispatch(request, self)
+
+    def reply(self, request_id: Any, result: Any = None, error: Optional[tuple] = None) -> None:
+        """
+        Sends response to the request of given id. Notifications (requests without id) get none.
+        """
+        if request_id is None or self._closed:
+            return
+        if error is not None:
+            self.send({'jsonrpc': '2.0', 'id': request_id, 'error': {'code': error[0], 'message': error[1]}})
+        else:
+            self.send({'jsonrpc': '2.0', 'id': request_id, 'result': result})
+
+    def reply_stream(self, request_id: Any, data: bytes, meta: Optional[Dict] = None) -> None:
+        """
+        Sends large binary payload as a series of `chunk` notifications followed by the response
+        holding payload's metadata.
+        """
+        if self._closed:
+            return
+        chunk_size = ControlServer.CHUNK_SIZE
+        chunks = [data[offset:offset + chunk_size] for offset in range(0, len(data), chunk_size)]
+        for seq, chunk in enumerate(chunks):
+            self._pending_chunks.append(self._encode({
+                'jsonrpc': '2.0', 'method': 'chunk',
+                'params': {'id': request_id, 'seq': seq, 'data': base64.b64encode(chunk).decode('ascii')},
+            }))
+        result = dict(meta or {})
+        result.update({'size': len(data), 'chunks': len(chunks), 'encoding': 'base64'})
+        self._pending_chunks.append(self._encode({'jsonrpc': '2.0', 'id': request_id, 'result': result}))
+        self.on_bytes_written()
+
+    def on_bytes_written(self, _written: int = 0) -> None:
+        if not self._closed and self._pending_chunks and self.socket.bytesToWrite() < ControlServer.CHUNK_SIZE:
+            self.socket.write(self._pending_chunks.pop(0))
+
+    @staticmethod
+    def _encode(message: Dict) -> bytes:
+        return json.dumps(message, separators=(',', ':'), default=str).encode('utf-8') + b'\n'
+
+    def send(self, message: Dict) -> None:
+        if self._closed:
+            return
+        if self._pending_chunks:
+            # Keep the order of the responses intact.
+            self._pending_chunks.append(self._encode(message))
+        elif self.socket.state() == QLocalSocket.LocalSocketState.ConnectedState:
+            self.socket.write(self._encode(message))
+
+    def on_disconnected(self) -> None:
+        self._closed = True
+        self._pending_chunks.clear()
+        self.socket.deleteLater()
+        self.deleteLater()
+
+
+class ControlServer(QObject):
+    """
+    Local control API: JSON-RPC 2.0 over per-profile Unix domain socket. All requests are handled
+    on the Qt event loop, and the ones that need the engine to respond (i.e. JS evaluation) reply
+    asynchronously, so the app stays responsive while serving clients.
+    """
+
+    SOCKET_NAME_PATTERN = 'control-{profile}.sock'
+    # Payloads are streamed in chunks of that size (before base64 encoding).
+    CHUNK_SIZE = 64 * 1024
+    # Max size of single (not yet terminated) request.
+    MAX_REQUEST_SIZE = 4 * 1024 * 1024
+
+    def __init__(self, window, socket_path: str):
+        """
+        Initialize the control server.
+
+        Args:
+            window: WebApp instance to control
+            socket_path: Path of the Unix domain socket to listen on
+        """
+        super().__init__(window)
+        self.window = window
+        self.socket_path = socket_path
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self.server.newConnection.connect(self.on_new_connection)
+
+        self.methods: Dict[str, Callable[[Dict, Reply], None]] = {
+            'navigate': self.rpc_navigate,
+            'reload': self.rpc_reload,
+            'eval': self.rpc_eval,
+            'screenshot': self.rpc_screenshot,
+            'state': self.rpc_state,
+            'show': self.rpc_show,
+            'hide': self.rpc_hide,
+            'metrics': self.rpc_metrics,
+        }
+
+    def start(self) -> bool:
+        """
+        Starts listening. Stale socket left by a crashed instance is removed first.
+        """
+        QLocalServer.removeServer(self.socket_path)
+        if not self.server.listen(self.socket_path):
+            log.error('Control server failed to listen on %s: %s', self.socket_path, self.server.errorString())
+            return False
+        log.info('Control server listening on %s', self.socket_path)
+        return True
+
+    def stop(self) -> None:
+        self.server.close()
+        QLocalServer.removeServer(self.socket_path)
+
+    def on_new_connection(self) -> None:
+        while self.server.hasPendingConnections():
+            ControlConnection(self, self.server.nextPendingConnection())
+
+    def dispatch(self, request: Dict, connection: ControlConnection) -> None:
+        request_id = request.get('id')
+        method = self.methods.get(request['method'])
+        if method is None:
+            connection.reply(request_id, error=(METHOD_NOT_FOUND, f"Unknown method '{request['method']}'"))
+            return
+        params = request.get('params') or {}
+        if not isinstance(params, dict):
+            connection.reply(request_id, error=(INVALID_PARAMS, 'Params must be an object'))
+            return
+
+        def reply(result: Any = None, error: Optional[tuple] = None, stream: Optional[bytes] = None) -> None:
+            if stream is not None:
+                connection.reply_stream(request_id, stream, result)
+            else:
+                connection.reply(request_id, result, error)
+
+        log.debug('Control request: %s', request['method'])
+        try:
+            method(params, reply)
+        except (KeyError, TypeError, ValueError) as ex:
+            connection.reply(request_id, error=(INVALID_PARAMS, str(ex)))
+
+    # ############################################################################################ #
+
+    def rpc_navigate(self, params: Dict, reply: Reply) -> None:
+        url = QUrl(params['url'])
+        if not url.isValid():
+            reply(error=(INVALID_PARAMS, 'Invalid URL'))
+            return
+        self.window.current_view().setUrl(url)
+        reply(True)
+
+    def rpc_reload(self, params: Dict, reply: Reply) -> None:
+        self.window.current_view().reload()
+        reply(True)
+
+    def rpc_eval(self, params: Dict, reply: Reply) -> None:
+        script = params['script']
+        if not isinstance(script, str):
+            raise TypeError('Script must be a string')
+
+        def on_result(result):
+            encoded = json.dumps(result, default=str).encode('utf-8')
+            if len(encoded) > self.CHUNK_SIZE:
+                reply({'type': 'json'}, stream=encoded)
+            else:
+                reply(result)
+
+        self.window.current_view().page().runJavaScript(script, 0, on_result)
+
+    def rpc_screenshot(self, params: Dict, reply: Reply) -> None:
+        image_format = str(params.get('format', 'png')).upper()
+        if image_format not in ('PNG', 'JPG', 'JPEG'):
+            reply(error=(INVALID_PARAMS, 'Supported formats: png, jpg'))
+            return
+        pixmap = self.window.current_view().grab()
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        pixmap.save(buffer, image_format)
+        buffer.close()
+        reply({'type': image_format.lower(), 'width': pixmap.width(), 'height': pixmap.height()},
+              stream=bytes(data.data()))
+
+    def rpc_state(self, params: Dict, reply: Reply) -> None:
+        view = self.window.current_view()
+        reply({
+            'url': view.url().toString(),
+            'title': view.title(),
+            'loading': getattr(view, 'loading', None),
+            'visible': self.window.isVisible(),
+        })
+
+    def rpc_show(self, params: Dict, reply: Reply) -> None:
+        self.window.activate_window()
+        reply(True)
+
+    def rpc_hide(self, params: Dict, reply: Reply) -> None:
+        self.window.hide()
+        reply(True)
+
+    def rpc_metrics(self, params: Dict, reply: Reply) -> None:
+        reply(self.window.metrics())
@@ -0,0 +1,257 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/cookies.py
+#
+##################################################################################
+"""
+
+import json
+import logging
+import os
+import sqlite3
+from collections import OrderedDict
+from contextlib import closing
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PySide6.QtCore import QObject
+from PySide6.QtNetwork import QNetworkCookie
+from PySide6.QtWebEngineCore import QWebEngineCookieStore
+
+log = logging.getLogger(__name__)
+
+
+class HostMatcher:
+    """
+    Set of host suffixes (i.e. `example.com` also matches `www.example.com`), compiled into
+    a set, so matching costs one lookup per label of the host name.
+    """
+
+    def __init__(self, hosts: Iterable[str] = ()):
+        self._hosts = {host.strip().lower().lstrip('*').lstrip('.') for host in hosts} - {''}
+
+    def __bool__(self) -> bool:
+        return bool(self._hosts)
+
+    def matches(self, host: str) -> bool:
+        labels = host.lower().lstrip('.').split('.')
+        return any('.'.join(labels[idx:]) in self._hosts for idx in range(len(labels)))
+
+
+class CookiePolicy(QObject):
+    """
+    Per-profile cookie policy, configured with profile's `cookies.json`:
+
+    ```json
+    {"third_party": false, "allow": ["sso.example.com"], "deny": ["tracker.com"],
+     "max_per_domain": 50, "max_bytes_per_domain": 8192}
+    ```
+
+    Third-party cookies are blocked (unless `third_party` is true), except for allow-listed
+    hosts, while cookies of deny-listed hosts are always blocked. Filtering is done with the cookie
+    store's filter, which is called by the network thread, so decisions are cached per host.
+
+    Each cookie domain can also be held within count and size budgets (disabled by default): once
+    a newly set cookie exceeds them, the least recently set cookies of that domain are deleted,
+    keeping request headers small. Cookies of allow-listed hosts and HttpOnly or Secure cookies
+    (which sessions and logins depend on) are never deleted.
+    """
+
+    RULES_FILE_NAME = 'cookies.json'
+    # Chromium's cookie database file within profile's storage directory.
+    COOKIES_DB_FILE_NAME = 'Cookies'
+
+    DEFAULTS = {
+        'third_party': False,
+        'allow': [],
+        'deny': [],
+        # Budgets are disabled with 0.
+        'max_per_domain': 0,
+        'max_bytes_per_domain': 0,
+    }
+
+    def __init__(self, store: QWebEngineCookieStore, rules: Optional[Dict] = None, parent=None):
+        """
+        Initialize the policy and install it on the cookie store.
+
+        Args:
+            store: Profile's cookie store
+            rules: Rules (see DEFAULTS for the keys)
+            parent: Parent object
+        """
+        super().__init__(parent)
+        rules = {**self.DEFAULTS, **(rules or {})}
+        self.store = store
+        self.third_party = bool(rules['third_party'])
+        self.allow = HostMatcher(rules['allow'])
+        self.deny = HostMatcher(rules['deny'])
+        self.max_per_domain = int(rules['max_per_domain'])
+        self.max_bytes_per_domain = int(rules['max_bytes_per_domain'])
+        # (host, third party) -> decision
+        self._decisions: Dict[Tuple[str, bool], bool] = {}
+        # domain -> (name, path) -> (size, cookie), in order the cookies were (re)set. Only cookies
+        # that can be evicted are tracked.
+        self._domains: Dict[str, OrderedDict] = {}
+        self.blocked = 0
+        self.evicted = 0
+
+        store.setCookieFilter(self.accept)
+        store.cookieAdded.connect(self.on_cookie_added)
+        store.cookieRemoved.connect(self.on_cookie_removed)
+        store.loadAllCookies()
+
+    @classmethod
+    def load_rules(cls, rules_file: str) -> Dict:
+        """
+        Reads rules from the file. Missing or invalid file means default rules.
+        """
+        if not os.path.exists(rules_file):
+            return dict(cls.DEFAULTS)
+        try:
+            with open(rules_file, 'r', encoding='utf-8') as f:
+                rules = json.load(f)
+            unknown = set(rules) - set(cls.DEFAULTS)
+            if unknown:
+                log.warning('Unknown cookie policy keys in %s: %s', rules_file, ', '.join(sorted(unknown)))
+            return {**cls.DEFAULTS, **{key: value for key, value in rules.items() if key in cls.DEFAULTS}}
+        except (json.JSONDecodeError, IOError, AttributeError) as ex:
+            log.warning('Unable to load cookie policy from %s: %s', rules_file, ex)
+            return dict(cls.DEFAULTS)
+
+    def accept(self, request: QWebEngineCookieStore.FilterRequest) -> bool:
+        """
+        Cookie filter. Called by the network thread for each cookie access.
+        """
+        host = request.origin.host()
+        key = (host, request.thirdParty)
+        decision = self._decisions.get(key)
+        if decision is None:
+            if self.deny.matches(host):
+                decision = False
+            elif request.thirdParty:
+                decision = self.third_party or self.allow.matches(host)
+            else:
+                decision = True
+            self._decisions[key] = decision
+        if not decision:
+            self.blocked += 1
+        return decision
+
+    @staticmethod
+    def cookie_domain(cookie: QNetworkCookie) -> str:
+        return cookie.domain().lstrip('.').lower()
+
+    @staticmethod
+    def cookie_size(cookie: QNetworkCookie) -> int:
+        return len(cookie.name()) + len(cookie.value())
+
+    def is_evictable(self, cookie: QNetworkCookie) -> bool:
+        """
+        Tells whether the cookie can be deleted to keep its domain within the budgets.
+        """
+        return not (cookie.isHttpOnly() or cookie.isSecure() or self.allow.matches(self.cookie_domain(cookie)))
+
+    def on_cookie_added(self, cookie: QNetworkCookie) -> None:
+        if not (self.max_per_domain or self.max_bytes_per_domain) or not self.is_evictable(cookie):
+            return
+        domain = self.cookie_domain(cookie)
+        cookies = self._domains.setdefault(domain, OrderedDict())
+        key = (bytes(cookie.name()), cookie.path())
+        cookies.pop(key, None)
+        cookies[key] = (self.cookie_size(cookie), QNetworkCookie(cookie))
+
+        max_count = self.max_per_domain or len(cookies)
+        max_bytes = self.max_bytes_per_domain or float('inf')
+        total = sum(size for size, _cookie in cookies.values())
+        while len(cookies) > 1 and (len(cookies) > max_count or total > max_bytes):
+            _key, (size, oldest) = cookies.popitem(last=False)
+            total -= size
+            self.evicted += 1
+            log.debug('Cookie budget of %s exceeded, removing %s', domain, bytes(oldest.name()).decode(errors='replace'))
+            self.store.deleteCookie(oldest)
+
+    def on_cookie_removed(self, cookie: QNetworkCookie) -> None:
+        cookies = self._domains.get(self.cookie_domain(cookie))
+        if cookies is not None:
+            cookies.pop((bytes(cookie.name()), cookie.path()), None)
+            if not cookies:
+                del self._domains[self.cookie_domain(cookie)]
+
+    def stats(self) -> Dict:
+        return {
+            'domains': len(self._domains),
+            'cookies': sum(len(cookies) for cookies in self._domains.values()),
+            'blocked': self.blocked,
+            'evicted': self.evicted,
+        }
+
+
+class CookieDatabase:
+    """
+    Offline access to profile's cookie database, used by `webapp cookies` command. Must not be
+    modified while the app is running the profile.
+    """
+
+    def __init__(self, storage_path: str):
+        self.db_file = os.path.join(storage_path, CookiePolicy.COOKIES_DB_FILE_NAME)
+
+    def _connect(self) -> sqlite3.Connection:
+        if not os.path.exists(self.db_file):
+            raise IOError(f'No cookie database found: {self.db_file}')
+        return sqlite3.connect(self.db_file, timeout=5)
+
+    def stats(self) -> List[Tuple[str, int, int]]:
+        """
+        Returns (domain, number of cookies, total size) tuples, the biggest domains first.
+        """
+        with closing(self._connect()) as db:
+            return db.execute(
+                'SELECT host_key, COUNT(*), SUM(LENGTH(name) + MAX(LENGTH(value), LENGTH(encrypted_value))) AS size '
+                'FROM cookies GROUP BY host_key ORDER BY size DESC').fetchall()
+
+    def prune(self, rules: Dict, dry_run: bool = False) -> int:
+        """
+        Removes cookies of deny-listed domains and the least recently used cookies of domains
+        exceeding the budgets (if set). Like CookiePolicy, it keeps cookies of allow-listed hosts
+        and HttpOnly or Secure cookies.
+
+        Returns:
+            Number of cookies removed
+        """
+        deny, allow = HostMatcher(rules['deny']), HostMatcher(rules['allow'])
+        max_count = int(rules['max_per_domain']) or float('inf')
+        max_bytes = int(rules['max_bytes_per_domain']) or float('inf')
+        db = self._connect()
+        try:
+            rows = db.execute(
+                'SELECT rowid, host_key, LENGTH(name) + MAX(LENGTH(value), LENGTH(encrypted_value)), '
+                'is_httponly OR is_secure FROM cookies ORDER BY host_key, last_access_utc DESC').fetchall()
+            doomed: List[int] = []
+            domain, count, total = None, 0, 0
+            for rowid, host_key, size, protected in rows:
+                if deny.matches(host_key):
+                    doomed.append(rowid)
+                    continue
+                if protected or allow.matches(host_key):
+                    continue
+                if host_key != domain:
+                    domain, count, total = host_key, 0, 0
+                count += 1
+                total += size
+                if count > 1 and (count > max_count or total > max_bytes):
+                    doomed.append(rowid)
+            if doomed and not dry_run:
+                with db:
+                    db.executemany('DELETE FROM cookies WHERE rowid = ?', ((rowid,) for rowid in doomed))
+                db.execute('VACUUM')
+            return len(doomed)
+        finally:
+            db.close()
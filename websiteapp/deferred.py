@@ -0,0 +1,40 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/deferred.py
+#
+##################################################################################
+"""
+
+from typing import Callable, Optional
+
+# Callable taking the save function, to run it later (from any thread).
+SaveDeferrer = Callable[[Callable[[], None]], None]
+
+
+class DeferredSave:
+    """
+    Mixin of stores whose saving can be deferred (i.e. to a background thread, see
+    IdleScheduler) with `defer_save`. Without it, saves run right away on the calling thread.
+    As deferred save may run on another thread, the save function must not touch data the
+    calling thread keeps changing (copy it or guard it with a lock).
+    """
+
+    defer_save: Optional[SaveDeferrer] = None
+
+    def request_save(self, save: Callable[[], None]) -> None:
+        """
+        Runs the save function, or hands it over to `defer_save` if set.
+        """
+        if self.defer_save is None:
+            save()
+        else:
+            self.defer_save(save)
@@ -0,0 +1,160 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/history.py
+#
+##################################################################################
+"""
+
+import logging
+import sqlite3
+import time
+from typing import Dict, List, Optional
+
+from websiteapp.sqlite_store import SQLiteStore
+
+log = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL DEFAULT '',
+    visit_count INTEGER NOT NULL DEFAULT 0,
+    first_visit REAL NOT NULL,
+    last_visit REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS urls_last_visit ON urls (last_visit);
+"""
+
+# Frecency: visit count weighted by how recent the last visit is (in days).
+FRECENCY_SQL = """
+visit_count * CASE
+    WHEN :now - last_visit < 4 * 86400 THEN 100
+    WHEN :now - last_visit < 14 * 86400 THEN 70
+    WHEN :now - last_visit < 31 * 86400 THEN 50
+    WHEN :now - last_visit < 90 * 86400 THEN 30
+    ELSE 10
+END
+"""
+
+
+class HistoryStore(SQLiteStore):
+    """
+    Per-profile visit history kept in SQLite database (`history.sqlite`).
+
+    Visits are queued by the GUI thread and written by a worker thread, which commits them in
+    batches (one transaction per batch), so the GUI thread never waits for the disk. Entries older
+    than `max_age_days` are removed and the number of entries is capped at `max_entries` (least
+    frecent ones are dropped first). Pruning runs periodically on the worker thread and is followed
+    by incremental vacuum, returning freed pages to the file system.
+    """
+
+    FILE_NAME = 'history.sqlite'
+    SCHEMA = SCHEMA
+    NAME = 'history'
+    # Pruning is done at most once per that many seconds.
+    PRUNE_INTERVAL = 60 * 60
+
+    def __init__(self, storage_path: str, max_age_days: int = 90, max_entries: int = 20000):
+        """
+        Initialize the store and start the writer thread.
+
+        Args:
+            storage_path: Profile storage directory
+            max_age_days: Entries not visited for that many days are removed
+            max_entries: Maximum number of entries kept
+        """
+        self.max_age_days = max_age_days
+        self.max_entries = max_entries
+        self._last_prune = 0.0
+        super().__init__(storage_path)
+
+    # -----------------------------------------------------------------------------------------
+
+    def record_visit(self, url: str, title: Optional[str] = None) -> None:
+        """
+        Queues visit of given URL. Returns immediately.
+        """
+        if url and url.startswith(('http://', 'https://')):
+            self._put(('visit', url, title or '', time.time()))
+
+    def update_title(self, url: str, title: str) -> None:
+        """
+        Queues title update of already recorded URL. Returns immediately.
+        """
+        if url and title:
+            self._put(('title', url, title, time.time()))
+
+    # -----------------------------------------------------------------------------------------
+
+    def _write(self, db: sqlite3.Connection, batch: List) -> None:
+        if batch:
+            self._write_visits(db, batch)
+        if time.time() - self._last_prune > self.PRUNE_INTERVAL:
+            self._prune(db)
+
+    @staticmethod
+    def _write_visits(db: sqlite3.Connection, batch: List) -> None:
+        with db:
+            for kind, url, title, ts in batch:
+                if kind == 'visit':
+                    db.execute(
+                        'INSERT INTO urls (url, title, visit_count, first_visit, last_visit) '
+                        'VALUES (?, ?, 1, ?, ?) '
+                        'ON CONFLICT(url) DO UPDATE SET visit_count = visit_count + 1, '
+                        'last_visit = excluded.last_visit, '
+                        "title = CASE WHEN excluded.title != '' THEN excluded.title ELSE title END",
+                        (url, title, ts, ts))
+                else:
+                    db.execute('UPDATE urls SET title = ? WHERE url = ?', (title, url))
+        log.debug('History: %d changes written', len(batch))
+
+    def _prune(self, db: sqlite3.Connection) -> None:
+        now = time.time()
+        self._last_prune = now
+        with db:
+            removed = db.execute('DELETE FROM urls WHERE last_visit < ?',
+                                 (now - self.max_age_days * 86400,)).rowcount
+            removed += db.execute(
+                f'DELETE FROM urls WHERE id IN (SELECT id FROM urls ORDER BY {FRECENCY_SQL} DESC, '
+                'last_visit DESC LIMIT -1 OFFSET :max_entries)',
+                {'now': now, 'max_entries': self.max_entries}).rowcount
+        if removed:
+            db.execute('PRAGMA incremental_vacuum')
+            log.debug('History: %d entries pruned', removed)
+
+    # -----------------------------------------------------------------------------------------
+
+    def query(self, text: str = '', limit: int = 10) -> List[Dict]:
+        """
+        Returns entries whose URL or title contains given text, ordered by frecency (most
+        visited recently first). Empty text returns top entries. Suitable for autocomplete.
+        Can be called from any thread. Visits still waiting in the queue are not included.
+
+        Args:
+            text: Text to look for (case insensitive)
+            limit: Maximum number of entries returned
+
+        Returns:
+            List of dictionaries with url, title, visit_count, last_visit and frecency keys
+        """
+        pattern = '%' + text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        sql = (f'SELECT url, title, visit_count, last_visit, {FRECENCY_SQL} AS frecency FROM urls '
+               "WHERE url LIKE :pattern ESCAPE '\\' OR title LIKE :pattern ESCAPE '\\' "
+               'ORDER BY frecency DESC, last_visit DESC LIMIT :limit')
+        return self._read(sql, {'now': time.time(), 'pattern': pattern, 'limit': limit})
+
+    def most_visited(self, limit: int = 10) -> List[Dict]:
+        """
+        Returns top entries by frecency.
+        """
+        return self.query('', limit)
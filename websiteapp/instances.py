@@ -0,0 +1,143 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/instances.py
+#
+##################################################################################
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional
+
+log = logging.getLogger(__name__)
+
+
+class InstanceRegistry:
+    """
+    Registry of running app instances. Each instance publishes its status record (PID, profile,
+    URL, renderer PIDs, load state, memory use) as `instances/<PID>.json` in the runtime directory
+    and replaces it atomically on each update, so readers never see partial record. Records are
+    removed on exit, and records of instances that died without doing so are removed by readers.
+    Reading the registry costs one small file read per instance, with no /proc scanning.
+
+    As PIDs get reused, each record carries process start time (on Linux), which is checked
+    together with the PID, so a record is never mistaken for unrelated process.
+    """
+
+    DIR_NAME = 'instances'
+
+    def __init__(self, runtime_dir: str):
+        """
+        Args:
+            runtime_dir: Directory for runtime files (see Utils.get_runtime_dir())
+        """
+        self.registry_dir = os.path.join(runtime_dir, self.DIR_NAME)
+
+    def record_file(self, pid: int) -> str:
+        return os.path.join(self.registry_dir, f'{pid}.json')
+
+    def publish(self, record: Dict) -> None:
+        """
+        Writes (or replaces) status record of the current process.
+        """
+        record = {**record, 'pid': os.getpid(), 'process_start': self.process_start(os.getpid()),
+                  'updated': time.time()}
+        os.makedirs(self.registry_dir, mode=0o700, exist_ok=True)
+        record_file = self.record_file(os.getpid())
+        tmp_file = f'{record_file}.tmp'
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(record, f)
+            os.replace(tmp_file, record_file)
+        except IOError as ex:
+            log.warning('Unable to publish instance status: %s', ex)
+
+    def unpublish(self) -> None:
+        """
+        Removes status record of the current process.
+        """
+        try:
+            os.remove(self.record_file(os.getpid()))
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def process_start(pid: int) -> Optional[int]:
+        """
+        Returns start time (in clock ticks since boot) of given process, read from its
+        /proc/<PID>/stat (Linux only). Returns None if not available.
+        """
+        try:
+            with open(f'/proc/{pid}/stat', 'r', encoding='ascii', errors='replace') as f:
+                # Process name (2nd field) may contain spaces and parentheses, so skip past it.
+                fields = f.read().rsplit(')', 1)[1].split()
+            return int(fields[19])
+        except (IOError, IndexError, ValueError):
+            return None
+
+    @staticmethod
+    def is_alive(record: Dict) -> bool:
+        """
+        Returns True if process the record belongs to is still running.
+        """
+        pid = int(record['pid'])
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            # Exists, but is not ours.
+            pass
+        started = record.get('process_start')
+        return started is None or InstanceRegistry.process_start(pid) in (started, None)
+
+    def running(self) -> List[Dict]:
+        """
+        Returns records of running instances, ordered by start time. Records of instances that
+        are gone are removed.
+        """
+        try:
+            names = os.listdir(self.registry_dir)
+        except FileNotFoundError:
+            return []
+        records = []
+        for name in names:
+            if not name.endswith('.json'):
+                continue
+            record_file = os.path.join(self.registry_dir, name)
+            try:
+                with open(record_file, 'r', encoding='utf-8') as f:
+                    record = json.load(f)
+                alive = self.is_alive(record)
+            except FileNotFoundError:
+                # Removed meanwhile (the instance just quit).
+                continue
+            except (ValueError, KeyError, TypeError, IOError, AttributeError):
+                alive = False
+            if not alive:
+                try:
+                    os.remove(record_file)
+                except OSError:
+                    pass
+                continue
+            records.append(record)
+        return sorted(records, key=lambda item: item.get('started', 0))
+
+    def find(self, target: Optional[str] = None) -> List[Dict]:
+        """
+        Returns records of running instances of given profile (or with given PID). All the
+        records are returned if no target is given.
+        """
+        return [record for record in self.running()
+                if target is None or record.get('profile') == target or str(record.get('pid')) == target]
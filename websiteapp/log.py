@@ -0,0 +1,164 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/log.py
+#
+##################################################################################
+"""
+
+import logging
+import os
+import sys
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from typing import Deque, List, Optional
+
+from PySide6.QtCore import QtMsgType, qInstallMessageHandler
+
+LOG_FORMAT = '%(asctime)s.%(msecs)03d %(levelname)-7s %(name)s: %(message)s'
+LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class RingBufferHandler(logging.Handler):
+    """
+    Keeps the most recent log records in memory. Records are stored as is and formatted only
+    when dumped, so keeping the buffer costs next to nothing.
+    """
+
+    def __init__(self, capacity: int):
+        super().__init__()
+        self.records: Deque[logging.LogRecord] = deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+    def dump(self) -> List[str]:
+        """
+        Returns formatted content of the buffer, oldest entries first.
+        """
+        return [self.format(record) for record in list(self.records)]
+
+
+class Log:
+    """
+    Sets up app logging. Modules use their own loggers (`logging.getLogger(__name__)`) and
+    always pass arguments for lazy formatting, so disabled levels cost a single level check.
+    """
+
+    ROOT = 'websiteapp'
+    LEVELS = ('debug', 'info', 'warning', 'error')
+
+    LOG_DIR_NAME = 'logs'
+    LOG_FILE_NAME = 'webapp.log'
+    # Size of single log file and number of rotated files kept.
+    FILE_MAX_BYTES = 1024 * 1024
+    FILE_BACKUP_COUNT = 3
+    # Number of most recent records kept in memory.
+    RING_CAPACITY = 2000
+
+    ring: Optional[RingBufferHandler] = None
+    # Level of the records written to the log file.
+    file_level = logging.INFO
+
+    @classmethod
+    def setup(cls, debug: bool = False, level: str = 'info') -> logging.Logger:
+        """
+        Configures app's root logger. Records of all levels (debug included) are kept in the ring
+        buffer, so a dump has the details regardless of the configured level, which only applies
+        to the log file. Records are printed to stderr only in debug mode (warnings and errors are
+        printed always).
+
+        Args:
+            debug: Enables debug level of the log file and stderr output of all the records
+            level: Log level name (one of LEVELS) of the log file, used when not in debug mode
+
+        Returns:
+            App's root logger
+        """
+        root = logging.getLogger(cls.ROOT)
+        # Handlers filter by their own levels, the logger must let everything through for the ring.
+        root.setLevel(logging.DEBUG)
+        cls.file_level = logging.DEBUG if debug else getattr(logging, level.upper(), logging.INFO)
+        root.propagate = False
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+
+        formatter = logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT)
+
+        stderr_handler = logging.StreamHandler(sys.stderr)
+        stderr_handler.setLevel(logging.DEBUG if debug else logging.WARNING)
+        stderr_handler.setFormatter(formatter)
+        root.addHandler(stderr_handler)
+
+        cls.ring = RingBufferHandler(cls.RING_CAPACITY)
+        cls.ring.setLevel(logging.DEBUG)
+        cls.ring.setFormatter(formatter)
+        root.addHandler(cls.ring)
+
+        return root
+
+    @classmethod
+    def add_file(cls, storage_path: str) -> str:
+        """
+        Adds size-rotated log file located in given directory's `logs/` subdirectory. Records
+        below the level given to setup() are not written to it.
+
+        Args:
+            storage_path: Profile storage directory
+
+        Returns:
+            Path to the log file
+        """
+        log_dir = os.path.join(storage_path, cls.LOG_DIR_NAME)
+        os.makedirs(log_dir, exist_ok=True)
+        log_file = os.path.join(log_dir, cls.LOG_FILE_NAME)
+        handler = RotatingFileHandler(log_file, maxBytes=cls.FILE_MAX_BYTES,
+                                      backupCount=cls.FILE_BACKUP_COUNT, encoding='utf-8',
+                                      delay=True)
+        handler.setLevel(cls.file_level)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT))
+        logging.getLogger(cls.ROOT).addHandler(handler)
+        return log_file
+
+    @classmethod
+    def dump_ring(cls, target_file: str) -> int:
+        """
+        Writes content of the in-memory ring buffer to given file.
+
+        Returns:
+            Number of records written
+        """
+        lines = cls.ring.dump() if cls.ring else []
+        os.makedirs(os.path.dirname(target_file), exist_ok=True)
+        with open(target_file, 'w', encoding='utf-8') as f:
+            f.writelines(f'{line}\n' for line in lines)
+        return len(lines)
+
+    @classmethod
+    def install_qt_handler(cls) -> None:
+        """
+        Routes Qt's own messages (qDebug(), qWarning() etc.) to `websiteapp.qt` logger.
+        """
+        qt_logger = logging.getLogger(f'{cls.ROOT}.qt')
+        levels = {
+            QtMsgType.QtDebugMsg: logging.DEBUG,
+            QtMsgType.QtInfoMsg: logging.INFO,
+            QtMsgType.QtWarningMsg: logging.WARNING,
+            QtMsgType.QtCriticalMsg: logging.ERROR,
+            QtMsgType.QtFatalMsg: logging.CRITICAL,
+        }
+
+        def handler(mode, context, message):
+            level = levels.get(mode, logging.INFO)
+            if qt_logger.isEnabledFor(level):
+                qt_logger.log(level, '%s (%s:%s)', message, context.file, context.line)
+
+        qInstallMessageHandler(handler)
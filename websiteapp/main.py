@@ -0,0 +1,39 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/main.py
+#
+##################################################################################
+"""
+# Must be imported first, to include all the other imports in the startup trace.
+from websiteapp.trace import Trace  # noqa: F401, I001
+
+import sys
+
+from websiteapp.commands import Commands
+
+
+def run() -> None:
+    """
+    Application entry point. When renamed, ensure pyproject.toml's reference is updated as well.
+
+    Maintenance commands (i.e. `webapp list`) are dispatched before the GUI modules are imported,
+    so they do not pay for loading Qt WebEngine and work without a display.
+    """
+    if Commands.is_command(sys.argv):
+        sys.exit(Commands.run(sys.argv[1:]))
+
+    from websiteapp.webapp import WebApp
+    WebApp.run()
+
+
+if __name__ == '__main__':
+    run()
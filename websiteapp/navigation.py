@@ -0,0 +1,177 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/navigation.py
+#
+##################################################################################
+"""
+
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+class NavigationAction:
+    """Constants for navigation routing decisions"""
+    APP = "app"
+    BROWSER = "browser"
+    POPUP = "popup"
+
+    ALL = (APP, BROWSER, POPUP)
+
+
+class NavigationRouter:
+    """
+    Decides where a navigation should end up: in the app itself, in the system's default
+    browser or in a popup window.
+
+    Rules are matched by host suffix (i.e. `example.com` also matches `www.example.com`) and
+    then by path prefix (longest prefix wins). Rules are compiled into a dictionary keyed by
+    host suffix, so lookup cost depends on the number of labels in the host name, not on the
+    number of rules.
+    """
+
+    RULES_FILE_NAME = 'navigation.json'
+
+    # Schemes we never try to load ourselves, but always hand over to the system.
+    EXTERNAL_SCHEMES = frozenset({'mailto', 'tel', 'sms', 'callto', 'magnet', 'irc', 'ircs'})
+    # Schemes that are internal to the engine and must never be routed anywhere.
+    INTERNAL_SCHEMES = frozenset({'about', 'data', 'blob', 'javascript', 'qrc', 'chrome', 'devtools'})
+
+    def __init__(self, default_action: str = NavigationAction.BROWSER):
+        """
+        Initialize the router.
+
+        Args:
+            default_action: Action used for hosts not matched by any rule
+        """
+        self.default_action = default_action
+        # host suffix -> list of (path prefix, action), sorted by prefix length, longest first
+        self._rules: Dict[str, List[Tuple[str, str]]] = {}
+
+    def add_rule(self, host: str, action: str, path_prefix: str = '/') -> None:
+        """
+        Adds routing rule.
+
+        Args:
+            host: Host suffix the rule applies to (leading `*.` or `.` is ignored)
+            action: One of NavigationAction values
+            path_prefix: Path prefix the rule applies to (defaults to whole host)
+
+        Raises:
+            ValueError: If action is not known
+        """
+        if action not in NavigationAction.ALL:
+            raise ValueError(f"Invalid navigation action '{action}'. Expected one of: {', '.join(NavigationAction.ALL)}")
+
+        host = host.strip().lower().lstrip('*').lstrip('.')
+        if not host:
+            return
+        if not path_prefix.startswith('/'):
+            path_prefix = f'/{path_prefix}'
+
+        rules = self._rules.setdefault(host, [])
+        rules[:] = [rule for rule in rules if rule[0] != path_prefix]
+        rules.append((path_prefix, action))
+        rules.sort(key=lambda rule: len(rule[0]), reverse=True)
+
+    def add_app_hosts(self, hosts: Iterable[str]) -> None:
+        """
+        Marks given hosts (and all their subdomains) as belonging to the app.
+        """
+        for host in hosts:
+            self.add_rule(host, NavigationAction.APP)
+
+    def route(self, url: str) -> str:
+        """
+        Returns the action for given URL.
+
+        Args:
+            url: The URL to route
+
+        Returns:
+            One of NavigationAction values
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme in self.INTERNAL_SCHEMES or not scheme:
+            return NavigationAction.APP
+        if scheme in self.EXTERNAL_SCHEMES:
+            return NavigationAction.BROWSER
+        if scheme not in ('http', 'https', 'file'):
+            return self.default_action
+
+        action = self._match(parts.hostname or '', parts.path or '/')
+        return action if action else self.default_action
+
+    def _match(self, host: str, path: str) -> Optional[str]:
+        """
+        Walks host suffixes from the most to the least specific one and returns action of the
+        first rule whose path prefix matches.
+        """
+        labels = host.lower().split('.')
+        for idx in range(len(labels)):
+            rules = self._rules.get('.'.join(labels[idx:]))
+            if rules is None:
+                continue
+            for path_prefix, action in rules:
+                if path.startswith(path_prefix):
+                    return action
+        return None
+
+    def load_rules(self, rules_file: str) -> None:
+        """
+        Loads additional rules from JSON file. Expected format is a list of objects with `host`,
+        `action` and optional `path` keys. Missing or malformed file is silently ignored.
+
+        Args:
+            rules_file: Path to the rules file
+        """
+        if not os.path.exists(rules_file):
+            return
+        try:
+            with open(rules_file, 'r', encoding='utf-8') as f:
+                rules = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return
+
+        for rule in rules if isinstance(rules, list) else []:
+            try:
+                self.add_rule(rule['host'], rule['action'], rule.get('path', '/'))
+            except (KeyError, TypeError, AttributeError, ValueError):
+                continue
+
+    @classmethod
+    def for_app(cls, app_url: str, extra_hosts: Optional[Iterable[str]] = None,
+                rules_file: Optional[str] = None,
+                default_action: str = NavigationAction.BROWSER) -> 'NavigationRouter':
+        """
+        Builds router for the app, treating app's own host as internal.
+
+        Args:
+            app_url: The URL the app was started with
+            extra_hosts: Additional hosts to be kept within the app
+            rules_file: Optional path to per-profile rules file
+            default_action: Action for all the hosts not matched by any rule
+
+        Returns:
+            Configured NavigationRouter instance
+        """
+        router = cls(default_action)
+        app_host = urlsplit(app_url).hostname
+        if app_host:
+            # Treat "www.example.com" and "example.com" as the same site.
+            router.add_app_hosts([app_host[4:] if app_host.startswith('www.') else app_host])
+        router.add_app_hosts(extra_hosts or [])
+        if rules_file:
+            router.load_rules(rules_file)
+        return router
@@ -0,0 +1,223 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/netstats.py
+#
+##################################################################################
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWebEngineCore import QWebEnginePage, QWebEngineUrlRequestInfo, QWebEngineUrlRequestInterceptor
+
+from websiteapp.deferred import DeferredSave, SaveDeferrer
+
+log = logging.getLogger(__name__)
+
+# Reports Resource Timing entries of the document as `[url, initiator type, transfer size,
+# duration]` arrays. Transfer size of cross-origin resources is 0 unless the server sends
+# `Timing-Allow-Origin` header.
+RESOURCE_TIMING_JS = """
+(function () {
+    if (!window.PerformanceObserver) {
+        return;
+    }
+    new PerformanceObserver(function (list) {
+        list.getEntries().forEach(function (entry) {
+            window.__webapp.emit('netstats', [entry.name, entry.initiatorType || entry.entryType,
+                entry.transferSize || 0, Math.round(entry.duration)]);
+        });
+    }).observe({entryTypes: ['navigation', 'resource']});
+})();
+"""
+
+
+class OriginStats:
+    """Counters of single origin."""
+
+    __slots__ = ('requests', 'types', 'timed', 'bytes', 'duration_total', 'duration_max')
+
+    def __init__(self):
+        self.requests = 0
+        # Resource type -> number of requests
+        self.types: Dict[str, int] = {}
+        # Number of requests with timing data
+        self.timed = 0
+        self.bytes = 0
+        self.duration_total = 0
+        self.duration_max = 0
+
+    def to_dict(self, origin: str) -> Dict:
+        return {
+            'origin': origin,
+            'requests': self.requests,
+            'types': dict(self.types),
+            'bytes': self.bytes,
+            'avg_ms': round(self.duration_total / self.timed) if self.timed else 0,
+            'max_ms': self.duration_max,
+        }
+
+
+class NetworkStats(QWebEngineUrlRequestInterceptor, DeferredSave):
+    """
+    Per-origin network accounting. Installed as the profile's request interceptor, it counts
+    requests per origin and resource type. Transfer sizes and durations come from the pages'
+    Resource Timing data, delivered in batches through the page bridge. Requests slower than the
+    threshold are logged.
+
+    Qt 6 calls the interceptor on the UI thread, before every request is started, so it only bumps
+    counters (resource type names are cached) and anything slower is left to the Resource Timing
+    handler and to saving.
+    Number of tracked origins is capped, requests to any further origins are counted together.
+    Summary is periodically saved to profile's `netstats.json` file, so it can be viewed with
+    `webapp netstats` command. Saving can be deferred (see DeferredSave).
+    """
+
+    FILE_NAME = 'netstats.json'
+    MAX_ORIGINS = 200
+    OTHER_ORIGIN = '(other)'
+    SAVE_INTERVAL_MS = 60 * 1000
+
+    def __init__(self, storage_path: str, slow_ms: int = 2000,
+                 defer_save: Optional[SaveDeferrer] = None, parent=None):
+        """
+        Initialize network stats.
+
+        Args:
+            storage_path: Profile storage directory
+            slow_ms: Requests taking that many milliseconds or more are logged
+            defer_save: Runs saves later (see DeferredSave). Stats are saved right away if not given.
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self.stats_file = os.path.join(storage_path, self.FILE_NAME)
+        self.slow_ms = slow_ms
+        self.defer_save = defer_save
+        self.started = time.time()
+        self._origins: Dict[str, OriginStats] = {}
+        self._lock = threading.Lock()
+        self._type_names: Dict[QWebEngineUrlRequestInfo.ResourceType, str] = {}
+        self._dirty = False
+
+        self._save_timer = QTimer(self)
+        self._save_timer.setInterval(self.SAVE_INTERVAL_MS)
+        self._save_timer.timeout.connect(self._request_save)
+        self._save_timer.start()
+
+    def _origin_stats(self, origin: str) -> OriginStats:
+        stats = self._origins.get(origin)
+        if stats is None:
+            if len(self._origins) >= self.MAX_ORIGINS:
+                origin = self.OTHER_ORIGIN
+                stats = self._origins.get(origin)
+            if stats is None:
+                stats = self._origins[origin] = OriginStats()
+        return stats
+
+    def interceptRequest(self, info: QWebEngineUrlRequestInfo) -> None:  # noqa: N802 - Qt API
+        # Runs on the UI thread for each request, so it must stay cheap.
+        url = info.requestUrl()
+        port = url.port()
+        origin = f'{url.scheme()}://{url.host()}' + (f':{port}' if port != -1 else '')
+        resource_type = info.resourceType()
+        type_name = self._type_names.get(resource_type)
+        if type_name is None:
+            type_name = self._type_names[resource_type] = resource_type.name.replace('ResourceType', '').lower()
+        with self._lock:
+            stats = self._origin_stats(origin)
+            stats.requests += 1
+            stats.types[type_name] = stats.types.get(type_name, 0) + 1
+            self._dirty = True
+
+    def attach(self, page: QWebEnginePage) -> None:
+        """
+        Makes the page report its Resource Timing data.
+        """
+        page.bridge.inject('netstats', RESOURCE_TIMING_JS)
+        page.bridge.subscribe('netstats', self.on_timing)
+
+    def on_timing(self, entry) -> None:
+        try:
+            url, kind, size, duration = entry
+            size, duration = int(size), int(duration)
+        except (TypeError, ValueError):
+            return
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            return
+        with self._lock:
+            stats = self._origin_stats(f'{parts.scheme}://{parts.netloc}')
+            stats.timed += 1
+            stats.bytes += size
+            stats.duration_total += duration
+            stats.duration_max = max(stats.duration_max, duration)
+            self._dirty = True
+        if duration >= self.slow_ms:
+            log.info('Slow request (%d ms, %s, %d bytes): %s', duration, kind, size, url)
+
+    def summary(self) -> List[Dict]:
+        """
+        Returns per-origin stats, the busiest origins first.
+        """
+        with self._lock:
+            result = [stats.to_dict(origin) for origin, stats in self._origins.items()]
+        return sorted(result, key=lambda item: item['requests'], reverse=True)
+
+    def _request_save(self) -> None:
+        if self._dirty:
+            self.request_save(self.save)
+
+    def save(self) -> None:
+        """
+        Writes the summary to the stats file (if changed since last save). Can be called from
+        any thread.
+        """
+        if not self._dirty:
+            return
+        self._dirty = False
+        tmp_file = f'{self.stats_file}.tmp'
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'started': self.started, 'updated': time.time(), 'origins': self.summary()}, f)
+            os.replace(tmp_file, self.stats_file)
+        except IOError as ex:
+            log.warning('Unable to save network stats: %s', ex)
+
+    @staticmethod
+    def load(stats_file: str) -> Optional[Dict]:
+        """
+        Reads summary saved by save(). Returns None if there's none.
+        """
+        try:
+            with open(stats_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (IOError, ValueError):
+            return None
+
+    @staticmethod
+    def format_summary(origins: List[Dict], limit: Optional[int] = None) -> str:
+        """
+        Formats summary as plain text table.
+        """
+        lines = [f'{"Requests":>8} {"KiB":>9} {"Avg ms":>7} {"Max ms":>7}  Origin (top types)']
+        for item in origins[:limit]:
+            types = sorted(item['types'].items(), key=lambda pair: pair[1], reverse=True)[:3]
+            types_str = ', '.join(f'{name}: {count}' for name, count in types)
+            lines.append(f'{item["requests"]:>8} {item["bytes"] / 1024:>9.1f} {item["avg_ms"]:>7} '
+                         f'{item["max_ms"]:>7}  {item["origin"]} ({types_str})')
+        return '\n'.join(lines)
@@ -0,0 +1,213 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/notifications.py
+#
+##################################################################################
+"""
+
+import logging
+import time
+from collections import deque
+from datetime import datetime, time as time_of_day, timedelta
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtWidgets import QSystemTrayIcon
+
+if TYPE_CHECKING:
+    from PySide6.QtWebEngineCore import QWebEngineNotification
+
+log = logging.getLogger(__name__)
+
+
+class QuietHours:
+    """Daily time range, possibly spanning midnight (see Utils.parse_quiet_hours())."""
+
+    def __init__(self, start: time_of_day, end: time_of_day):
+        """
+        Args:
+            start: Time the quiet hours start at
+            end: Time the quiet hours end at
+        """
+        self.start = start
+        self.end = end
+
+    def is_quiet(self, now: Optional[datetime] = None) -> bool:
+        current = (now or datetime.now()).time()
+        if self.start <= self.end:
+            return self.start <= current < self.end
+        return current >= self.start or current < self.end
+
+    def seconds_left(self, now: Optional[datetime] = None) -> float:
+        """
+        Returns number of seconds till the end of the quiet hours.
+        """
+        now = now or datetime.now()
+        end = datetime.combine(now.date(), self.end)
+        if end <= now:
+            end += timedelta(days=1)
+        return (end - now).total_seconds()
+
+
+class NotificationCenter(QObject):
+    """
+    Delivers web notifications to the desktop through the tray icon (which uses desktop's
+    notification service, i.e. `org.freedesktop.Notifications` over D-Bus on Linux).
+
+    Notifications arriving in a burst are coalesced into a single "N new notifications" message,
+    notifications with the same tag replace each other while waiting, delivery is rate limited
+    per origin and notifications arriving during quiet hours are held and summarized once quiet
+    hours end. Each origin has its own delivery time, so an origin held back by the rate limit
+    does not delay the others.
+    """
+
+    # Notifications arriving within that time (in milliseconds) are coalesced.
+    BURST_WINDOW_MS = 1500
+    # How long (in milliseconds) delivered message stays on screen.
+    MESSAGE_TIMEOUT_MS = 10000
+    # Max number of notifications held per origin (the oldest ones are dropped).
+    MAX_PENDING = 100
+    # Max number of remembered tags (used to drop duplicates).
+    MAX_TAGS = 500
+
+    # Emitted when user clicks the delivered message.
+    clicked = Signal()
+
+    def __init__(self, tray_icon: QSystemTrayIcon, app_name: str, rate_limit: int = 6,
+                 quiet_hours: Optional[QuietHours] = None, parent=None):
+        """
+        Initialize the notification center.
+
+        Args:
+            tray_icon: Tray icon used to show the messages
+            app_name: Name used in coalesced messages
+            rate_limit: Max number of messages delivered per minute (per origin)
+            quiet_hours: Optional quiet hours
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self.tray_icon = tray_icon
+        self.app_name = app_name
+        self.rate_limit = rate_limit
+        self.quiet_hours = quiet_hours
+        # origin -> pending notifications, in order of arrival
+        self._pending: Dict[str, List['QWebEngineNotification']] = {}
+        # origin -> delivery times within the last minute
+        self._delivered: Dict[str, Deque[float]] = {}
+        # (origin, tag) -> (title, message) of the last delivered notification
+        self._last_by_tag: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        self._last_shown: Optional['QWebEngineNotification'] = None
+        # origin -> time (monotonic) its pending notifications are due to be delivered
+        self._due: Dict[str, float] = {}
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.deliver)
+        tray_icon.messageClicked.connect(self.on_message_clicked)
+
+    def present(self, notification: 'QWebEngineNotification') -> None:
+        """
+        Notification presenter, installed with QWebEngineProfile.setNotificationPresenter().
+        """
+        origin = notification.origin().host() or notification.origin().toString()
+        tag = notification.tag()
+        if tag and self._last_by_tag.get((origin, tag)) == (notification.title(), notification.message()):
+            log.debug('Duplicate notification dropped (tag: %s)', tag)
+            return
+
+        pending = self._pending.setdefault(origin, [])
+        if tag:
+            pending[:] = [item for item in pending if item.tag() != tag]
+        pending.append(notification)
+        if len(pending) > self.MAX_PENDING:
+            del pending[0]
+        notification.closed.connect(lambda o=origin, n=notification: self.on_closed(o, n))
+
+        if origin not in self._due:
+            self._due[origin] = time.monotonic() + self.BURST_WINDOW_MS / 1000
+            self.schedule()
+
+    def schedule(self) -> None:
+        """
+        Sets the timer to the earliest delivery time of all the origins.
+        """
+        if not self._due:
+            self._timer.stop()
+            return
+        delay = min(self._due.values()) - time.monotonic()
+        self._timer.start(max(0, int(delay * 1000)))
+
+    def on_closed(self, origin: str, notification: 'QWebEngineNotification') -> None:
+        """
+        Page closed the notification (i.e. message was read elsewhere) before we delivered it.
+        """
+        pending = self._pending.get(origin)
+        if pending and notification in pending:
+            pending.remove(notification)
+
+    def deliver(self) -> None:
+        """
+        Delivers notifications of the origins that are due.
+        """
+        now = time.monotonic()
+        if self.quiet_hours and self.quiet_hours.is_quiet():
+            seconds = self.quiet_hours.seconds_left()
+            log.debug('Quiet hours, holding %d notifications for %d s',
+                      sum(len(items) for items in self._pending.values()), seconds)
+            for origin in self._due:
+                self._due[origin] = max(self._due[origin], now + seconds + 1)
+            self.schedule()
+            return
+
+        for origin, due in list(self._due.items()):
+            if due > now:
+                continue
+            pending = self._pending.pop(origin, None)
+            if not pending:
+                del self._due[origin]
+                continue
+            delivered = self._delivered.setdefault(origin, deque())
+            while delivered and now - delivered[0] > 60:
+                delivered.popleft()
+            if len(delivered) >= self.rate_limit:
+                # Over the limit: keep collecting and try again once the oldest delivery expires.
+                self._pending[origin] = pending
+                self._due[origin] = now + 60 - (now - delivered[0]) + 0.1
+                continue
+            delivered.append(now)
+            del self._due[origin]
+            self.show(origin, pending)
+        self.schedule()
+
+    def show(self, origin: str, notifications: List['QWebEngineNotification']) -> None:
+        latest = notifications[-1]
+        if len(notifications) == 1:
+            title, message = latest.title(), latest.message()
+        else:
+            title = f'{len(notifications)} new notifications from {self.app_name}'
+            message = f'{latest.title()}: {latest.message()}' if latest.title() else latest.message()
+        if len(self._last_by_tag) > self.MAX_TAGS:
+            self._last_by_tag.clear()
+        for notification in notifications:
+            if notification.tag():
+                self._last_by_tag[(origin, notification.tag())] = (notification.title(), notification.message())
+            notification.show()
+
+        self._last_shown = latest
+        self.tray_icon.showMessage(title, message, self.tray_icon.icon(), self.MESSAGE_TIMEOUT_MS)
+        log.debug('Notification delivered: %s (%d coalesced)', title, len(notifications))
+
+    def on_message_clicked(self) -> None:
+        if self._last_shown is not None:
+            self._last_shown.click()
+            self._last_shown = None
+        self.clicked.emit()
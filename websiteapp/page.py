@@ -0,0 +1,153 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/page.py
+#
+##################################################################################
+"""
+
+import logging
+from typing import Callable, Optional
+
+from PySide6.QtCore import QUrl
+from PySide6.QtGui import QDesktopServices
+from PySide6.QtWebEngineCore import QWebEngineNewWindowRequest, QWebEnginePage, QWebEngineProfile
+
+from websiteapp.bridge import PageBridge
+from websiteapp.content_settings import ContentSettings
+from websiteapp.navigation import NavigationAction, NavigationRouter
+from websiteapp.userscripts import UserScriptManager
+
+log = logging.getLogger(__name__)
+js_log = logging.getLogger('websiteapp.js')
+
+
+class CustomWebEnginePage(QWebEnginePage):
+    """
+    App page that keeps link navigation within app's own origins and hands all other links
+    over to the system browser (or to a popup, if routing rules say so). Page's JavaScript
+    console output goes to the `websiteapp.js` logger. Each page has its own PageBridge.
+    """
+
+    def __init__(self, profile: QWebEngineProfile, parent=None,
+                 router: Optional[NavigationRouter] = None):
+        """
+        Initialize the page.
+
+        Args:
+            profile: Profile the page belongs to
+            parent: Parent object
+            router: Navigation router. If not given, all navigation stays within the app.
+        """
+        super().__init__(profile, parent)
+        self.router = router
+        self.bridge = PageBridge(self)
+        # Shared user scripts engine and per-host content settings. Set by the app.
+        self.user_scripts: Optional[UserScriptManager] = None
+        self.content_settings: Optional[ContentSettings] = None
+        # Callable returning QWebEnginePage of a new popup window. Set by the app.
+        self.popup_factory: Optional[Callable[[], QWebEnginePage]] = None
+        # Callable opening new tab (with background flag) and returning its page. Set by the app
+        # if tabs are enabled.
+        self.tab_factory: Optional[Callable[[bool], QWebEnginePage]] = None
+        self.newWindowRequested.connect(self.on_new_window_requested)
+
+    def route(self, url: QUrl) -> str:
+        """
+        Returns routing decision for given URL.
+        """
+        if self.router is None:
+            return NavigationAction.APP
+        return self.router.route(url.toString())
+
+    def acceptNavigationRequest(self, url: QUrl, nav_type, is_main_frame: bool) -> bool:
+        # Only links clicked by the user in the main frame are routed. Redirects, form posts
+        # and script-initiated navigation (i.e. SSO flows) must stay where they are.
+        if is_main_frame and nav_type == QWebEnginePage.NavigationType.NavigationTypeLinkClicked:
+            action = self.route(url)
+            if action != NavigationAction.APP:
+                self.dispatch(url, action)
+                return False
+
+        accepted = super().acceptNavigationRequest(url, nav_type, is_main_frame)
+        if accepted and is_main_frame:
+            self.on_main_frame_navigation(url)
+        return accepted
+
+    def on_main_frame_navigation(self, url: QUrl) -> None:
+        """
+        Called for each accepted main frame navigation, before the new document is created.
+        Prepares per-URL page setup (i.e. user scripts or content settings).
+        """
+        if self.user_scripts is not None:
+            self.user_scripts.apply(self, url.toString())
+        if self.content_settings is not None:
+            self.content_settings.apply(self, url.toString())
+
+    def on_new_window_requested(self, request: QWebEngineNewWindowRequest) -> None:
+        """
+        Handles `target=_blank` links and `window.open()` calls. Popups with window features and
+        app's own URLs get a real app page (with user scripts, content settings and permissions),
+        opened in a new tab if tabs are enabled or in a popup window otherwise, so `window.opener`
+        stays intact (OAuth relies on it). Links routed to the system browser get no page at all.
+        """
+        url = request.requestedUrl()
+        destination = request.destination()
+        dialog = destination == QWebEngineNewWindowRequest.DestinationType.InNewDialog
+        action = NavigationAction.POPUP if dialog else self.route(url)
+        if action == NavigationAction.BROWSER:
+            self.dispatch(url, action)
+            return
+
+        if action == NavigationAction.APP and self.tab_factory is not None:
+            background = destination == QWebEngineNewWindowRequest.DestinationType.InNewBackgroundTab
+            kind, page = 'tab', self.tab_factory(background)
+        else:
+            kind, page = 'popup', self.open_popup()
+        if page is None:
+            # Popups are not available, so the link replaces the current page.
+            self.dispatch(url, NavigationAction.APP)
+            return
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('Navigation: new %s: %s', kind, url.toString())
+        request.openIn(page)
+
+    def dispatch(self, url: QUrl, action: str) -> None:
+        """
+        Performs the routing action for given URL.
+        """
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('Navigation: %s: %s', action, url.toString())
+        if action == NavigationAction.BROWSER:
+            QDesktopServices.openUrl(url)
+        elif action == NavigationAction.POPUP:
+            popup_page = self.open_popup()
+            if popup_page is not None:
+                popup_page.setUrl(url)
+        else:
+            self.setUrl(url)
+
+    def open_popup(self) -> Optional[QWebEnginePage]:
+        """
+        Returns page of a new popup window or None, if popups are not available.
+        """
+        return self.popup_factory() if self.popup_factory else None
+
+    def javaScriptConsoleMessage(self, level, message: str, line_number: int, source_id: str) -> None:
+        # Sites tend to be chatty, so plain console.log() goes to debug level only.
+        if level == QWebEnginePage.JavaScriptConsoleMessageLevel.ErrorMessageLevel:
+            log_level = logging.WARNING
+        elif level == QWebEnginePage.JavaScriptConsoleMessageLevel.WarningMessageLevel:
+            log_level = logging.INFO
+        else:
+            log_level = logging.DEBUG
+        if js_log.isEnabledFor(log_level):
+            js_log.log(log_level, '%s (%s:%d)', message, source_id, line_number)
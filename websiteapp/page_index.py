@@ -0,0 +1,175 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/page_index.py
+#
+##################################################################################
+"""
+
+import hashlib
+import logging
+import re
+import sqlite3
+import time
+from typing import Dict, List
+
+from websiteapp.sqlite_store import SQLiteStore
+
+log = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contents (
+    id INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL DEFAULT '',
+    content_id INTEGER NOT NULL,
+    indexed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_content ON pages (content_id);
+CREATE INDEX IF NOT EXISTS pages_indexed ON pages (indexed);
+CREATE VIRTUAL TABLE IF NOT EXISTS contents_fts USING fts5(body, tokenize = 'unicode61 remove_diacritics 2');
+"""
+
+
+class PageIndex(SQLiteStore):
+    """
+    Per-profile full-text index of visited pages' text, kept in SQLite FTS5 database
+    (`page-index.sqlite`).
+
+    Page text is queued by the GUI thread and truncated, hashed and indexed by a worker thread
+    (committing in batches), so the GUI thread never waits for it. Identical text (i.e. the same
+    page reachable with different URLs) is indexed once. Total size of indexed text is kept within
+    `max_bytes`: once exceeded, the texts of the pages indexed the longest time ago are dropped
+    first.
+    """
+
+    FILE_NAME = 'page-index.sqlite'
+    SCHEMA = SCHEMA
+    NAME = 'page index'
+    # Text over that many characters is not indexed.
+    MAX_TEXT = 256 * 1024
+    MAX_BATCH = 50
+
+    def __init__(self, storage_path: str, max_bytes: int = 100 * 1024 * 1024):
+        """
+        Initialize the index and start the writer thread.
+
+        Args:
+            storage_path: Profile storage directory
+            max_bytes: Max total size of indexed text
+        """
+        self.max_bytes = max_bytes
+        super().__init__(storage_path)
+
+    # -----------------------------------------------------------------------------------------
+
+    def add(self, url: str, title: str, text: str) -> None:
+        """
+        Queues page text for indexing. Returns immediately.
+        """
+        if url.startswith(('http://', 'https://')):
+            self._put((url, title or '', text, time.time()))
+
+    # -----------------------------------------------------------------------------------------
+
+    def _write(self, db: sqlite3.Connection, batch: List) -> None:
+        if batch:
+            self._index(db, batch)
+            self._prune(db)
+
+    def _index(self, db: sqlite3.Connection, batch: List) -> None:
+        indexed = 0
+        with db:
+            for url, title, text, ts in batch:
+                text = text[:self.MAX_TEXT]
+                if not text.strip():
+                    continue
+                digest = hashlib.sha1(text.encode('utf-8', errors='replace')).hexdigest()
+                row = db.execute('SELECT id FROM contents WHERE hash = ?', (digest,)).fetchone()
+                if row is not None:
+                    content_id = row[0]
+                else:
+                    content_id = db.execute('INSERT INTO contents (hash, size) VALUES (?, ?)',
+                                            (digest, len(text))).lastrowid
+                    db.execute('INSERT INTO contents_fts (rowid, body) VALUES (?, ?)', (content_id, text))
+                db.execute(
+                    'INSERT INTO pages (url, title, content_id, indexed) VALUES (?, ?, ?, ?) '
+                    'ON CONFLICT(url) DO UPDATE SET title = excluded.title, '
+                    'content_id = excluded.content_id, indexed = excluded.indexed',
+                    (url, title, content_id, ts))
+                indexed += 1
+        log.debug('Page index: %d pages indexed', indexed)
+
+    def _prune(self, db: sqlite3.Connection) -> None:
+        total = db.execute('SELECT COALESCE(SUM(size), 0) FROM contents').fetchone()[0]
+        with db:
+            removed = 0
+            if total > self.max_bytes:
+                # Make some room at once, so we do not prune after each page. Text shared by
+                # several pages is counted once and dropped together with all of them.
+                target = self.max_bytes * 0.9
+                doomed = []
+                for content_id, size in db.execute(
+                        'SELECT contents.id, contents.size FROM contents '
+                        'JOIN pages ON pages.content_id = contents.id '
+                        'GROUP BY contents.id ORDER BY MAX(pages.indexed)'):
+                    if total <= target:
+                        break
+                    doomed.append((content_id,))
+                    total -= size
+                removed = sum(db.execute('DELETE FROM pages WHERE content_id = ?', row).rowcount for row in doomed)
+            orphans = db.execute('SELECT id FROM contents WHERE id NOT IN (SELECT content_id FROM pages)').fetchall()
+            db.executemany('DELETE FROM contents_fts WHERE rowid = ?', orphans)
+            db.executemany('DELETE FROM contents WHERE id = ?', orphans)
+        if orphans:
+            db.execute('PRAGMA incremental_vacuum')
+            log.debug('Page index: %d pages and %d texts pruned', removed, len(orphans))
+
+    # -----------------------------------------------------------------------------------------
+
+    @staticmethod
+    def to_match(text: str) -> str:
+        """
+        Turns user's text into FTS5 query matching pages containing all the words (the last one
+        as prefix, so results show up while typing). FTS5 operators are not interpreted.
+        """
+        words = re.findall(r'\w+', text)
+        if not words:
+            return ''
+        terms = [f'"{word}"' for word in words]
+        terms[-1] += '*'
+        return ' '.join(terms)
+
+    def search(self, text: str, limit: int = 50) -> List[Dict]:
+        """
+        Returns pages containing all the words of given text, the best matches first. Can be
+        called from any thread. Pages still waiting in the queue are not included.
+
+        Args:
+            text: Words to look for
+            limit: Maximum number of pages returned
+
+        Returns:
+            List of dictionaries with url, title, snippet (with matches in [brackets]) and
+            indexed keys
+        """
+        match = self.to_match(text)
+        if not match:
+            return []
+        sql = ("SELECT pages.url, pages.title, snippet(contents_fts, 0, '[', ']', '…', 16) AS snippet, "
+               'pages.indexed FROM contents_fts JOIN pages ON pages.content_id = contents_fts.rowid '
+               'WHERE contents_fts MATCH ? ORDER BY rank, pages.indexed DESC LIMIT ?')
+        return self._read(sql, (match, limit))
@@ -0,0 +1,87 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/page_search.py
+#
+##################################################################################
+"""
+
+from PySide6.QtCore import Qt, QTimer, Signal
+from PySide6.QtWidgets import QDialog, QLabel, QLineEdit, QListWidget, QListWidgetItem, QVBoxLayout
+
+from websiteapp.page_index import PageIndex
+
+
+class PageSearchDialog(QDialog):
+    """
+    Searches the text of visited pages (see PageIndex) as user types. Activating a result emits
+    `open_url` with page's URL and closes the dialog.
+    """
+
+    # Search runs once user stops typing for that long (in milliseconds).
+    SEARCH_DELAY_MS = 150
+
+    open_url = Signal(str)
+
+    def __init__(self, page_index: PageIndex, parent=None):
+        super().__init__(parent)
+        self.page_index = page_index
+        self.setWindowTitle('Search Visited Pages')
+        self.resize(600, 450)
+
+        self.query = QLineEdit(self)
+        self.query.setPlaceholderText('Words to look for...')
+        self.query.setClearButtonEnabled(True)
+        self.results = QListWidget(self)
+        self.results.setWordWrap(True)
+        self.status = QLabel(self)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.query)
+        layout.addWidget(self.results)
+        layout.addWidget(self.status)
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.search)
+        self.query.textChanged.connect(lambda _text: self.timer.start(self.SEARCH_DELAY_MS))
+        self.query.returnPressed.connect(self.open_first)
+        self.results.itemActivated.connect(self.open_item)
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        self.query.setFocus()
+        self.query.selectAll()
+
+    def search(self) -> None:
+        self.results.clear()
+        text = self.query.text()
+        if not text.strip():
+            self.status.clear()
+            return
+        hits = self.page_index.search(text)
+        for hit in hits:
+            item = QListWidgetItem(f'{hit["title"] or hit["url"]}\n{hit["snippet"]}')
+            item.setData(Qt.ItemDataRole.UserRole, hit['url'])
+            item.setToolTip(hit['url'])
+            self.results.addItem(item)
+        self.status.setText(f'{len(hits)} pages found' if hits else 'Nothing found')
+
+    def open_first(self) -> None:
+        if self.timer.isActive():
+            self.timer.stop()
+            self.search()
+        if self.results.count():
+            self.open_item(self.results.item(0))
+
+    def open_item(self, item: QListWidgetItem) -> None:
+        self.open_url.emit(item.data(Qt.ItemDataRole.UserRole))
+        self.accept()
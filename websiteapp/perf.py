@@ -0,0 +1,252 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/perf.py
+#
+##################################################################################
+"""
+
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+
+from PySide6.QtCore import QObject, Qt, Signal
+from PySide6.QtWebEngineCore import QWebEnginePage, QWebEngineSettings
+from PySide6.QtWidgets import QLabel, QWidget
+
+# Page-side collector. Samples are aggregated in the page and sent once per second (and only if
+# there is anything to send), so instrumentation does not flood the bridge.
+PERF_JS = """
+(function () {
+    if (!window.PerformanceObserver) {
+        return;
+    }
+    var MAX_SAMPLES = 100;
+    var sample = null;
+    var frames = 0;
+
+    function current() {
+        if (sample === null) {
+            sample = {longtasks: [], loafs: [], inputs: [], fps: null};
+        }
+        return sample;
+    }
+    function push(list, item) {
+        if (list.length < MAX_SAMPLES) {
+            list.push(item);
+        }
+    }
+    function source(script) {
+        var url = (script.sourceURL || '').split('?')[0];
+        return (url || 'inline') + (script.invoker ? ' (' + script.invoker + ')' : '');
+    }
+    function observe(type, callback, options) {
+        try {
+            new PerformanceObserver(function (list) { list.getEntries().forEach(callback); })
+                .observe(Object.assign({type: type, buffered: true}, options || {}));
+        } catch (e) {
+            // Entry type not supported by this engine version.
+        }
+    }
+
+    observe('longtask', function (entry) {
+        push(current().longtasks, Math.round(entry.duration));
+    });
+    observe('long-animation-frame', function (entry) {
+        var script = 0;
+        var top = null;
+        (entry.scripts || []).forEach(function (s) {
+            script += s.duration;
+            if (top === null || s.duration > top.duration) {
+                top = s;
+            }
+        });
+        var render = entry.renderStart ? entry.startTime + entry.duration - entry.renderStart : 0;
+        push(current().loafs, [Math.round(entry.duration), Math.round(entry.blockingDuration || 0),
+            Math.round(script), Math.round(render), top ? source(top) : null]);
+    });
+    observe('event', function (entry) {
+        if (entry.interactionId) {
+            push(current().inputs, [Math.round(entry.processingStart - entry.startTime),
+                Math.round(entry.duration), entry.name]);
+        }
+    }, {durationThreshold: 16});
+
+    function frame() {
+        frames++;
+        requestAnimationFrame(frame);
+    }
+    requestAnimationFrame(frame);
+
+    setInterval(function () {
+        if (document.visibilityState === 'visible') {
+            current().fps = frames;
+        }
+        frames = 0;
+        if (sample !== null) {
+            window.__webapp.emit('perf', sample);
+            sample = null;
+        }
+    }, 1000);
+})();
+"""
+
+
+class PerfMonitor(QObject):
+    """
+    Collects Long Tasks, Long Animation Frames, input delays (Event Timing) and frame rate of a
+    page. Samples are kept in rolling windows, so memory use is fixed. Long Animation Frames are
+    split into script and rendering (style, layout, paint) time, which tells if jank is caused by
+    site's scripts or by rendering, and attributed to the scripts that took the most time.
+    """
+
+    WINDOW = 500
+    FPS_WINDOW = 60
+    MAX_OFFENDERS = 50
+
+    updated = Signal()
+
+    def __init__(self, page: QWebEnginePage, parent=None):
+        super().__init__(parent)
+        self.page = page
+        self.longtasks: Deque[int] = deque(maxlen=self.WINDOW)
+        self.frames: Deque[int] = deque(maxlen=self.WINDOW)
+        self.script_ms: Deque[int] = deque(maxlen=self.WINDOW)
+        self.render_ms: Deque[int] = deque(maxlen=self.WINDOW)
+        self.input_delays: Deque[int] = deque(maxlen=self.WINDOW)
+        self.fps: Deque[int] = deque(maxlen=self.FPS_WINDOW)
+        # Script source -> (number of long frames, total time)
+        self.offenders: Dict[str, List[int]] = {}
+
+        page.bridge.inject('perf', PERF_JS)
+        page.bridge.subscribe('perf', self.on_sample)
+        page.loadStarted.connect(self.reset)
+
+    def reset(self) -> None:
+        for samples in (self.longtasks, self.frames, self.script_ms, self.render_ms, self.input_delays, self.fps):
+            samples.clear()
+        self.offenders.clear()
+        self.updated.emit()
+
+    def on_sample(self, sample) -> None:
+        if not isinstance(sample, dict):
+            return
+        try:
+            self.longtasks.extend(int(duration) for duration in sample.get('longtasks', ()))
+            for duration, _blocking, script, render, source in sample.get('loafs', ()):
+                self.frames.append(int(duration))
+                self.script_ms.append(int(script))
+                self.render_ms.append(int(render))
+                if source:
+                    self.add_offender(source, int(script))
+            self.input_delays.extend(int(delay) for delay, _duration, _name in sample.get('inputs', ()))
+            if sample.get('fps') is not None:
+                self.fps.append(int(sample['fps']))
+        except (TypeError, ValueError):
+            return
+        self.updated.emit()
+
+    def add_offender(self, source: str, duration: int) -> None:
+        entry = self.offenders.get(source)
+        if entry is None:
+            if len(self.offenders) >= self.MAX_OFFENDERS:
+                # Make room by dropping the least significant one.
+                del self.offenders[min(self.offenders, key=lambda key: self.offenders[key][1])]
+            entry = self.offenders[source] = [0, 0]
+        entry[0] += 1
+        entry[1] += duration
+
+    @staticmethod
+    def percentile(samples, percent: float) -> int:
+        if not samples:
+            return 0
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+    def top_offenders(self, limit: int = 5) -> List[Tuple[str, int, int]]:
+        """
+        Returns (source, number of long frames, total script time) of the worst scripts.
+        """
+        ordered = sorted(self.offenders.items(), key=lambda item: item[1][1], reverse=True)
+        return [(source, count, total) for source, (count, total) in ordered[:limit]]
+
+    def summary(self) -> Dict:
+        return {
+            'long_tasks': len(self.longtasks),
+            'long_task_p95': self.percentile(self.longtasks, 95),
+            'long_frames': len(self.frames),
+            'long_frame_p95': self.percentile(self.frames, 95),
+            'script_p95': self.percentile(self.script_ms, 95),
+            'render_p95': self.percentile(self.render_ms, 95),
+            'input_delay_p95': self.percentile(self.input_delays, 95),
+            'fps': round(sum(self.fps) / len(self.fps)) if self.fps else None,
+            'fps_min': min(self.fps) if self.fps else None,
+            'offenders': self.top_offenders(),
+        }
+
+
+class PerfOverlay(QLabel):
+    """
+    Semi-transparent panel shown in the corner of the view with PerfMonitor's summary and engine
+    settings affecting rendering performance. Does not take mouse input.
+    """
+
+    ENGINE_ATTRIBUTES = {
+        'accel. canvas': QWebEngineSettings.WebAttribute.Accelerated2dCanvasEnabled,
+        'WebGL': QWebEngineSettings.WebAttribute.WebGLEnabled,
+        'smooth scroll': QWebEngineSettings.WebAttribute.ScrollAnimatorEnabled,
+    }
+
+    def __init__(self, monitor: PerfMonitor, parent: QWidget):
+        super().__init__(parent)
+        self.monitor = monitor
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setTextFormat(Qt.TextFormat.PlainText)
+        self.setStyleSheet('QLabel { background: rgba(0, 0, 0, 180); color: #e0e0e0; '
+                           'font-family: monospace; font-size: 11px; padding: 6px; }')
+        monitor.updated.connect(self.refresh)
+        self.refresh()
+
+    def refresh(self) -> None:
+        if not self.isVisible() and self.text():
+            return
+        s = self.monitor.summary()
+        settings = self.monitor.page.settings()
+        engine = ', '.join(f'{name} {"on" if settings.testAttribute(attribute) else "off"}'
+                           for name, attribute in self.ENGINE_ATTRIBUTES.items())
+        lines = [
+            f'FPS: {s["fps"] if s["fps"] is not None else "-"} (min {s["fps_min"] if s["fps_min"] is not None else "-"})',
+            f'Long tasks: {s["long_tasks"]}, p95 {s["long_task_p95"]} ms',
+            f'Long frames: {s["long_frames"]}, p95 {s["long_frame_p95"]} ms '
+            f'(script {s["script_p95"]} / render {s["render_p95"]} ms)',
+            f'Input delay p95: {s["input_delay_p95"]} ms',
+            f'Engine: {engine}',
+        ]
+        if s['offenders']:
+            lines.append('Top offenders:')
+            for source, count, total in s['offenders']:
+                lines.append(f'  {total:>6} ms {count:>4}x  {self.shorten(source)}')
+        self.setText('\n'.join(lines))
+        self.adjustSize()
+        self.place()
+
+    @staticmethod
+    def shorten(source: str, max_len: int = 60) -> str:
+        return source if len(source) <= max_len else '…' + source[-(max_len - 1):]
+
+    def place(self) -> None:
+        parent = self.parentWidget()
+        if parent is not None:
+            self.move(max(0, parent.width() - self.width() - 8), 8)
+            self.raise_()
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        self.refresh()
@@ -0,0 +1,201 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/popups.py
+#
+##################################################################################
+"""
+
+import time
+from typing import Callable, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, Qt, QTimer, Signal
+from PySide6.QtGui import QCloseEvent
+from PySide6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile
+from PySide6.QtWebEngineWidgets import QWebEngineView
+from PySide6.QtWidgets import QVBoxLayout, QWidget
+
+
+class PopupWindow(QWidget):
+    """
+    Top-level window hosting a page opened by the site (i.e. OAuth login or `window.open()`).
+    Popup shares the profile with the app, so cookies set during login are visible to the app.
+
+    Closing the window does not destroy it. Instead `closed` is emitted, so the window can be
+    recycled by the PopupPool.
+    """
+
+    closed = Signal(object)
+
+    def __init__(self, profile: QWebEngineProfile, parent=None,
+                 page_factory: Optional[Callable[[QObject], QWebEnginePage]] = None):
+        """
+        Initialize the popup window.
+
+        Args:
+            profile: Profile to use (should be the one used by the app)
+            parent: Parent widget (used to inherit window icon and for positioning)
+            page_factory: Callable returning new page with given parent (i.e. app's page, with
+                          its scripts, settings and permissions). Plain page is used if not given.
+        """
+        super().__init__(None, Qt.WindowType.Window)
+        self.profile = profile
+        self.page_factory = page_factory
+        self.parent_window = parent
+        if parent is not None:
+            self.setWindowIcon(parent.windowIcon())
+        self.resize(520, 640)
+
+        self.view = QWebEngineView(self)
+        self.page = None
+        self.reset_page()
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.view)
+
+    def reset_page(self) -> None:
+        """
+        Replaces popup's page with a fresh one. Page a new window is opened in must not have
+        loaded anything yet, so recycled windows get a new page, which is cheap as no renderer
+        process is spawned until the page navigates somewhere.
+        """
+        old_page = self.page
+        self.page = self.page_factory(self.view) if self.page_factory else QWebEnginePage(self.profile, self.view)
+        self.page.titleChanged.connect(self.setWindowTitle)
+        self.page.windowCloseRequested.connect(self.close)
+        self.page.geometryChangeRequested.connect(self.on_geometry_change_requested)
+        self.view.setPage(self.page)
+        self.setWindowTitle('')
+        if old_page is not None:
+            old_page.deleteLater()
+
+    def place(self) -> None:
+        """
+        Centers the popup over its parent window.
+        """
+        if self.parent_window is not None:
+            center = self.parent_window.frameGeometry().center()
+            self.move(center.x() - self.width() // 2, center.y() - self.height() // 2)
+
+    def on_geometry_change_requested(self, geometry) -> None:
+        """
+        Honors size requested by `window.open()` features.
+        """
+        if geometry.width() > 0 and geometry.height() > 0:
+            self.resize(geometry.width(), geometry.height())
+
+    def closeEvent(self, event: QCloseEvent) -> None:
+        event.ignore()
+        self.hide()
+        self.closed.emit(self)
+
+
+class PopupPool(QObject):
+    """
+    Keeps a small number of pre-created, hidden popup windows, so popups requested by the page
+    (SSO logins, `window.open()`) show up instantly. Closed popups are returned to the pool
+    unless the pool is full, and idle popups above the pre-warmed count are evicted.
+    """
+
+    # Max number of idle popups kept in the pool.
+    DEFAULT_SIZE = 2
+    # Number of popups created up front.
+    DEFAULT_WARM = 1
+    # Idle popups above the warm count are destroyed after that many seconds.
+    DEFAULT_IDLE_TIMEOUT = 300
+
+    def __init__(self, profile: QWebEngineProfile, parent_window, size: int = DEFAULT_SIZE,
+                 warm: int = DEFAULT_WARM, idle_timeout: int = DEFAULT_IDLE_TIMEOUT,
+                 page_factory: Optional[Callable[[QObject], QWebEnginePage]] = None):
+        """
+        Initialize the popup pool.
+
+        Args:
+            profile: Profile shared by all the popups
+            parent_window: Main app window
+            size: Max number of idle popups kept
+            warm: Number of popups to pre-create with prewarm()
+            idle_timeout: Number of seconds after which idle popups get evicted
+            page_factory: Callable returning new popup page with given parent (see PopupWindow)
+        """
+        super().__init__(parent_window)
+        self.profile = profile
+        self.page_factory = page_factory
+        self.parent_window = parent_window
+        self.size = max(0, size)
+        self.warm = min(max(0, warm), self.size)
+        self.idle_timeout = idle_timeout
+
+        self._idle: List[Tuple[PopupWindow, float]] = []
+        self._active: List[PopupWindow] = []
+
+        self._eviction_timer = QTimer(self)
+        self._eviction_timer.setInterval(max(1, idle_timeout // 2) * 1000)
+        self._eviction_timer.timeout.connect(self.evict_idle)
+
+    def _create(self) -> PopupWindow:
+        popup = PopupWindow(self.profile, self.parent_window, self.page_factory)
+        popup.closed.connect(self.release)
+        return popup
+
+    def prewarm(self) -> None:
+        """
+        Fills the pool up to the warm count.
+        """
+        while len(self._idle) < self.warm:
+            self._idle.append((self._create(), time.monotonic()))
+        if self.size and not self._eviction_timer.isActive():
+            self._eviction_timer.start()
+
+    def acquire(self) -> PopupWindow:
+        """
+        Returns popup window, shown and ready to use, taking it from the pool if possible.
+        """
+        popup = self._idle.pop()[0] if self._idle else self._create()
+        self._active.append(popup)
+        popup.place()
+        popup.show()
+        popup.raise_()
+        popup.activateWindow()
+        return popup
+
+    def release(self, popup: PopupWindow) -> None:
+        """
+        Returns closed popup to the pool, or destroys it if the pool is full.
+        """
+        if popup in self._active:
+            self._active.remove(popup)
+        if len(self._idle) < self.size:
+            popup.reset_page()
+            self._idle.append((popup, time.monotonic()))
+        else:
+            popup.page.deleteLater()
+            popup.deleteLater()
+
+    def stats(self) -> dict:
+        """
+        Returns number of idle and active popups.
+        """
+        return {'idle': len(self._idle), 'active': len(self._active), 'size': self.size}
+
+    def evict_idle(self) -> None:
+        """
+        Destroys popups idling for longer than the timeout, leaving the warm ones intact.
+        """
+        deadline = time.monotonic() - self.idle_timeout
+        keep: List[Tuple[PopupWindow, float]] = []
+        for idx, (popup, since) in enumerate(self._idle):
+            if idx >= self.warm and since < deadline:
+                popup.deleteLater()
+            else:
+                keep.append((popup, since))
+        self._idle = keep
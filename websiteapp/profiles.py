@@ -0,0 +1,203 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/profiles.py
+#
+##################################################################################
+"""
+
+import errno
+import fnmatch
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+from websiteapp.bookmarks import BookmarkManager
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+
+class ProfileCloner:
+    """
+    Copies profile directory (i.e. to create new app from an existing one or from a template),
+    skipping caches, locks and logs. Files are cloned with reflinks (copy-on-write, so cloning
+    costs no time nor disk space until either copy changes) where the filesystem supports it
+    (Btrfs, XFS, bcachefs...), otherwise copied in parallel. The copy is made in a temporary
+    directory, renamed once complete, so a failed clone leaves nothing behind.
+
+    Hardlinks are never used, as Chromium updates its databases in place, which would leak
+    changes between the profiles.
+    """
+
+    # Directory names skipped anywhere in the tree.
+    SKIP_DIRS = {
+        'Cache', 'Code Cache', 'GPUCache', 'DawnCache', 'DawnGraphiteCache', 'DawnWebGPUCache',
+        'GrShaderCache', 'GraphiteDawnCache', 'ShaderCache', 'blob_storage', 'logs',
+    }
+    # File name patterns skipped anywhere in the tree.
+    SKIP_FILES = ['*.lock', 'LOCK', 'Singleton*', '*.tmp', 'netstats.json']
+    # Chromium's preferences file, whose paths pointing to the source profile get rewritten.
+    PREFERENCES_FILE_NAME = 'Preferences'
+
+    # ioctl(2) request for cloning the whole file (linux/fs.h).
+    FICLONE = 0x40049409
+    # Errors meaning the filesystem (or the pair of them) cannot do reflinks.
+    NO_REFLINK_ERRORS = {errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS}
+
+    def __init__(self, source: str, destination: str, workers: int = 8):
+        """
+        Initialize the cloner.
+
+        Args:
+            source: Source profile (or template) directory
+            destination: Directory to create. Must not exist.
+            workers: Number of parallel copy workers
+        """
+        self.source = os.path.abspath(source)
+        self.destination = os.path.abspath(destination)
+        self.workers = workers
+        self.reflink = fcntl is not None
+        self.stats = {'files': 0, 'bytes': 0, 'reflinked': 0, 'skipped': 0}
+
+    @staticmethod
+    def check_name(name: str) -> str:
+        """
+        Returns given profile (or template) name if it can be used as directory name.
+
+        Raises:
+            ValueError: If it cannot
+        """
+        if name.strip() in ('', '.', '..') or '/' in name or os.sep in name:
+            raise ValueError(f'Invalid profile name: "{name}"')
+        return name
+
+    def is_skipped(self, name: str, is_dir: bool) -> bool:
+        if is_dir:
+            return name in self.SKIP_DIRS
+        return any(fnmatch.fnmatchcase(name, pattern) for pattern in self.SKIP_FILES)
+
+    def scan(self, tmp_dir: str) -> List[Tuple[str, str, int]]:
+        """
+        Recreates directory tree of the source in tmp_dir and returns (source file, target file,
+        size) tuples of the files to copy.
+        """
+        files: List[Tuple[str, str, int]] = []
+        for root, dirs, names in os.walk(self.source):
+            kept = [name for name in dirs if not self.is_skipped(name, True)]
+            self.stats['skipped'] += len(dirs) - len(kept)
+            dirs[:] = kept
+            target_root = os.path.join(tmp_dir, os.path.relpath(root, self.source))
+            os.makedirs(target_root, exist_ok=True)
+            shutil.copymode(root, target_root)
+            for name in names:
+                path = os.path.join(root, name)
+                if self.is_skipped(name, False) or os.path.islink(path) or not os.path.isfile(path):
+                    self.stats['skipped'] += 1
+                    continue
+                files.append((path, os.path.join(target_root, name), os.path.getsize(path)))
+        return files
+
+    def copy_file(self, source: str, target: str) -> bool:
+        """
+        Copies single file, using reflink if possible.
+
+        Returns:
+            True if the file was reflinked
+        """
+        reflinked = False
+        if self.reflink:
+            with open(source, 'rb') as src, open(target, 'wb') as dst:
+                try:
+                    fcntl.ioctl(dst.fileno(), self.FICLONE, src.fileno())
+                    reflinked = True
+                except OSError as ex:
+                    if ex.errno not in self.NO_REFLINK_ERRORS:
+                        raise
+                    # No point in trying again for the remaining files.
+                    self.reflink = False
+        if not reflinked:
+            # Uses in-kernel copy (sendfile) where available.
+            shutil.copyfile(source, target)
+        shutil.copystat(source, target)
+        return reflinked
+
+    def clone(self) -> Dict[str, int]:
+        """
+        Clones the source directory.
+
+        Returns:
+            Stats: number of files and bytes copied, number of reflinked files and skipped entries
+
+        Raises:
+            IOError: If source does not exist, destination does exist or copying fails
+        """
+        if not os.path.isdir(self.source):
+            raise IOError(f'Not found: {self.source}')
+        if os.path.exists(self.destination):
+            raise IOError(f'Already exists: {self.destination}')
+
+        tmp_dir = f'{self.destination}.{os.getpid()}.tmp'
+        os.makedirs(os.path.dirname(self.destination), exist_ok=True)
+        try:
+            files = self.scan(tmp_dir)
+            # Biggest files first, so they do not end up being the tail of the run.
+            files.sort(key=lambda item: item[2], reverse=True)
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                reflinked = executor.map(lambda item: self.copy_file(item[0], item[1]), files)
+                self.stats['reflinked'] = sum(reflinked)
+            self.stats['files'] = len(files)
+            self.stats['bytes'] = sum(size for _source, _target, size in files)
+            self.rewrite(tmp_dir)
+            os.rename(tmp_dir, self.destination)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        return self.stats
+
+    def rewrite(self, directory: str) -> None:
+        """
+        Makes copied data belong to the new profile: bookmarks file loses its tombstones (there is
+        no other instance to merge them with), and Chromium's preferences no longer point to the
+        source profile's directory.
+        """
+        BookmarkManager(directory).compact()
+
+        preferences_file = os.path.join(directory, self.PREFERENCES_FILE_NAME)
+        if not os.path.exists(preferences_file):
+            return
+        try:
+            with open(preferences_file, 'r', encoding='utf-8') as f:
+                preferences = json.load(f)
+        except ValueError:
+            # Chromium will recreate it.
+            os.remove(preferences_file)
+            return
+        preferences = self.replace_paths(preferences, self.source, self.destination)
+        with open(preferences_file, 'w', encoding='utf-8') as f:
+            json.dump(preferences, f, separators=(',', ':'))
+
+    @staticmethod
+    def replace_paths(value, old: str, new: str):
+        """
+        Returns copy of the JSON value with paths starting with `old` changed to start with `new`.
+        """
+        if isinstance(value, dict):
+            return {key: ProfileCloner.replace_paths(item, old, new) for key, item in value.items()}
+        if isinstance(value, list):
+            return [ProfileCloner.replace_paths(item, old, new) for item in value]
+        if isinstance(value, str) and (value == old or value.startswith(old + os.sep)):
+            return new + value[len(old):]
+        return value
@@ -0,0 +1,101 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/resources.py
+#
+##################################################################################
+"""
+
+import logging
+import os
+from typing import Dict
+
+from PySide6.QtWebEngineCore import QWebEngineProfile, QWebEngineSettings
+
+log = logging.getLogger(__name__)
+
+
+class ResourceProfile:
+    """
+    Engine resource presets, trading memory for responsiveness. Each preset consists of Chromium
+    flags (which must be set before QApplication is created, as the engine reads them once) and of
+    profile settings applied once the profile is created.
+
+    `balanced` changes nothing, so it stays a baseline the other presets can be compared against.
+    """
+
+    DEFAULT = 'balanced'
+
+    PRESETS: Dict[str, Dict] = {
+        # Single renderer process shared by all the pages, small V8 heap, no GPU rasterization,
+        # small HTTP cache and no smooth scrolling animations.
+        'low-memory': {
+            'flags': [
+                '--renderer-process-limit=1',
+                '--process-per-site',
+                '--enable-low-end-device-mode',
+                '--disable-gpu-rasterization',
+                '--js-flags=--max-old-space-size=256',
+            ],
+            'http_cache_mb': 20,
+            'smooth_scroll': False,
+        },
+        # Engine defaults.
+        'balanced': {
+            'flags': [],
+            'http_cache_mb': None,
+            'smooth_scroll': None,
+        },
+        # GPU rasterization, bigger V8 heap and HTTP cache, and timers of the hidden window are
+        # not throttled (so the app is up to date the moment it is brought back).
+        'performance': {
+            'flags': [
+                '--enable-gpu-rasterization',
+                '--enable-zero-copy',
+                '--js-flags=--max-old-space-size=2048',
+                '--disable-background-timer-throttling',
+                '--disable-renderer-backgrounding',
+            ],
+            'http_cache_mb': 500,
+            'smooth_scroll': True,
+        },
+    }
+
+    @classmethod
+    def set_flags(cls, name: str) -> None:
+        """
+        Adds preset's Chromium flags to QTWEBENGINE_CHROMIUM_FLAGS. Must be called before
+        QApplication is created. Flags already set in the environment are put after preset's
+        ones, so they take precedence. Unknown preset names are ignored (argument parser will
+        complain about them later).
+        """
+        preset = cls.PRESETS.get(name)
+        if not preset or not preset['flags']:
+            return
+        flags = preset['flags'] + [os.environ.get('QTWEBENGINE_CHROMIUM_FLAGS', '')]
+        os.environ['QTWEBENGINE_CHROMIUM_FLAGS'] = ' '.join(flag for flag in flags if flag)
+
+    @classmethod
+    def apply(cls, name: str, profile: QWebEngineProfile) -> None:
+        """
+        Applies preset's settings to the profile. Must be called before any page is created.
+        """
+        preset = cls.PRESETS[name]
+        if preset['http_cache_mb'] is not None:
+            profile.setHttpCacheMaximumSize(preset['http_cache_mb'] * 1024 * 1024)
+        if preset['smooth_scroll'] is not None:
+            profile.settings().setAttribute(QWebEngineSettings.WebAttribute.ScrollAnimatorEnabled,
+                                            preset['smooth_scroll'])
+
+        log.debug('Resource profile: %s', name)
+        log.debug('Chromium flags: %s', os.environ.get('QTWEBENGINE_CHROMIUM_FLAGS', '') or '(none)')
+        log.debug('HTTP cache max size: %s', f'{profile.httpCacheMaximumSize()} bytes'
+                  if profile.httpCacheMaximumSize() else 'automatic')
@@ -0,0 +1,252 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/scheduler.py
+#
+##################################################################################
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtWidgets import QWidget
+
+from websiteapp.utils import Utils
+
+log = logging.getLogger(__name__)
+
+
+class Task:
+    __slots__ = ('key', 'func', 'priority', 'deadline', 'budget_ms', 'budget_io_kb', 'gui_thread', 'submitted',
+                 'future')
+
+    def __init__(self, key: str, func: Callable[[], None], priority: int, deadline: Optional[float],
+                 budget_ms: int, budget_io_kb: int, gui_thread: bool = False):
+        self.key = key
+        self.func = func
+        self.priority = priority
+        self.deadline = deadline
+        self.budget_ms = budget_ms
+        self.budget_io_kb = budget_io_kb
+        self.gui_thread = gui_thread
+        self.submitted = time.monotonic()
+        self.future: Optional[Future] = None
+
+
+class IdleScheduler(QObject):
+    """
+    Runs housekeeping tasks (i.e. saving files) on a pool of low priority worker threads, while
+    the user is not using the app: the window is hidden or not focused for a while. Work is also
+    deferred while the machine runs on battery or is busy. Tasks given `max_delay` run once it
+    passes, even if the app is in use, so data does not wait for too long. Tasks that must touch
+    Qt objects (i.e. start extracting page's text) can be run on the GUI thread instead; these
+    should only start the work, not do it.
+
+    Tasks are identified by key: submitting a task with the key of a pending one replaces it, so
+    i.e. a burst of bookmark changes results in a single save. Budgets are advisory: tasks cannot
+    be interrupted, so they are only checked once the task completes. The ones exceeding their
+    time or I/O budget are logged and the scheduler backs off for as long as the task overran its
+    time budget.
+    """
+
+    PRIORITY_HIGH = 0
+    PRIORITY_NORMAL = 1
+    PRIORITY_LOW = 2
+
+    # User is considered idle when the window is not active for that long.
+    IDLE_AFTER_MS = 3000
+    CHECK_INTERVAL_MS = 1000
+    # Work is deferred while 1 minute load average per CPU is above that.
+    MAX_LOAD = 0.8
+    # Nice value of the worker threads.
+    WORKER_NICE = 10
+
+    # Emitted (from worker thread) with task's key, duration (in ms), I/O done (in KiB) and
+    # whether it succeeded.
+    finished = Signal(str, float, int, bool)
+
+    def __init__(self, window: QWidget, workers: int = 2, parent=None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            window: Window whose activity tells whether user is idle
+            workers: Number of worker threads
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self.window = window
+        self.workers = workers
+        self._pending: Dict[str, Task] = {}
+        self._running: Dict[str, Task] = {}
+        self._idle_since: Optional[float] = None
+        self._backoff_until = 0.0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='idle-task',
+                                            initializer=self._lower_priority)
+        self.stats_counters = {'run': 0, 'replaced': 0, 'overrun': 0, 'failed': 0}
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.CHECK_INTERVAL_MS)
+        self._timer.timeout.connect(self.dispatch)
+        self.finished.connect(self.on_finished)
+
+    def submit(self, key: str, func: Callable[[], None], priority: int = PRIORITY_NORMAL,
+               max_delay: Optional[float] = None, budget_ms: int = 200, budget_io_kb: int = 1024,
+               gui_thread: bool = False) -> None:
+        """
+        Queues task. Must be called from the GUI thread. Returns immediately.
+
+        Args:
+            key: Task identifier. Replaces pending task with the same key.
+            func: Function to run (on worker thread)
+            priority: One of PRIORITY_* (lower runs first)
+            max_delay: Max number of seconds the task may wait for idle time. None means no limit.
+            budget_ms: Time the task is expected to take at most
+            budget_io_kb: Amount of I/O the task is expected to do at most
+            gui_thread: Run the task on the GUI thread instead of the worker one
+        """
+        deadline = time.monotonic() + max_delay if max_delay is not None else None
+        pending = self._pending.get(key)
+        if pending is not None:
+            # Keep the most urgent requirements of the two.
+            self.stats_counters['replaced'] += 1
+            priority = min(priority, pending.priority)
+            if pending.deadline is not None:
+                deadline = pending.deadline if deadline is None else min(deadline, pending.deadline)
+        self._pending[key] = Task(key, func, priority, deadline, budget_ms, budget_io_kb, gui_thread)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def is_idle(self) -> bool:
+        if self.window.isVisible() and self.window.isActiveWindow():
+            self._idle_since = None
+            return False
+        now = time.monotonic()
+        if self._idle_since is None:
+            self._idle_since = now
+        return (now - self._idle_since) * 1000 >= self.IDLE_AFTER_MS
+
+    @staticmethod
+    def is_busy() -> bool:
+        try:
+            return os.getloadavg()[0] / (os.cpu_count() or 1) > IdleScheduler.MAX_LOAD
+        except (AttributeError, OSError):
+            # Not available on Windows.
+            return False
+
+    def dispatch(self) -> None:
+        """
+        Starts pending tasks, if the conditions allow. Called periodically while there is work.
+        """
+        if not self._pending:
+            self._timer.stop()
+            return
+        now = time.monotonic()
+        idle = now >= self._backoff_until and self.is_idle() and Utils.is_on_ac_power() and not self.is_busy()
+        for task in sorted(self._pending.values(), key=lambda t: (t.priority, t.submitted)):
+            if task.key in self._running:
+                # Will run once the previous run of the same task completes.
+                continue
+            if not idle and (task.deadline is None or now < task.deadline):
+                continue
+            if task.gui_thread:
+                del self._pending[task.key]
+                self._running[task.key] = task
+                self._execute(task)
+                continue
+            if len(self._running) >= self.workers:
+                continue
+            del self._pending[task.key]
+            self._running[task.key] = task
+            task.future = self._executor.submit(self._execute, task)
+
+    def _execute(self, task: Task) -> None:
+        io_before = self._thread_io()
+        started = time.monotonic()
+        succeeded = True
+        try:
+            task.func()
+        except Exception:  # pylint: disable=broad-except
+            log.exception('Background task "%s" failed', task.key)
+            succeeded = False
+        io_after = self._thread_io()
+        io_kb = (io_after - io_before) // 1024 if io_before is not None and io_after is not None else 0
+        self.finished.emit(task.key, (time.monotonic() - started) * 1000, io_kb, succeeded)
+
+    def on_finished(self, key: str, duration_ms: float, io_kb: int, succeeded: bool) -> None:
+        task = self._running.pop(key, None)
+        if task is None:
+            return
+        self.stats_counters['run' if succeeded else 'failed'] += 1
+        if duration_ms > task.budget_ms or io_kb > task.budget_io_kb:
+            self.stats_counters['overrun'] += 1
+            log.warning('Background task "%s" exceeded its budget: %d ms (budget %d ms), %d KiB I/O (budget %d KiB)',
+                        key, duration_ms, task.budget_ms, io_kb, task.budget_io_kb)
+            self._backoff_until = time.monotonic() + max(0.0, duration_ms - task.budget_ms) / 1000
+        else:
+            log.debug('Background task "%s" done in %d ms, %d KiB I/O', key, duration_ms, io_kb)
+
+    def close(self) -> None:
+        """
+        Runs all the pending tasks (regardless of conditions) and waits for them to complete.
+        """
+        self._timer.stop()
+        for task in sorted(self._pending.values(), key=lambda t: (t.priority, t.submitted)):
+            running = self._running.get(task.key)
+            if running is not None and running.future is not None:
+                # Runs of the same task must not overlap (i.e. two saves writing the same file).
+                running.future.result()
+            if task.gui_thread:
+                self._execute(task)
+            else:
+                self._executor.submit(self._execute, task)
+        self._pending.clear()
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict:
+        return {
+            'pending': len(self._pending),
+            'running': len(self._running),
+            **self.stats_counters,
+        }
+
+    # -----------------------------------------------------------------------------------------
+
+    @staticmethod
+    def _lower_priority() -> None:
+        """
+        Lowers CPU priority of the worker thread. On Linux nice value is per thread, elsewhere
+        it would affect the whole process, so it is left alone.
+        """
+        if not sys.platform.startswith('linux'):
+            return
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), IdleScheduler.WORKER_NICE)
+        except OSError as ex:
+            log.debug('Unable to lower worker thread priority: %s', ex)
+
+    @staticmethod
+    def _thread_io() -> Optional[int]:
+        """
+        Returns number of bytes read and written by the current thread so far (Linux only).
+        """
+        try:
+            with open('/proc/thread-self/io', 'r', encoding='ascii') as f:
+                counters = dict(line.split(':', 1) for line in f)
+            return int(counters['rchar']) + int(counters['wchar'])
+        except (IOError, KeyError, ValueError):
+            return None
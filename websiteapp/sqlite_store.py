@@ -0,0 +1,147 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/sqlite_store.py
+#
+##################################################################################
+"""
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+log = logging.getLogger(__name__)
+
+
+class SQLiteStore:
+    """
+    Base of per-profile SQLite databases written by a worker thread.
+
+    Changes are queued by the GUI thread and handed over to `_write()` on the worker thread in
+    batches, so the GUI thread never waits for the disk. Reads use separate connection and can
+    be done from any thread. Subclasses provide FILE_NAME, SCHEMA and `_write()`.
+    """
+
+    FILE_NAME = ''
+    SCHEMA = ''
+    # Name used in the log messages and as the worker thread name.
+    NAME = 'database'
+    # Worker waits that long (in seconds) for more changes before writing the batch.
+    BATCH_DELAY = 2.0
+    MAX_BATCH = 500
+
+    _STOP = object()
+
+    def __init__(self, storage_path: str):
+        """
+        Initialize the store and start the writer thread. Subclasses must set up their own
+        attributes before calling it.
+
+        Args:
+            storage_path: Profile storage directory
+        """
+        os.makedirs(storage_path, exist_ok=True)
+        self.db_file = os.path.join(storage_path, self.FILE_NAME)
+        self._queue: queue.Queue = queue.Queue()
+        self._read_db: Optional[sqlite3.Connection] = None
+        self._read_lock = threading.Lock()
+
+        self._thread = threading.Thread(target=self._run, name=f"{self.NAME.replace(' ', '-')}-writer", daemon=True)
+        self._thread.start()
+
+    def _connect(self, writer: bool = False) -> sqlite3.Connection:
+        db = sqlite3.connect(self.db_file, timeout=10, check_same_thread=False)
+        db.row_factory = sqlite3.Row
+        if writer:
+            # auto_vacuum takes effect only if set before WAL is enabled and the first table is
+            # created. Databases created without it need to be rebuilt (once) to change it.
+            db.execute('PRAGMA auto_vacuum=INCREMENTAL')
+            if db.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+                db.execute('VACUUM')
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        return db
+
+    def _put(self, item: Any) -> None:
+        """
+        Queues item for the writer thread. Returns immediately.
+        """
+        self._queue.put(item)
+
+    def close(self) -> None:
+        """
+        Writes pending changes and stops the writer thread.
+        """
+        self._queue.put(self._STOP)
+        self._thread.join(timeout=10)
+        with self._read_lock:
+            if self._read_db is not None:
+                self._read_db.close()
+                self._read_db = None
+
+    # -----------------------------------------------------------------------------------------
+
+    def _run(self) -> None:
+        try:
+            db = self._connect(writer=True)
+            db.executescript(self.SCHEMA)
+        except sqlite3.Error as ex:
+            log.warning('Unable to open %s %s: %s', self.NAME, self.db_file, ex)
+            return
+
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            batch = []
+            deadline = time.monotonic() + self.BATCH_DELAY
+            while item is not self._STOP:
+                batch.append(item)
+                if len(batch) >= self.MAX_BATCH:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            stopping = item is self._STOP
+
+            try:
+                self._write(db, batch)
+            except sqlite3.Error as ex:
+                log.warning('Unable to update %s: %s', self.NAME, ex)
+        db.close()
+
+    def _write(self, db: sqlite3.Connection, batch: List) -> None:
+        """
+        Writes queued items. Called on the writer thread, also with empty batch when stopping.
+        """
+        raise NotImplementedError
+
+    # -----------------------------------------------------------------------------------------
+
+    def _read(self, sql: str, params: Any = ()) -> List[Dict]:
+        """
+        Runs given query on the reading connection. Errors are logged and result in no rows.
+        """
+        with self._read_lock:
+            try:
+                if self._read_db is None:
+                    if not os.path.exists(self.db_file):
+                        return []
+                    self._read_db = self._connect()
+                rows = self._read_db.execute(sql, params).fetchall()
+            except sqlite3.Error as ex:
+                log.warning('Unable to query %s: %s', self.NAME, ex)
+                return []
+        return [dict(row) for row in rows]
@@ -0,0 +1,252 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/tabs.py
+#
+##################################################################################
+"""
+
+import time
+from typing import Callable, List, Optional
+
+from PySide6.QtCore import QTimer, QUrl, Signal
+from PySide6.QtWebEngineCore import QWebEnginePage
+from PySide6.QtWebEngineWidgets import QWebEngineView
+from PySide6.QtWidgets import QTabWidget, QVBoxLayout, QWidget
+
+# Maximum length of the tab title
+TAB_TITLE_MAX_LEN = 24
+
+
+class AppTab:
+    """Single tab. The view is not created until the tab is activated for the first time."""
+
+    def __init__(self, container: QWidget, url: QUrl, view: Optional[QWebEngineView] = None):
+        self.container = container
+        self.url = url
+        self.view = view
+        self.last_used = time.monotonic()
+
+    def is_live(self) -> bool:
+        """
+        Returns True if tab holds a page that is not discarded (so has a renderer).
+        """
+        if self.view is None:
+            return False
+        return self.view.page().lifecycleState() != QWebEnginePage.LifecycleState.Discarded
+
+
+class TabbedBrowser(QTabWidget):
+    """
+    Tabs sharing app's profile. Background tabs are restored lazily (no page is created until
+    tab is activated), tabs not used for a while are discarded (their renderer is released and
+    the page gets reloaded on next activation) and number of live renderers is capped.
+    """
+
+    # Max number of tabs holding live renderer at the same time.
+    DEFAULT_MAX_LIVE = 3
+    # Tabs not activated for that many minutes are discarded.
+    DEFAULT_DISCARD_AFTER = 30
+
+    current_view_changed = Signal(object)
+
+    def __init__(self, view_factory: Callable[[], QWebEngineView], main_view: QWebEngineView,
+                 main_title: str, max_live: int = DEFAULT_MAX_LIVE,
+                 discard_after: int = DEFAULT_DISCARD_AFTER, parent=None):
+        """
+        Initialize tabs.
+
+        Args:
+            view_factory: Callable returning new, configured view (with its own page)
+            main_view: View of the main app page, shown in the first tab (which cannot be closed)
+            main_title: Title of the main tab
+            max_live: Max number of tabs with live renderers
+            discard_after: Number of minutes after which unused tabs get discarded (0 disables)
+            parent: Parent widget
+        """
+        super().__init__(parent)
+        self.view_factory = view_factory
+        self.max_live = max(1, max_live)
+        self.discard_after = discard_after
+        self._tabs: List[AppTab] = []
+        self._active_tab: Optional[AppTab] = None
+
+        self.setDocumentMode(True)
+        self.setTabsClosable(True)
+        self.setMovable(True)
+        self.setTabBarAutoHide(True)
+        self.tabCloseRequested.connect(self.close_tab)
+        self.currentChanged.connect(self.on_current_changed)
+        self.tabBar().tabMoved.connect(self.on_tab_moved)
+
+        container = self._create_container()
+        container.layout().addWidget(main_view)
+        self._tabs.append(AppTab(container, main_view.url(), main_view))
+        self.addTab(container, self._elide(main_title))
+        # Main tab cannot be closed.
+        self.tabBar().setTabButton(0, self.tabBar().ButtonPosition.RightSide, None)
+
+        self._discard_timer = QTimer(self)
+        self._discard_timer.setInterval(60 * 1000)
+        self._discard_timer.timeout.connect(self.discard_idle)
+        if self.discard_after > 0:
+            self._discard_timer.start()
+
+    @staticmethod
+    def _create_container() -> QWidget:
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        layout.setContentsMargins(0, 0, 0, 0)
+        return container
+
+    @staticmethod
+    def _elide(title: str) -> str:
+        return title[:TAB_TITLE_MAX_LEN] + '…' if len(title) > TAB_TITLE_MAX_LEN else title
+
+    def current_view(self) -> Optional[QWebEngineView]:
+        """
+        Returns view of the current tab.
+        """
+        index = self.currentIndex()
+        return self._tabs[index].view if 0 <= index < len(self._tabs) else None
+
+    def stats(self) -> dict:
+        """
+        Returns number of tabs and number of tabs holding live renderer.
+        """
+        return {'count': len(self._tabs), 'live': sum(1 for tab in self._tabs if tab.is_live()),
+                'max_live': self.max_live}
+
+    def render_pids(self) -> List[int]:
+        """
+        Returns PIDs of renderer processes of the tabs holding live renderer.
+        """
+        return [tab.view.page().renderProcessPid() for tab in self._tabs if tab.is_live()]
+
+    def open_tab(self, url: QUrl, background: bool = True) -> None:
+        """
+        Opens new tab. Background tabs get no page until activated.
+
+        Args:
+            url: The URL to open
+            background: If False, new tab is activated immediately
+        """
+        container = self._create_container()
+        tab = AppTab(container, url)
+        self._tabs.append(tab)
+        index = self.addTab(container, self._elide(url.host() or url.toString()))
+        if not background:
+            self.setCurrentIndex(index)
+
+    def open_page(self, background: bool = True) -> QWebEnginePage:
+        """
+        Opens new tab with its page created right away and returns the page, so the engine can
+        open a new window in it (i.e. for `window.open()`).
+
+        Args:
+            background: If False, new tab is activated immediately
+        """
+        container = self._create_container()
+        tab = AppTab(container, QUrl())
+        self._materialize(tab)
+        self._tabs.append(tab)
+        index = self.addTab(container, '')
+        if background:
+            self.enforce_live_limit()
+        else:
+            self.setCurrentIndex(index)
+        return tab.view.page()
+
+    def _materialize(self, tab: AppTab) -> None:
+        """
+        Creates view of the tab. Tab is closed when its page asks for it (i.e. `window.close()`).
+        """
+        tab.view = self.view_factory()
+        tab.view.titleChanged.connect(lambda title, c=tab.container: self.on_title_changed(c, title))
+        tab.view.page().windowCloseRequested.connect(lambda c=tab.container: self.close_tab(self.indexOf(c)))
+        tab.container.layout().addWidget(tab.view)
+
+    def close_tab(self, index: int) -> None:
+        """
+        Closes tab of given index (except the main one) and releases its page.
+        """
+        if index <= 0 or index >= len(self._tabs):
+            return
+        tab = self._tabs.pop(index)
+        if tab is self._active_tab:
+            self._active_tab = None
+        self.removeTab(index)
+        if tab.view is not None:
+            tab.view.page().deleteLater()
+        tab.container.deleteLater()
+
+    def close_current_tab(self) -> None:
+        self.close_tab(self.currentIndex())
+
+    def on_tab_moved(self, src: int, dst: int) -> None:
+        self._tabs.insert(dst, self._tabs.pop(src))
+
+    def on_current_changed(self, index: int) -> None:
+        """
+        Materializes (or revives) the page of activated tab.
+        """
+        if not 0 <= index < len(self._tabs):
+            return
+        now = time.monotonic()
+        if self._active_tab is not None:
+            self._active_tab.last_used = now
+        tab = self._tabs[index]
+        tab.last_used = now
+        self._active_tab = tab
+        if tab.view is None:
+            self._materialize(tab)
+            tab.view.setUrl(tab.url)
+        elif not tab.is_live():
+            tab.view.page().setLifecycleState(QWebEnginePage.LifecycleState.Active)
+        self.enforce_live_limit()
+        tab.view.setFocus()
+        self.current_view_changed.emit(tab.view)
+
+    def on_title_changed(self, container: QWidget, title: str) -> None:
+        index = self.indexOf(container)
+        if index >= 0 and title:
+            self.setTabText(index, self._elide(title))
+            self.setTabToolTip(index, title)
+
+    def discard(self, tab: AppTab) -> bool:
+        """
+        Discards tab's page, releasing its renderer. Visible pages cannot be discarded.
+        """
+        if not tab.is_live() or tab.view.page().isVisible():
+            return False
+        tab.url = tab.view.url()
+        tab.view.page().setLifecycleState(QWebEnginePage.LifecycleState.Discarded)
+        return True
+
+    def enforce_live_limit(self) -> None:
+        """
+        Discards least recently used tabs until number of live renderers is within the limit.
+        """
+        current = self.currentIndex()
+        live = [tab for idx, tab in enumerate(self._tabs) if idx != current and tab.is_live()]
+        excess = len(live) + 1 - self.max_live
+        for tab in sorted(live, key=lambda t: t.last_used)[:max(0, excess)]:
+            self.discard(tab)
+
+    def discard_idle(self) -> None:
+        """
+        Discards background tabs not used for longer than the configured time.
+        """
+        deadline = time.monotonic() - self.discard_after * 60
+        current = self.currentIndex()
+        for idx, tab in enumerate(self._tabs):
+            if idx != current and tab.last_used < deadline:
+                self.discard(tab)
@@ -0,0 +1,219 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/trace.py
+#
+##################################################################################
+"""
+
+# NOTE: this module is imported before anything else (including Qt), so its import time is the
+# closest we can get to the app start. Keep its imports limited to the standard library.
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+# Timestamp taken when the app started importing its modules.
+IMPORTS_STARTED_NS = time.monotonic_ns()
+
+
+class Trace:
+    """
+    Records Python-side phase spans and collects Chromium's startup trace, then merges both into
+    single Chrome trace-event JSON file (viewable with Perfetto or chrome://tracing).
+
+    Both Chromium and Python (on Linux) use monotonic clock for timestamps, so events of both
+    sides line up on the same timeline. Startup ends with the first page load (see stop()), and
+    Chromium events recorded after it are left out. When tracing is disabled, all calls are no-ops.
+    """
+
+    # Number of seconds Chromium records the startup trace for. Chromium cannot be told to stop
+    # earlier, so this is the fallback for pages that take long to load.
+    CHROMIUM_TRACE_DURATION = 15
+    # Chromium events recorded up to that long after the first page load are kept, so the
+    # painting that follows it is included.
+    STOP_MARGIN_MS = 500
+    # Extra time Chromium is given to write its trace after the recording ends.
+    CHROMIUM_WRITE_TIMEOUT = 5
+
+    trace_file: Optional[str] = None
+    chromium_trace_file: Optional[str] = None
+    started_ns = 0
+    stopped_ns: Optional[int] = None
+    _events: List[Dict] = []
+    _open_spans: Dict[str, int] = {}
+
+    @classmethod
+    def enabled(cls) -> bool:
+        return cls.trace_file is not None
+
+    @classmethod
+    def start(cls, trace_file: str) -> None:
+        """
+        Enables tracing. Must be called before QApplication is created.
+
+        Args:
+            trace_file: Path to the resulting trace file
+        """
+        cls.trace_file = os.path.abspath(trace_file)
+        cls.started_ns = time.monotonic_ns()
+        cls.stopped_ns = None
+        fd, cls.chromium_trace_file = tempfile.mkstemp(prefix='webapp-chromium-', suffix='.json')
+        os.close(fd)
+        os.remove(cls.chromium_trace_file)
+
+        flags = [
+            os.environ.get('QTWEBENGINE_CHROMIUM_FLAGS', ''),
+            '--trace-startup',
+            f'--trace-startup-file={cls.chromium_trace_file}',
+            f'--trace-startup-duration={cls.CHROMIUM_TRACE_DURATION}',
+        ]
+        os.environ['QTWEBENGINE_CHROMIUM_FLAGS'] = ' '.join(flag for flag in flags if flag)
+
+        cls.complete('imports', IMPORTS_STARTED_NS, time.monotonic_ns())
+        atexit.register(cls.finish)
+
+    @classmethod
+    def complete(cls, name: str, start_ns: int, end_ns: int) -> None:
+        """
+        Records complete span with given start and end timestamps.
+        """
+        if cls.trace_file is None:
+            return
+        cls._events.append({
+            'name': name,
+            'cat': 'webapp',
+            'ph': 'X',
+            'ts': start_ns // 1000,
+            'dur': max(0, end_ns - start_ns) // 1000,
+            'pid': os.getpid(),
+            'tid': threading.get_native_id(),
+        })
+
+    @classmethod
+    def begin(cls, name: str) -> None:
+        """
+        Starts named span that will be closed by end(). Used for spans crossing callbacks
+        (i.e. page load).
+        """
+        if cls.trace_file is not None:
+            cls._open_spans[name] = time.monotonic_ns()
+
+    @classmethod
+    def end(cls, name: str) -> None:
+        """
+        Ends span started with begin(). Unknown (or already ended) spans are ignored.
+        """
+        start_ns = cls._open_spans.pop(name, None)
+        if start_ns is not None:
+            cls.complete(name, start_ns, time.monotonic_ns())
+
+    @classmethod
+    @contextmanager
+    def span(cls, name: str) -> Iterator[None]:
+        """
+        Records the span covering the body of the `with` block.
+        """
+        if cls.trace_file is None:
+            yield
+            return
+        start_ns = time.monotonic_ns()
+        try:
+            yield
+        finally:
+            cls.complete(name, start_ns, time.monotonic_ns())
+
+    @classmethod
+    def stop(cls) -> None:
+        """
+        Marks the end of the startup (the first page load). Chromium events recorded later are
+        left out of the trace.
+        """
+        if cls.trace_file is not None and cls.stopped_ns is None:
+            cls.stopped_ns = time.monotonic_ns()
+
+    @classmethod
+    def _chromium_trace_written(cls) -> bool:
+        try:
+            with open(cls.chromium_trace_file, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return False
+                f.seek(max(0, f.tell() - 16))
+                return f.read().rstrip().endswith((b'}', b']'))
+        except (IOError, TypeError):
+            return False
+
+    @classmethod
+    def wait_for_chromium(cls, process_events: Callable[[], None]) -> None:
+        """
+        Waits until Chromium writes its trace, so quitting the app early does not lose it. Chromium
+        writes it from the GUI thread once its recording time passes, so events are processed
+        while waiting.
+
+        Args:
+            process_events: Function processing pending events (i.e. QApplication.processEvents)
+        """
+        if cls.trace_file is None:
+            return
+        deadline = cls.started_ns + (cls.CHROMIUM_TRACE_DURATION + cls.CHROMIUM_WRITE_TIMEOUT) * 1000000000
+        while not cls._chromium_trace_written() and time.monotonic_ns() < deadline:
+            process_events()
+            time.sleep(0.05)
+
+    @classmethod
+    def _load_chromium_events(cls) -> List[Dict]:
+        if not cls.chromium_trace_file or not os.path.exists(cls.chromium_trace_file):
+            return []
+        try:
+            with open(cls.chromium_trace_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return []
+        finally:
+            os.remove(cls.chromium_trace_file)
+        events = data.get('traceEvents', []) if isinstance(data, dict) else data
+        if not isinstance(events, list):
+            return []
+        if cls.stopped_ns is None:
+            return events
+        cutoff_us = cls.stopped_ns // 1000 + cls.STOP_MARGIN_MS * 1000
+        # Metadata events (process and thread names) carry no meaningful timestamp.
+        return [event for event in events
+                if isinstance(event, dict) and (event.get('ph') == 'M' or event.get('ts', 0) <= cutoff_us)]
+
+    @classmethod
+    def finish(cls) -> None:
+        """
+        Merges Python and Chromium events and writes the trace file.
+        """
+        if cls.trace_file is None:
+            return
+        # Spans never ended (i.e. page never finished loading) are closed at exit.
+        for name in list(cls._open_spans):
+            cls.end(name)
+
+        process_name = {
+            'name': 'process_name', 'ph': 'M', 'pid': os.getpid(), 'tid': 0,
+            'args': {'name': 'webapp (Python)'},
+        }
+        chromium_events = cls._load_chromium_events()
+        with open(cls.trace_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'traceEvents': [process_name] + cls._events + chromium_events,
+                'displayTimeUnit': 'ms',
+            }, f)
+        cls.trace_file = None
@@ -0,0 +1,306 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/userscripts.py
+#
+##################################################################################
+"""
+
+import json
+import logging
+import os
+import re
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from PySide6.QtWebEngineCore import QWebEnginePage, QWebEngineScript
+
+log = logging.getLogger(__name__)
+
+# Wraps user style into script adding it to the document as early as possible.
+STYLE_JS = """
+(function (css) {
+    var style = document.createElement('style');
+    style.setAttribute('data-webapp-userstyle', %(name)s);
+    style.textContent = css;
+    function add() {
+        (document.head || document.documentElement).appendChild(style);
+    }
+    if (document.documentElement) {
+        add();
+    } else {
+        new MutationObserver(function (mutations, observer) {
+            observer.disconnect();
+            add();
+        }).observe(document, {childList: true});
+    }
+})(%(css)s);
+"""
+
+
+class UserScript:
+    """Metadata of single user script (`*.user.js`) or user style (`*.user.css`) file."""
+
+    KIND_JS = 'js'
+    KIND_CSS = 'css'
+
+    RUN_AT = {
+        'document-start': QWebEngineScript.InjectionPoint.DocumentCreation,
+        'document-end': QWebEngineScript.InjectionPoint.DocumentReady,
+        'document-idle': QWebEngineScript.InjectionPoint.Deferred,
+    }
+
+    def __init__(self, file_name: str, kind: str, name: str, matches: List[str],
+                 run_at: str = 'document-idle', main_world: bool = False,
+                 mtime_ns: int = 0, size: int = 0):
+        self.file_name = file_name
+        self.kind = kind
+        self.name = name
+        self.matches = matches
+        self.run_at = run_at if run_at in self.RUN_AT else 'document-idle'
+        self.main_world = main_world
+        self.mtime_ns = mtime_ns
+        self.size = size
+
+    def to_dict(self) -> Dict:
+        return {
+            'file_name': self.file_name, 'kind': self.kind, 'name': self.name,
+            'matches': self.matches, 'run_at': self.run_at, 'main_world': self.main_world,
+            'mtime_ns': self.mtime_ns, 'size': self.size,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'UserScript':
+        return cls(**data)
+
+    @classmethod
+    def parse(cls, file_name: str, source: str, mtime_ns: int = 0, size: int = 0) -> 'UserScript':
+        """
+        Parses metadata block of user script (`// ==UserScript==` ... `// ==/UserScript==`)
+        or user style (`/* ==UserStyle==` ... `==/UserStyle== */`).
+
+        Supported keys: @name, @match (can be used multiple times), @run-at (document-start,
+        document-end, document-idle) and @inject-into (`page` runs the script in page's own
+        JavaScript world, `content` (default) in isolated one). User styles are always added
+        at document start.
+        """
+        kind = cls.KIND_CSS if file_name.endswith('.css') else cls.KIND_JS
+        name = file_name
+        matches: List[str] = []
+        run_at = 'document-start' if kind == cls.KIND_CSS else 'document-idle'
+        main_world = False
+
+        block = re.search(r'==User(?:Script|Style)==(.*?)==/User(?:Script|Style)==', source, re.DOTALL)
+        for key, value in re.findall(r'@([\w-]+)[ \t]+([^\r\n]+)', block.group(1) if block else ''):
+            value = value.strip()
+            if key == 'name':
+                name = value
+            elif key == 'match':
+                matches.append(value)
+            elif key == 'run-at' and kind == cls.KIND_JS:
+                run_at = value
+            elif key == 'inject-into' and kind == cls.KIND_JS:
+                main_world = value == 'page'
+
+        return cls(file_name, kind, name, matches, run_at, main_world, mtime_ns, size)
+
+
+class UserScriptManager:
+    """
+    Per-profile user scripts and user styles engine.
+
+    Files are kept in `userscripts/` directory of the profile. Parsed metadata of all files is
+    cached in the manifest file keyed by file's mtime and size, so on startup only new or
+    modified files are read and parsed. `@match` patterns are compiled into a host index
+    (exact hosts, host suffixes for `*.` patterns and catch-all), so finding scripts for given
+    URL costs a few dictionary lookups. Script sources are read when script is needed first.
+    """
+
+    DIR_NAME = 'userscripts'
+    MANIFEST_FILE_NAME = '.manifest.json'
+    MANIFEST_VERSION = 1
+    SCRIPT_NAME_PREFIX = 'userscript:'
+
+    def __init__(self, storage_path: str):
+        """
+        Initialize the manager and load scripts metadata.
+
+        Args:
+            storage_path: Profile storage directory
+        """
+        self.scripts_dir = os.path.join(storage_path, self.DIR_NAME)
+        self.manifest_file = os.path.join(self.scripts_dir, self.MANIFEST_FILE_NAME)
+        self.scripts: Dict[str, UserScript] = {}
+        self._sources: Dict[str, str] = {}
+        # (scheme, compiled path regex, file name) entries, keyed by host
+        self._exact: Dict[str, List[Tuple[str, re.Pattern, str]]] = {}
+        self._suffix: Dict[str, List[Tuple[str, re.Pattern, str]]] = {}
+        self._any: List[Tuple[str, re.Pattern, str]] = []
+        self.load()
+
+    def load(self) -> None:
+        """
+        (Re)loads scripts metadata, reparsing only files changed since the manifest was written.
+        """
+        cached: Dict[str, UserScript] = {}
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == self.MANIFEST_VERSION:
+                cached = {entry['file_name']: UserScript.from_dict(entry) for entry in manifest['scripts']}
+        except (IOError, ValueError, KeyError, TypeError):
+            cached = {}
+
+        scripts: Dict[str, UserScript] = {}
+        dirty = False
+        try:
+            entries = list(os.scandir(self.scripts_dir))
+        except (FileNotFoundError, NotADirectoryError):
+            entries = []
+        for entry in entries:
+            if not entry.is_file() or not entry.name.endswith(('.user.js', '.user.css')):
+                continue
+            stat = entry.stat()
+            script = cached.get(entry.name)
+            if script is None or script.mtime_ns != stat.st_mtime_ns or script.size != stat.st_size:
+                source = self._read(entry.path)
+                if source is None:
+                    continue
+                script = UserScript.parse(entry.name, source, stat.st_mtime_ns, stat.st_size)
+                self._sources[entry.name] = source
+                dirty = True
+                log.debug('Parsed user script: %s', entry.name)
+            scripts[entry.name] = script
+
+        if dirty or set(scripts) != set(cached):
+            self._save_manifest(scripts)
+        self.scripts = scripts
+        self._build_index()
+        log.debug('User scripts: %d loaded from %s', len(scripts), self.scripts_dir)
+
+    @staticmethod
+    def _read(path: str) -> Optional[str]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except (IOError, UnicodeDecodeError) as ex:
+            log.warning('Unable to read user script %s: %s', path, ex)
+            return None
+
+    def _save_manifest(self, scripts: Dict[str, UserScript]) -> None:
+        if not os.path.isdir(self.scripts_dir):
+            return
+        tmp_file = f'{self.manifest_file}.tmp'
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.MANIFEST_VERSION,
+                           'scripts': [script.to_dict() for script in scripts.values()]}, f)
+            os.replace(tmp_file, self.manifest_file)
+        except IOError as ex:
+            log.warning('Unable to write user scripts manifest: %s', ex)
+
+    @staticmethod
+    def _compile_path(path_glob: str) -> re.Pattern:
+        return re.compile('^' + '.*'.join(re.escape(part) for part in path_glob.split('*')) + '$')
+
+    def _build_index(self) -> None:
+        self._exact, self._suffix, self._any = {}, {}, []
+        for script in self.scripts.values():
+            for pattern in script.matches:
+                if pattern == '<all_urls>':
+                    self._any.append(('*', self._compile_path('/*'), script.file_name))
+                    continue
+                match = re.match(r'^(\*|https?|file)://([^/]*)(/.*)$', pattern)
+                if not match:
+                    log.warning('Invalid @match pattern in %s: %s', script.file_name, pattern)
+                    continue
+                scheme, host, path = match.groups()
+                entry = (scheme, self._compile_path(path), script.file_name)
+                host = host.lower()
+                if host == '*':
+                    self._any.append(entry)
+                elif host.startswith('*.'):
+                    self._suffix.setdefault(host[2:], []).append(entry)
+                else:
+                    self._exact.setdefault(host, []).append(entry)
+
+    def match(self, url: str) -> Set[str]:
+        """
+        Returns file names of scripts matching given URL.
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or '').lower()
+        path = parts.path or '/'
+        if parts.query:
+            path += f'?{parts.query}'
+
+        candidates = list(self._any)
+        candidates.extend(self._exact.get(host, ()))
+        labels = host.split('.')
+        for idx in range(len(labels)):
+            candidates.extend(self._suffix.get('.'.join(labels[idx:]), ()))
+
+        matched: Set[str] = set()
+        for entry_scheme, path_regex, file_name in candidates:
+            if file_name in matched:
+                continue
+            if entry_scheme == '*' and scheme not in ('http', 'https'):
+                continue
+            if entry_scheme != '*' and entry_scheme != scheme:
+                continue
+            if path_regex.match(path):
+                matched.add(file_name)
+        return matched
+
+    def _create_script(self, script: UserScript) -> Optional[QWebEngineScript]:
+        source = self._sources.get(script.file_name)
+        if source is None:
+            source = self._read(os.path.join(self.scripts_dir, script.file_name))
+            if source is None:
+                return None
+            self._sources[script.file_name] = source
+
+        web_script = QWebEngineScript()
+        web_script.setName(f'{self.SCRIPT_NAME_PREFIX}{script.file_name}')
+        if script.kind == UserScript.KIND_CSS:
+            web_script.setSourceCode(STYLE_JS % {'name': json.dumps(script.name), 'css': json.dumps(source)})
+            web_script.setWorldId(QWebEngineScript.ScriptWorldId.ApplicationWorld)
+        else:
+            web_script.setSourceCode(source)
+            web_script.setWorldId(QWebEngineScript.ScriptWorldId.MainWorld if script.main_world
+                                  else QWebEngineScript.ScriptWorldId.ApplicationWorld)
+        web_script.setInjectionPoint(UserScript.RUN_AT[script.run_at])
+        web_script.setRunsOnSubFrames(False)
+        return web_script
+
+    def apply(self, page: QWebEnginePage, url: str) -> None:
+        """
+        Makes page's script collection hold exactly the user scripts matching given URL. Called
+        before main frame navigation is committed, so scripts are in place for the new document.
+        """
+        if not self.scripts:
+            return
+        wanted = self.match(url)
+        collection = page.scripts()
+        installed = {}
+        for web_script in collection.toList():
+            if web_script.name().startswith(self.SCRIPT_NAME_PREFIX):
+                installed[web_script.name()[len(self.SCRIPT_NAME_PREFIX):]] = web_script
+
+        for file_name, web_script in installed.items():
+            if file_name not in wanted:
+                collection.remove(web_script)
+        for file_name in wanted - set(installed):
+            web_script = self._create_script(self.scripts[file_name])
+            if web_script is not None:
+                collection.insert(web_script)
+                log.debug('User script %s injected for %s', file_name, url)
@@ -17,16 +17,36 @@ import argparse
 import importlib.resources as pkg_resources
 import os
 import re
-from typing import Optional
-
-from PySide6.QtGui import QIcon
+import stat
+import tempfile
+from datetime import datetime, time
+from typing import TYPE_CHECKING, Optional, Tuple
 
 from websiteapp.const import Const
 
+if TYPE_CHECKING:
+    from PySide6.QtGui import QIcon
+
+# NOTE: Qt is imported by the methods that need it, so maintenance commands (see Commands) that
+# only deal with files (i.e. `webapp list`) can use Utils without loading Qt.
+
+# Compiled once, as it is used each time the context menu is opened.
+URL_PATTERN = re.compile(
+    r'^(https?|ftp)://'  # http:// or https:// or ftp://
+    r'(?:'
+    r'(?:\w+(?:-\w+)*\.)+[a-zA-Z]{2,}'  # domain name
+    r'|localhost'  # localhost
+    r'|\d{1,3}(?:\.\d{1,3}){3}'  # IPv4 address
+    r'|\[[0-9a-fA-F:.]+\]'  # IPv6 address
+    r')'
+    r'(?::\d{1,5})?'  # optional port
+    r'(?:[/?#]\S*)?$'  # optional path, query or fragment
+)
+
 
 class Utils(object):
     @staticmethod
-    def get_icon(icon: Optional[str] = None) -> QIcon:
+    def get_icon(icon: Optional[str] = None) -> 'QIcon':
         """
         Attempts to construct QIcon object from given icon file path. If icon file is not given
         or does not exist, default icon is used (so it always return valid QIcon object).
@@ -43,8 +63,169 @@ class Utils(object):
             with pkg_resources.path('websiteapp.icons', 'default.png') as icon_path:
                 icon_file = str(icon_path)
 
+        from PySide6.QtGui import QIcon
         return QIcon(icon_file)
 
+    @staticmethod
+    def get_runtime_dir() -> str:
+        """
+        Returns (creating if needed) private directory for runtime files like sockets. Uses
+        $XDG_RUNTIME_DIR if set, per-user directory in system temp directory otherwise. As the
+        latter is shared with other users, existing directory is only used if it is a real
+        directory owned by the current user and not accessible to anyone else.
+
+        :return: Path to the runtime directory
+        :raises PermissionError: If the directory exists, but cannot be trusted.
+        """
+        if os.environ.get('XDG_RUNTIME_DIR'):
+            runtime_dir = os.path.join(os.environ['XDG_RUNTIME_DIR'], Const.APP_PROJECT_NAME)
+        else:
+            user_id = os.getuid() if hasattr(os, 'getuid') else os.getlogin()
+            runtime_dir = os.path.join(tempfile.gettempdir(), f'{Const.APP_PROJECT_NAME}-{user_id}')
+        os.makedirs(runtime_dir, mode=0o700, exist_ok=True)
+        if hasattr(os, 'getuid'):
+            st = os.lstat(runtime_dir)
+            if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or stat.S_IMODE(st.st_mode) != 0o700:
+                raise PermissionError(f'Runtime directory {runtime_dir} is not a private directory of the current user')
+        return runtime_dir
+
+    @staticmethod
+    def get_data_dir() -> str:
+        """
+        Returns app's data directory (the one QWebEngineProfile keeps profiles in). Works
+        without QApplication instance, so can be used by command line tools.
+
+        :return: Path to app's data directory
+        """
+        from PySide6.QtCore import QCoreApplication, QStandardPaths
+        QCoreApplication.setOrganizationName(Const.APP_ORGANIZATION)
+        QCoreApplication.setApplicationName(Const.APP_NAME)
+        return QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+
+    @staticmethod
+    def get_profile_storage_path(profile: str) -> str:
+        """
+        Returns storage directory of given profile, the same QWebEngineProfile uses.
+
+        :param profile: Profile name
+        :return: Path to profile's storage directory
+        """
+        return os.path.join(Utils.get_data_dir(), 'QtWebEngine', profile)
+
+    @staticmethod
+    def get_template_path(name: str) -> str:
+        """
+        Returns directory of given profile template (see `webapp profile template`).
+
+        :param name: Template name
+        :return: Path to template's directory
+        """
+        return os.path.join(Utils.get_data_dir(), 'templates', name)
+
+    @staticmethod
+    def sanitize_profile_name(profile_name: str) -> str:
+        """
+        Sanitizes the profile name to ensure it can be used as a valid file path.
+
+        :param profile_name: The profile name to sanitize.
+        :return: A sanitized version of the profile name suitable for file paths.
+        """
+        # Replace invalid characters with underscores
+        sanitized = re.sub(r'[\\/:*?"<>|]', '_', profile_name)
+
+        # Trim leading/trailing whitespace and ensure it's not empty
+        sanitized = sanitized.strip()
+
+        # Fallback to a default name if the sanitized profile is empty
+        if not sanitized:
+            sanitized = "default_profile"
+
+        return sanitized
+
+    @staticmethod
+    def get_lock_file(profile: str) -> str:
+        """
+        Returns path of the lock file held by the app instance running given profile (unless
+        started with --allow-multiple).
+
+        :param profile: Profile name
+        :return: Path to the lock file
+        """
+        return os.path.join(os.path.expanduser("~"), f".websiteapp_{Utils.sanitize_profile_name(profile)}.lock")
+
+    @staticmethod
+    def get_activation_signal_file(profile: str) -> str:
+        """
+        Returns path of the file whose creation makes the app instance running given profile
+        bring its window to front.
+
+        :param profile: Profile name
+        :return: Path to the signal file
+        """
+        return os.path.join(os.path.expanduser("~"), f".websiteapp_{profile}_signal")
+
+    @staticmethod
+    def get_rss_kb(pid: Optional[int] = None) -> Optional[int]:
+        """
+        Returns resident set size (in KiB) of given process (current one by default). Reads
+        /proc, so works on Linux only. Returns None if the value cannot be obtained, also for
+        PID 0 (which Qt reports for processes not running yet).
+
+        :param pid: Process ID
+        :return: RSS in KiB or None
+        """
+        if pid is not None and pid <= 0:
+            return None
+        status_file = f'/proc/{pid if pid is not None else "self"}/status'
+        try:
+            with open(status_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        return int(line.split()[1])
+        except (IOError, ValueError, IndexError):
+            pass
+        return None
+
+    @staticmethod
+    def is_on_ac_power() -> bool:
+        """
+        Checks if the machine runs on external power. Reads /sys, so the check works on Linux
+        only. Machines without battery and other platforms are assumed to be on AC power.
+
+        :return: False if running on battery, True otherwise
+        """
+        supply_dir = '/sys/class/power_supply'
+        try:
+            supplies = os.listdir(supply_dir)
+        except OSError:
+            return True
+
+        has_battery = False
+        for supply in supplies:
+            try:
+                with open(os.path.join(supply_dir, supply, 'type'), 'r', encoding='utf-8') as f:
+                    supply_type = f.read().strip()
+                if supply_type == 'Mains':
+                    with open(os.path.join(supply_dir, supply, 'online'), 'r', encoding='utf-8') as f:
+                        if f.read().strip() == '1':
+                            return True
+                elif supply_type == 'Battery':
+                    has_battery = True
+            except OSError:
+                continue
+        return not has_battery
+
+    @staticmethod
+    def is_valid_url(url: str) -> bool:
+        """
+        Validates if the given string is a valid http(s) or ftp URL (including localhost and
+        IP address based ones).
+
+        :param url: String to validate
+        :return: True if string is valid URL, False otherwise
+        """
+        return bool(URL_PATTERN.match(url))
+
     @staticmethod
     def parse_geometry(geometry_string: str) -> (int, int, int, int):
         """
@@ -74,6 +255,23 @@ class Utils(object):
 
         return x, y, width, height
 
+    @staticmethod
+    def parse_quiet_hours(spec: str) -> Tuple[time, time]:
+        """
+        Parses daily time range (possibly spanning midnight) given as HH:MM-HH:MM. Used as
+        argparse type of --quiet-hours.
+
+        :param spec: Time range, i.e. "22:00-07:00"
+        :return: A tuple containing start and end time of the range.
+        :raises argparse.ArgumentTypeError: If the spec format is incorrect.
+        """
+        try:
+            start, end = spec.split('-')
+            return (datetime.strptime(start.strip(), '%H:%M').time(),
+                    datetime.strptime(end.strip(), '%H:%M').time())
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Invalid quiet hours '{spec}'. Expected format: HH:MM-HH:MM") from None
+
     @staticmethod
     def handle_args():
         """
@@ -115,6 +313,50 @@ class Utils(object):
                             help='Uses built-in QWebEngineView instead of the custom one we use.')
         parser.add_argument('--search-top', action='store_true',
                             help='Puts search bar on top of window when activated')
+        parser.add_argument('--internal-host', type=str, action='append', default=[], metavar='HOST',
+                            help='Additional host (with subdomains) whose links open within the app. Can be used multiple times')
+        parser.add_argument('--no-link-routing', action='store_true',
+                            help='Opens all the links within the app instead of routing external ones to the default browser')
+        parser.add_argument('--popup-pool', type=int, default=2, metavar='SIZE',
+                            help='Number of reusable popup windows (i.e. for logins) to keep ready. 0 disables pooling. '
+                                 'Default: %(default)s')
+        parser.add_argument('--tabs', action='store_true',
+                            help='Enables tabs. Links meant to open in new window open in new tab instead')
+        parser.add_argument('--max-live-tabs', type=int, default=3, metavar='COUNT',
+                            help='Max number of tabs kept loaded at the same time. Default: %(default)s')
+        parser.add_argument('--tab-discard-after', type=int, default=30, metavar='MINUTES',
+                            help='Unloads background tabs not used for that many minutes (0 disables). Default: %(default)s')
+        parser.add_argument('--lite', action='store_true',
+                            help='Enables "lite" mode (no images, autoplay, WebGL or smooth scrolling) for low bandwidth '
+                                 'or low power use')
+        parser.add_argument('--history-days', type=int, default=90, metavar='DAYS',
+                            help='Removes pages not visited for that many days from history. Default: %(default)s')
+        parser.add_argument('--no-history', action='store_true',
+                            help='Disables recording of visited pages')
+        parser.add_argument('--page-index', action='store_true',
+                            help='Indexes text of visited pages, so they can be searched (CTRL+SHIFT+F)')
+        parser.add_argument('--page-index-size', type=int, default=100, metavar='MB',
+                            help='Max size (in MB) of indexed text (oldest pages are dropped first). Default: %(default)s')
+        parser.add_argument('--cache-warm', type=int, default=0, metavar='COUNT',
+                            help='Preloads that many top bookmarked (or most visited) pages into cache while app is not in use. '
+                                 'Default: %(default)s (disabled)')
+        parser.add_argument('--cache-warm-budget', type=int, default=20, metavar='MB',
+                            help='Max megabytes transferred per cache warming run. Default: %(default)s')
+        parser.add_argument('--cache-warm-interval', type=int, default=60, metavar='MINUTES',
+                            help='Min time between cache warming runs. Default: %(default)s')
+        parser.add_argument('--netstats', action='store_true',
+                            help='Enables per-origin network request accounting (see `webapp netstats`)')
+        parser.add_argument('--slow-request-ms', type=int, default=2000, metavar='MS',
+                            help='With --netstats, logs requests taking that many milliseconds or more. Default: %(default)s')
+        parser.add_argument('--cookie-policy', action='store_true',
+                            help='Enables cookie policy (third-party cookie blocking and optional per-domain budgets, '
+                                 'see cookies.json)')
+        parser.add_argument('--notifications', action='store_true',
+                            help='Allows the site to show desktop notifications (delivered via tray icon)')
+        parser.add_argument('--notification-rate', type=int, default=6, metavar='COUNT',
+                            help='Max number of notifications shown per minute, the others are coalesced. Default: %(default)s')
+        parser.add_argument('--quiet-hours', type=Utils.parse_quiet_hours, default=None, metavar='HH:MM-HH:MM',
+                            help='Holds notifications during given hours and shows a summary afterwards')
         parser.add_argument('--user-agent', '-u', type=str, default=Const.APP_USER_AGENT,
                             help='User-Agent string to use (default: "%(default)s")')
 
@@ -123,5 +365,17 @@ class Utils(object):
 
         parser.add_argument('--debug', '-d', action='store_true',
                             help='Makes app print more debug messages during execution')
+        parser.add_argument('--resource-profile', type=str, default='balanced',
+                            choices=['low-memory', 'balanced', 'performance'],
+                            help='Engine resource preset, trading memory use for responsiveness. Default: %(default)s')
+        parser.add_argument('--perf-overlay', action='store_true',
+                            help='Shows overlay with page\'s long tasks, long frames, input delay and frame rate stats')
+        parser.add_argument('--control', action='store_true',
+                            help='Enables local control API (JSON-RPC over per-profile Unix socket)')
+        parser.add_argument('--trace', type=str, default=None, metavar='FILE',
+                            help='Records startup trace (Python and Chromium side) to given file, viewable with Perfetto')
+        parser.add_argument('--log-level', type=str, default='info', choices=['debug', 'info', 'warning', 'error'],
+                            help='Level of messages written to profile\'s log file (forced to "debug" by --debug). '
+                                 'Default: %(default)s')
 
         return parser.parse_args()
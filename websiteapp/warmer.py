@@ -0,0 +1,194 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/warmer.py
+#
+##################################################################################
+"""
+
+import logging
+import time
+from typing import List, Optional
+
+from PySide6.QtCore import QObject, QTimer, QUrl
+from PySide6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile, QWebEngineSettings
+from PySide6.QtWidgets import QWidget
+
+from websiteapp.bookmarks import BookmarkManager
+from websiteapp.history import HistoryStore
+from websiteapp.utils import Utils
+
+log = logging.getLogger(__name__)
+
+# Returns number of bytes transferred over the network for the document and its subresources
+# (cache hits report 0).
+TRANSFER_SIZE_JS = """
+(function () {
+    var total = 0;
+    performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'))
+        .forEach(function (entry) { total += entry.transferSize || 0; });
+    return total;
+})();
+"""
+
+
+class CacheWarmer(QObject):
+    """
+    Loads top bookmarked (and most visited) pages into the profile's HTTP cache, so opening them
+    later is mostly served from the cache.
+
+    Pages are loaded one at a time by an off-screen page (with audio muted and images not loaded)
+    only while the app window is not in use and the machine is on AC power. Each run stops once
+    the byte budget is used up, and runs are repeated not more often than the refresh interval.
+    """
+
+    # How often (in milliseconds) the conditions to start a run are checked.
+    CHECK_INTERVAL_MS = 60 * 1000
+    # Single page load that takes longer is abandoned.
+    LOAD_TIMEOUT_MS = 30 * 1000
+
+    def __init__(self, profile: QWebEngineProfile, window: QWidget, bookmark_manager: BookmarkManager,
+                 history: Optional[HistoryStore] = None, top_n: int = 10, byte_budget_mb: int = 20,
+                 interval_minutes: int = 60, parent=None):
+        """
+        Initialize the cache warmer.
+
+        Args:
+            profile: Profile whose cache is warmed
+            window: App window. Warming is done only when it is not active.
+            bookmark_manager: Source of URLs to warm
+            history: Optional source of most visited URLs (used when there are not enough bookmarks)
+            top_n: Max number of URLs loaded per run
+            byte_budget_mb: Max number of megabytes transferred per run
+            interval_minutes: Min time between the runs
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self.profile = profile
+        self.window = window
+        self.bookmark_manager = bookmark_manager
+        self.history = history
+        self.top_n = top_n
+        self.byte_budget = byte_budget_mb * 1024 * 1024
+        self.interval = interval_minutes * 60
+
+        self._page: Optional[QWebEnginePage] = None
+        # URL being loaded. None once its load is handled (finished or timed out).
+        self._loading: Optional[str] = None
+        self._queue: List[str] = []
+        self._bytes = 0
+        self._last_run = 0.0
+
+        self._check_timer = QTimer(self)
+        self._check_timer.setInterval(self.CHECK_INTERVAL_MS)
+        self._check_timer.timeout.connect(self.maybe_run)
+        self._load_timer = QTimer(self)
+        self._load_timer.setSingleShot(True)
+        self._load_timer.setInterval(self.LOAD_TIMEOUT_MS)
+        self._load_timer.timeout.connect(self.on_load_timeout)
+
+    def start(self) -> None:
+        self._check_timer.start()
+
+    def stop(self) -> None:
+        self._check_timer.stop()
+        self.finish_run()
+
+    def is_running(self) -> bool:
+        return self._page is not None
+
+    def can_run(self) -> bool:
+        """
+        Checks if the window is not in use and the machine is on AC power.
+        """
+        return not self.window.isActiveWindow() and Utils.is_on_ac_power()
+
+    def collect_urls(self) -> List[str]:
+        """
+        Returns URLs to warm: bookmarks first, then most visited pages.
+        """
+        urls: List[str] = []
+        candidates = [bookmark['url'] for bookmark in self.bookmark_manager.get_all()]
+        if self.history:
+            candidates.extend(entry['url'] for entry in self.history.most_visited(self.top_n))
+        for url in candidates:
+            if url.startswith(('http://', 'https://')) and url not in urls:
+                urls.append(url)
+                if len(urls) >= self.top_n:
+                    break
+        return urls
+
+    def maybe_run(self) -> None:
+        if self.is_running() or time.time() - self._last_run < self.interval or not self.can_run():
+            return
+        self._queue = self.collect_urls()
+        if not self._queue:
+            return
+        self._last_run = time.time()
+        self._bytes = 0
+        log.debug('Cache warmer: run started (%d URLs)', len(self._queue))
+
+        self._page = QWebEnginePage(self.profile, self)
+        self._page.setAudioMuted(True)
+        settings = self._page.settings()
+        settings.setAttribute(QWebEngineSettings.WebAttribute.AutoLoadImages, False)
+        settings.setAttribute(QWebEngineSettings.WebAttribute.PlaybackRequiresUserGesture, True)
+        self._page.loadFinished.connect(self.on_load_finished)
+        self.load_next()
+
+    def load_next(self) -> None:
+        if self._page is None:
+            return
+        if not self._queue or self._bytes >= self.byte_budget or not self.can_run():
+            self.finish_run()
+            return
+        self._loading = self._queue.pop(0)
+        self._load_timer.start()
+        self._page.load(QUrl(self._loading))
+
+    def on_load_timeout(self) -> None:
+        if self._page is None or self._loading is None:
+            return
+        log.debug('Cache warmer: loading %s timed out', self._loading)
+        self._loading = None
+        # Stopping emits loadFinished, which is ignored now the load is handled. Next load is
+        # started once that is processed.
+        self._page.stop()
+        QTimer.singleShot(0, self.load_next)
+
+    def on_load_finished(self, ok: bool) -> None:
+        if self._page is None or self._loading is None:
+            # Load that timed out.
+            return
+        self._load_timer.stop()
+        url, self._loading = self._loading, None
+        if not ok:
+            log.debug('Cache warmer: failed to load %s', url)
+            QTimer.singleShot(0, self.load_next)
+            return
+        self._page.runJavaScript(TRANSFER_SIZE_JS, 0, lambda size, u=url: self.on_transfer_size(u, size))
+
+    def on_transfer_size(self, url: str, size) -> None:
+        size = int(size) if isinstance(size, (int, float)) else 0
+        self._bytes += size
+        log.debug('Cache warmer: %s loaded (%d bytes transferred)', url, size)
+        self.load_next()
+
+    def finish_run(self) -> None:
+        self._load_timer.stop()
+        if self._page is None:
+            return
+        log.debug('Cache warmer: run finished (%d bytes transferred)', self._bytes)
+        self._queue = []
+        self._loading = None
+        # Page holds the renderer process, so it is released as soon as the run is done.
+        self._page.deleteLater()
+        self._page = None
@@ -13,15 +13,23 @@
 #
 ##################################################################################
 """
+# Must be imported first, to include all the other imports in the startup trace.
+from websiteapp.trace import Trace  # noqa: I001
+
+import argparse
+import atexit
+import logging
 import os
-import re
+import signal
+import socket
 import sys
-from typing import Optional
+import time
+from typing import List, Optional
 
 import fasteners
 from PyQt5.QtWebEngineWidgets import QWebEngineView
-from PySide6.QtCore import QUrl, QFileSystemWatcher, Qt
-from PySide6.QtGui import QAction
+from PySide6.QtCore import QObject, QUrl, QFileSystemWatcher, QSocketNotifier, Qt, QTimer
+from PySide6.QtGui import QAction, QDesktopServices, QKeySequence
 from PySide6.QtWebEngineCore import QWebEnginePage
 from PySide6.QtWebEngineCore import (
     QWebEngineProfile,
@@ -40,38 +48,67 @@ from PySide6.QtWidgets import (
 from websiteapp.about import About
 from websiteapp.bookmarks import BookmarkManager
 from websiteapp.const import Const
+from websiteapp.content_settings import ContentSettings
+from websiteapp.control import ControlServer
+from websiteapp.cookies import CookiePolicy
+from websiteapp.history import HistoryStore
+from websiteapp.instances import InstanceRegistry
+from websiteapp.log import Log
+from websiteapp.navigation import NavigationRouter
+from websiteapp.netstats import NetworkStats
+from websiteapp.notifications import NotificationCenter, QuietHours
+from websiteapp.page import CustomWebEnginePage
+from websiteapp.page_index import PageIndex
+from websiteapp.page_search import PageSearchDialog
+from websiteapp.popups import PopupPool
+from websiteapp.resources import ResourceProfile
+from websiteapp.scheduler import IdleScheduler
+from websiteapp.tabs import TabbedBrowser
 from websiteapp.toolbar import SearchToolBar, SearchBarPosition
+from websiteapp.userscripts import UserScriptManager
 from websiteapp.utils import Utils
+from websiteapp.warmer import CacheWarmer
 from websiteapp.webengine import CustomWebEngineView
+from websiteapp.zoom import ZoomStore
+
+log = logging.getLogger(__name__)
 
 
 class WebApp(QMainWindow):
+    # Instance status is published at least that often (in milliseconds).
+    STATUS_INTERVAL_MS = 30 * 1000
+
     about_dialog: Optional[About] = None
     lock: Optional[fasteners.InterProcessLock] = None
     file_watcher: Optional[QFileSystemWatcher] = None
+    control_server: Optional[ControlServer] = None
 
-    def __init__(self):
+    def __init__(self, args: Optional[argparse.Namespace] = None):
+        """
+        Args:
+            args: Parsed command line arguments (see Utils.handle_args()). Parsed here if not given.
+        """
         super().__init__()
-
-        # Check for --version before full argument parsing
-        if '--version' in sys.argv:
-            print(f'{Const.APP_NAME} {Const.APP_VERSION}')
-            sys.exit(0)
+        self.started = time.time()
 
         self.app = QApplication.instance()
-        self.args = Utils.handle_args()
+        self.args = args if args is not None else Utils.handle_args()
+        Log.setup(debug=self.args.debug, level=self.args.log_level)
+        Log.install_qt_handler()
 
         if not self.args.allow_multiple:
             if not self.acquire_lock():
                 sys.exit(0)  # Exit silently as we've activated the existing instance
 
         self.setup_activation_listener()
+        self.setup_signal_handlers()
 
         # Set window geometry
         x, y, width, height = Utils.parse_geometry(self.args.geometry)
         self.setGeometry(x, y, width, height)
-        self.dbug(f'Geometry: {width}x{height}+{x}+{y}')
+        log.debug('Geometry: %dx%d+%d+%d', width, height, x, y)
 
+        self.tray_icon: Optional[QSystemTrayIcon] = None
         app_icon = Utils.get_icon(self.args.icon)
         self.setWindowIcon(app_icon)
         if not self.args.no_tray:
@@ -82,15 +119,27 @@ class WebApp(QMainWindow):
         self.setWindowTitle(f'{self.app_name} · {Const.APP_NAME}')
 
         # Create a persistent profile (cookie jar etc.)
-        self.profile = QWebEngineProfile(self.args.profile, self)
-        self.page = QWebEnginePage(self.profile, self)
+        with Trace.span('profile'):
+            self.profile = QWebEngineProfile(self.args.profile, self)
+
+        self.log_file = Log.add_file(self.profile.persistentStoragePath())
 
-        self.dbug(f'Profile: {self.args.profile}')
-        self.dbug(f'Cache path: {self.profile.cachePath()}')
-        self.dbug(f'Persistent storage: {self.profile.persistentStoragePath()}')
+        log.debug('Profile: %s', self.args.profile)
+        log.debug('Cache path: %s', self.profile.cachePath())
+        log.debug('Persistent storage: %s', self.profile.persistentStoragePath())
+        log.debug('Log file: %s', self.log_file)
 
-        # Initialize bookmark manager with profile storage path
-        self.bookmark_manager = BookmarkManager(self.profile.persistentStoragePath())
+        ResourceProfile.apply(self.args.resource_profile, self.profile)
+
+        # Housekeeping work is done in the background, while the app is not in use.
+        self.scheduler = IdleScheduler(self, parent=self)
+
+        # Initialize bookmark manager with profile storage path. Changes are saved in the
+        # background, but no later than 30 seconds after, so other instances pick them up soon.
+        self.bookmark_manager = BookmarkManager(
+            self.profile.persistentStoragePath(),
+            defer_save=lambda save: self.scheduler.submit('bookmarks', save, IdleScheduler.PRIORITY_HIGH,
+                                                          max_delay=30))
 
         # Set Chrome-like user agent
         chrome_version = "115.0.5790.170"  # Using a recent stable Chrome version
@@ -98,56 +147,94 @@ class WebApp(QMainWindow):
         user_agent = f"Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/{webkit_version} (KHTML, like Gecko) Chrome/{chrome_version} Safari/{webkit_version}"
         self.agent = self.profile.setHttpUserAgent(user_agent)
 
+        self.notifications: Optional[NotificationCenter] = None
+        if self.args.notifications:
+            quiet_hours = QuietHours(*self.args.quiet_hours) if self.args.quiet_hours else None
+            if self.tray_icon:
+                self.notifications = NotificationCenter(self.tray_icon, self.args.name or Const.APP_NAME,
+                                                        rate_limit=self.args.notification_rate,
+                                                        quiet_hours=quiet_hours, parent=self)
+                self.notifications.clicked.connect(self.activate_window)
+                self.profile.setNotificationPresenter(self.notifications.present)
+            else:
+                log.warning('Notifications require tray icon and are not available with --no-tray')
+
+        self.cookie_policy: Optional[CookiePolicy] = None
+        if self.args.cookie_policy:
+            rules = CookiePolicy.load_rules(
+                os.path.join(self.profile.persistentStoragePath(), CookiePolicy.RULES_FILE_NAME))
+            self.cookie_policy = CookiePolicy(self.profile.cookieStore(), rules, self)
+
+        self.netstats: Optional[NetworkStats] = None
+        if self.args.netstats:
+            self.netstats = NetworkStats(
+                self.profile.persistentStoragePath(), self.args.slow_request_ms,
+                defer_save=lambda save: self.scheduler.submit('netstats', save, IdleScheduler.PRIORITY_LOW,
+                                                              max_delay=5 * 60),
+                parent=self)
+            self.profile.setUrlRequestInterceptor(self.netstats)
+
         # Create and configure the webpage
-        self.page = QWebEnginePage(self.profile, self)
-        # Connect permission request handler
-        self.page.featurePermissionRequested.connect(self.handle_permission_request)
+        self.tabs: Optional[TabbedBrowser] = None
+        self.router = self.create_router()
+        with Trace.span('user scripts'):
+            self.user_scripts = UserScriptManager(self.profile.persistentStoragePath())
+        self.history = None if self.args.no_history \
+            else HistoryStore(self.profile.persistentStoragePath(), max_age_days=self.args.history_days)
+        self.page_index: Optional[PageIndex] = None
+        self.page_search_dialog: Optional[PageSearchDialog] = None
+        if self.args.page_index:
+            self.page_index = PageIndex(self.profile.persistentStoragePath(),
+                                        max_bytes=self.args.page_index_size * 1024 * 1024)
+            self.setup_page_search_shortcut()
+        self.zoom_store = ZoomStore(
+            self.profile.persistentStoragePath(), self.args.zoom,
+            defer_save=lambda save: self.scheduler.submit('zoom', save, max_delay=60), parent=self)
+        self.content_settings = ContentSettings(self.profile.settings(), lite=self.args.lite)
+        self.content_settings.load_rules(
+            os.path.join(self.profile.persistentStoragePath(), ContentSettings.RULES_FILE_NAME))
+        self.popup_pool = PopupPool(self.profile, self, size=self.args.popup_pool, page_factory=self.create_page)
+        self.cache_warmer: Optional[CacheWarmer] = None
+        if self.args.cache_warm > 0:
+            self.cache_warmer = CacheWarmer(self.profile, self, self.bookmark_manager, self.history,
+                                            top_n=self.args.cache_warm,
+                                            byte_budget_mb=self.args.cache_warm_budget,
+                                            interval_minutes=self.args.cache_warm_interval, parent=self)
+        self.page = self.create_page()
+        self.page.loadFinished.connect(self.on_first_load_finished)
 
         # Handle downloads
         self.profile.downloadRequested.connect(self.on_download_requested)
 
-        # Modified to use CustomWebEngineView
-        if self.args.no_custom_webengine:
-            self.browser = QWebEngineView(self)
-        else:
-            self.browser = CustomWebEngineView(
-                self,
-                debug=self.args.debug,
-                app_name=self.app_name,
-                bookmark_manager=self.bookmark_manager,
-            )
-        self.browser.setPage(self.page)
-        self.browser.setZoomFactor(self.args.zoom)
-
-        web_settings = self.browser.settings()
+        self.browser = self.create_view(self.page)
 
-        # Enable all required clipboard permissions
-        web_settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptCanAccessClipboard,
-                                  True)
-        web_settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptCanPaste, True)
-        web_settings.setAttribute(
-            QWebEngineSettings.WebAttribute.AllowWindowActivationFromJavaScript, True)
         # Additional profile settings for clipboard
         self.profile.settings().setAttribute(
             QWebEngineSettings.WebAttribute.JavascriptCanAccessClipboard, True)
         self.profile.settings().setAttribute(QWebEngineSettings.WebAttribute.JavascriptCanPaste,
                                              True)
 
-        self.browser.setPage(self.page)
-        self.browser.setZoomFactor(self.args.zoom)
-
         # Ensure the browser widget can receive focus and key events
-        self.browser.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
         self.browser.setFocus()
 
-        self.dbug(f'URL: {self.args.url}')
-        self.browser.setUrl(QUrl(self.args.url))
+        log.debug('URL: %s', self.args.url)
+        Trace.begin('first load')
+        with Trace.span('setUrl'):
+            self.browser.setUrl(QUrl(self.args.url))
 
         # Window layout
         layout = QVBoxLayout()
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(0)
-        layout.addWidget(self.browser)
+        if self.args.tabs:
+            self.tabs = TabbedBrowser(self.create_tab_view, self.browser, self.app_name,
+                                      max_live=self.args.max_live_tabs,
+                                      discard_after=self.args.tab_discard_after, parent=self)
+            self.page.tab_factory = self.open_tab_page
+            self.setup_tab_shortcuts()
+            layout.addWidget(self.tabs)
+        else:
+            layout.addWidget(self.browser)
 
         central_widget = QWidget()
         central_widget.setLayout(layout)
@@ -159,15 +246,271 @@ class WebApp(QMainWindow):
         # Add this line to connect the search toolbar to the CustomWebEngineView
         if not self.args.no_custom_webengine:
             self.browser.set_search_toolbar(self.search_toolbar)
+        if self.tabs:
+            self.tabs.current_view_changed.connect(self.on_current_tab_changed)
+
+        if self.args.control:
+            self.start_control_server()
+
+        self.registry: Optional[InstanceRegistry] = None
+        try:
+            self.registry = InstanceRegistry(Utils.get_runtime_dir())
+            atexit.register(self.registry.unpublish)
+        except OSError as ex:
+            log.warning('Instance registry is not available, `webapp list` will not show this instance: %s', ex)
+        self.page.loadStarted.connect(self.publish_status)
+        self.page.loadFinished.connect(self.publish_status)
+        self.status_timer = QTimer(self)
+        self.status_timer.setInterval(self.STATUS_INTERVAL_MS)
+        self.status_timer.timeout.connect(self.publish_status)
+        self.status_timer.start()
+        self.publish_status()
+
+    def create_page(self, parent: Optional[QObject] = None) -> CustomWebEnginePage:
+        """
+        Creates new page using app's profile, with navigation routing and permission handling.
+        Used for the app page, tabs and popups alike.
+        """
+        page = CustomWebEnginePage(self.profile, parent if parent is not None else self, router=self.router)
+        page.popup_factory = self.open_popup
+        page.user_scripts = self.user_scripts
+        page.content_settings = self.content_settings
+        if self.tabs:
+            page.tab_factory = self.open_tab_page
+        if self.netstats:
+            self.netstats.attach(page)
+        if self.history:
+            page.urlChanged.connect(lambda url: self.history.record_visit(url.toString()))
+            page.titleChanged.connect(
+                lambda title, p=page: self.history.update_title(p.url().toString(), title))
+        if self.page_index:
+            page.loadFinished.connect(lambda ok, p=page: self.schedule_indexing(p) if ok else None)
+        page.featurePermissionRequested.connect(
+            lambda origin, feature, p=page: self.handle_permission_request(origin, feature, p))
+
+        # Enable all required clipboard permissions
+        web_settings = page.settings()
+        web_settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptCanAccessClipboard,
+                                  True)
+        web_settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptCanPaste, True)
+        web_settings.setAttribute(
+            QWebEngineSettings.WebAttribute.AllowWindowActivationFromJavaScript, True)
+        return page
+
+    def create_view(self, page: QWebEnginePage) -> QWebEngineView:
+        """
+        Creates browser view showing given page.
+        """
+        if self.args.no_custom_webengine:
+            view = QWebEngineView(self)
+        else:
+            view = CustomWebEngineView(
+                self,
+                debug=self.args.debug,
+                app_name=self.app_name,
+                bookmark_manager=self.bookmark_manager,
+                zoom_store=self.zoom_store,
+            )
+        view.setPage(page)
+        if self.args.perf_overlay and not self.args.no_custom_webengine:
+            view.enable_perf_overlay()
+        view.setZoomFactor(self.args.zoom)
+        view.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        return view
+
+    def create_tab_view(self) -> QWebEngineView:
+        """
+        Creates view (with its own page) for a new tab.
+        """
+        view = self.create_view(self.create_page())
+        if not self.args.no_custom_webengine:
+            view.set_search_toolbar(self.search_toolbar)
+        return view
+
+    def open_tab(self, url: QUrl, background: bool = True) -> None:
+        """
+        Opens URL in new tab.
+        """
+        self.tabs.open_tab(url, background)
+
+    def open_tab_page(self, background: bool = True) -> QWebEnginePage:
+        """
+        Opens new tab and returns its page, for the engine to open a new window in.
+        """
+        return self.tabs.open_page(background)
+
+    def on_current_tab_changed(self, view: QWebEngineView) -> None:
+        """
+        Makes search toolbar operate on the current tab.
+        """
+        self.search_toolbar.web_view = view
+
+    def setup_tab_shortcuts(self) -> None:
+        """
+        Adds keyboard shortcuts to open (with app URL) and close tabs.
+        """
+        new_tab_action = QAction("New Tab", self)
+        new_tab_action.setShortcut(QKeySequence.StandardKey.AddTab)
+        new_tab_action.triggered.connect(lambda: self.open_tab(QUrl(self.args.url), background=False))
+        self.addAction(new_tab_action)
+
+        close_tab_action = QAction("Close Tab", self)
+        close_tab_action.setShortcut(QKeySequence.StandardKey.Close)
+        close_tab_action.triggered.connect(self.tabs.close_current_tab)
+        self.addAction(close_tab_action)
+
+    def setup_page_search_shortcut(self) -> None:
+        """
+        Adds keyboard shortcut opening search of visited pages.
+        """
+        search_action = QAction('Search Visited Pages', self)
+        search_action.setShortcut(QKeySequence('Ctrl+Shift+F'))
+        search_action.triggered.connect(self.open_page_search)
+        self.addAction(search_action)
+
+    def schedule_indexing(self, page: QWebEnginePage) -> None:
+        """
+        Schedules extraction of loaded page's text for the page index. It is done once the user
+        is idle (or a minute later at the latest) and only if the page is still showing the same
+        URL, so quickly navigated through pages are skipped.
+        """
+        url = page.url()
+        self.scheduler.submit(f'index-page-{id(page)}', lambda: self.index_page(page, url),
+                              IdleScheduler.PRIORITY_LOW, max_delay=60, gui_thread=True)
+
+    def index_page(self, page: QWebEnginePage, url: QUrl) -> None:
+        try:
+            if page.url() != url or page.isLoading():
+                return
+        except RuntimeError:
+            # Page was closed in the meantime.
+            return
+        # Text is extracted by the renderer process and handed over asynchronously.
+        page.toPlainText(lambda text: self.page_index.add(url.toString(), page.title(), text))
+
+    def open_page_search(self) -> None:
+        """
+        Shows search of visited pages' text. Chosen page is opened in the current view.
+        """
+        if self.page_search_dialog is None:
+            self.page_search_dialog = PageSearchDialog(self.page_index, self)
+            self.page_search_dialog.open_url.connect(lambda url: self.current_view().setUrl(QUrl(url)))
+        self.activate_window()
+        self.page_search_dialog.show()
+        self.page_search_dialog.raise_()
+
+    def current_view(self) -> QWebEngineView:
+        """
+        Returns view of the current tab (or the only view, if tabs are disabled).
+        """
+        view = self.tabs.current_view() if self.tabs else None
+        return view if view is not None else self.browser
+
+    def start_control_server(self) -> None:
+        """
+        Starts local control API server listening on per-profile socket.
+        """
+        profile = Utils.sanitize_profile_name(self.args.profile)
+        if self.args.allow_multiple:
+            # Each instance running on the same profile needs its own socket.
+            profile += f'-{os.getpid()}'
+        socket_name = ControlServer.SOCKET_NAME_PATTERN.format(profile=profile)
+        try:
+            runtime_dir = Utils.get_runtime_dir()
+        except OSError as ex:
+            log.warning('Control API is not available: %s', ex)
+            return
+        self.control_server = ControlServer(self, os.path.join(runtime_dir, socket_name))
+        if not self.control_server.start():
+            self.control_server = None
+
+    def render_pids(self) -> List[int]:
+        """
+        Returns PIDs of the renderer processes of app's pages.
+        """
+        pids = self.tabs.render_pids() if self.tabs else [self.page.renderProcessPid()]
+        return sorted(pid for pid in set(pids) if pid > 0)
+
+    def publish_status(self) -> None:
+        """
+        Publishes status of this instance to the instance registry (see `webapp list`).
+        """
+        if self.registry is None:
+            return
+        children = self.render_pids()
+        view = self.current_view()
+        self.registry.publish({
+            'profile': self.args.profile,
+            'name': self.args.name,
+            'app_url': self.args.url,
+            'url': view.url().toString(),
+            'title': view.title(),
+            'started': self.started,
+            'state': 'loading' if view.page().isLoading() else 'loaded',
+            'visible': self.isVisible(),
+            'children': children,
+            'rss_kb': Utils.get_rss_kb(),
+            'children_rss_kb': sum(Utils.get_rss_kb(pid) or 0 for pid in children),
+            'control': self.control_server.socket_path if self.control_server else None,
+        })
+
+    def metrics(self) -> dict:
+        """
+        Returns runtime metrics of the app.
+        """
+        metrics = {
+            'pid': os.getpid(),
+            'renderer_pid': self.page.renderProcessPid(),
+            'renderer_rss_kb': Utils.get_rss_kb(self.page.renderProcessPid()),
+            'profile': self.args.profile,
+            'resource_profile': self.args.resource_profile,
+            'uptime': round(time.time() - self.started, 3),
+            'rss_kb': Utils.get_rss_kb(),
+            'popups': self.popup_pool.stats(),
+            'scheduler': self.scheduler.stats(),
+            'log_ring_entries': len(Log.ring.records) if Log.ring else 0,
+        }
+        if self.tabs:
+            metrics['tabs'] = self.tabs.stats()
+        return metrics
+
+    def create_router(self) -> Optional[NavigationRouter]:
+        """
+        Creates navigation router keeping app's own hosts (and the ones given with
+        --internal-host or listed in profile's navigation rules file) within the app.
+        Returns None if link routing is disabled.
+        """
+        if self.args.no_link_routing:
+            return None
+        rules_file = os.path.join(self.profile.persistentStoragePath(), NavigationRouter.RULES_FILE_NAME)
+        router = NavigationRouter.for_app(self.args.url, self.args.internal_host, rules_file)
+        log.debug('Navigation rules: %s', rules_file)
+        return router
+
+    def open_popup(self) -> QWebEnginePage:
+        """
+        Shows popup window sharing app's profile (taken from the popup pool) and returns its page.
+        """
+        return self.popup_pool.acquire().page
+
+    def on_first_load_finished(self) -> None:
+        """
+        Pre-warms popup pool and starts cache warmer once the app page is loaded, so they do not
+        slow down the startup.
+        """
+        self.page.loadFinished.disconnect(self.on_first_load_finished)
+        Trace.end('first load')
+        Trace.stop()
+        self.popup_pool.prewarm()
+        if self.cache_warmer:
+            self.cache_warmer.start()
 
     def acquire_lock(self) -> bool:
         """
         Acquires a lock for the current profile to prevent multiple instances.
         Returns True if lock was acquired, False otherwise.
         """
-        sanitized_profile = self.sanitize_profile_name(self.args.profile)
-        lock_file = os.path.join(os.path.expanduser("~"), f".websiteapp_{sanitized_profile}.lock")
-        self.lock = fasteners.InterProcessLock(lock_file)
+        self.lock = fasteners.InterProcessLock(Utils.get_lock_file(self.args.profile))
         if not self.lock.acquire(blocking=False):
             self.activate_existing_instance()
             return False
@@ -183,25 +526,14 @@ class WebApp(QMainWindow):
         Returns:
             str: A sanitized version of the profile name suitable for file paths.
         """
-        # Replace invalid characters with underscores
-        sanitized = re.sub(r'[\\/:*?"<>|]', '_', profile_name)
-
-        # Trim leading/trailing whitespace and ensure it's not empty
-        sanitized = sanitized.strip()
-
-        # Fallback to a default name if the sanitized profile is empty
-        if not sanitized:
-            sanitized = "default_profile"
-
-        return sanitized
+        return Utils.sanitize_profile_name(profile_name)
 
     def activate_existing_instance(self) -> None:
         """
         Sends a signal to the existing instance to activate its window.
         """
-        self.dbug(f"Bringing existing instance: {Const.APP_NAME}, profile: {self.args.profile}")
-        signal_file = os.path.join(os.path.expanduser("~"),
-                                   f".websiteapp_{self.args.profile}_signal")
+        log.debug('Bringing existing instance: %s, profile: %s', Const.APP_NAME, self.args.profile)
+        signal_file = Utils.get_activation_signal_file(self.args.profile)
         with open(signal_file, 'w') as f:
             f.write("activate")
 
@@ -210,20 +542,34 @@ class WebApp(QMainWindow):
         Sets up a file system watcher to listen for activation signals.
         """
         self.file_watcher = QFileSystemWatcher(self)
-        signal_file = os.path.join(os.path.expanduser("~"),
-                                   f".websiteapp_{self.args.profile}_signal")
+        signal_file = Utils.get_activation_signal_file(self.args.profile)
         self.file_watcher.addPath(os.path.dirname(signal_file))
         self.file_watcher.directoryChanged.connect(self.check_activation_signal)
 
-    def check_activation_signal(self, path):
+    def check_activation_signal(self, _path):
         """
         Checks for activation signals and brings the window to front if signal is received.
         """
-        signal_file = os.path.join(path, f".websiteapp_{self.args.profile}_signal")
+        signal_file = Utils.get_activation_signal_file(self.args.profile)
         if os.path.exists(signal_file):
             os.remove(signal_file)
             self.activate_window()
 
+    def setup_signal_handlers(self) -> None:
+        """
+        Makes SIGTERM (i.e. sent by `webapp stop`) and SIGINT quit the app cleanly. Python runs
+        signal handlers only when it gets control, which may not happen while Qt's event loop
+        waits, so signals also wake the loop up through a socket pair.
+        """
+        self.signal_sockets = socket.socketpair()
+        for sock in self.signal_sockets:
+            sock.setblocking(False)
+        signal.set_wakeup_fd(self.signal_sockets[1].fileno())
+        self.signal_notifier = QSocketNotifier(self.signal_sockets[0].fileno(), QSocketNotifier.Type.Read, self)
+        self.signal_notifier.activated.connect(lambda: self.signal_sockets[0].recv(64))
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda _signum, _frame: QTimer.singleShot(0, self.quit_app))
+
     def activate_window(self) -> None:
         """
         Brings the window to front and restores it if minimized.
@@ -267,6 +613,26 @@ class WebApp(QMainWindow):
         about_action.triggered.connect(self.open_about_dialog)
         tray_menu.addAction(about_action)
 
+        lite_action = QAction('Lite Mode', self)
+        lite_action.setCheckable(True)
+        lite_action.setChecked(self.args.lite)
+        lite_action.toggled.connect(self.set_lite_mode)
+        tray_menu.addAction(lite_action)
+
+        dump_log_action = QAction('Dump Recent Log', self)
+        dump_log_action.triggered.connect(self.dump_log)
+        tray_menu.addAction(dump_log_action)
+
+        if self.args.netstats:
+            netstats_action = QAction('Network Stats', self)
+            netstats_action.triggered.connect(self.show_netstats)
+            tray_menu.addAction(netstats_action)
+
+        if self.args.page_index:
+            search_action = QAction('Search Visited Pages', self)
+            search_action.triggered.connect(self.open_page_search)
+            tray_menu.addAction(search_action)
+
         show_label = f'Show {self.args.name}' if self.args.name else 'Show'
         show_action = QAction(show_label, self)
         show_action.triggered.connect(self.show)
@@ -278,11 +644,15 @@ class WebApp(QMainWindow):
         tray_menu.addAction(quit_action)
 
         tray_icon.show()
+        self.tray_icon = tray_icon
 
     def quit_app(self) -> None:
         """
         Closes the application.
         """
+        if self.control_server:
+            self.control_server.stop()
+            self.control_server = None
         if self.lock:
             self.lock.release()
             self.lock = None
@@ -313,24 +683,63 @@ class WebApp(QMainWindow):
         """
         self.hide() if self.isVisible() else self.show()
 
-    # ############################################################################################ #
+    def set_lite_mode(self, enabled: bool) -> None:
+        """
+        Toggles "lite" content settings preset and reloads the current page to apply it.
+        """
+        log.info('Lite mode: %s', 'on' if enabled else 'off')
+        self.content_settings.set_lite(enabled)
+        view = self.current_view()
+        self.content_settings.apply(view.page(), view.url().toString())
+        view.reload()
 
-    def dbug(self, msg: str) -> None:
-        if self.args.debug:
-            print(msg, file=sys.stderr)
+    def dump_log(self) -> None:
+        """
+        Writes recent log entries kept in memory to a file and opens it.
+        """
+        dump_file = os.path.join(os.path.dirname(self.log_file),
+                                 time.strftime('dump-%Y%m%d-%H%M%S.log'))
+        count = Log.dump_ring(dump_file)
+        log.info('Dumped %d log entries to %s', count, dump_file)
+        QDesktopServices.openUrl(QUrl.fromLocalFile(dump_file))
+
+    def show_netstats(self) -> None:
+        """
+        Writes network stats report to a file and opens it.
+        """
+        report_file = os.path.join(os.path.dirname(self.log_file),
+                                   time.strftime('netstats-%Y%m%d-%H%M%S.txt'))
+        with open(report_file, 'w', encoding='utf-8') as f:
+            f.write(NetworkStats.format_summary(self.netstats.summary()) + '\n')
+        QDesktopServices.openUrl(QUrl.fromLocalFile(report_file))
 
     # ############################################################################################ #
 
     @staticmethod
     def run() -> None:
         """
-        Application entry point. When renamed, ensure setup.py's reference is updated as well.
+        Starts the GUI app. Called by the entry point (see main.py), once it is known that the
+        arguments are not a maintenance command.
         """
-        app = QApplication(sys.argv)
-        app.setOrganizationName("MarcinOrlowski")
-        app.setApplicationName("Website As App")
+        # Check for --version before full argument parsing
+        if '--version' in sys.argv:
+            print(f'{Const.APP_NAME} {Const.APP_VERSION}')
+            sys.exit(0)
+
+        # Engine reads Chromium flags once, so arguments setting them (--resource-profile and
+        # --trace) must be known before QApplication is created.
+        args = Utils.handle_args()
+        ResourceProfile.set_flags(args.resource_profile)
+        if args.trace:
+            Trace.start(args.trace)
 
-        window = WebApp()
+        with Trace.span('QApplication'):
+            app = QApplication(sys.argv)
+        app.setOrganizationName(Const.APP_ORGANIZATION)
+        app.setApplicationName(Const.APP_NAME)
+
+        with Trace.span('WebApp'):
+            window = WebApp(args)
 
         if window.args.minimized and window.args.no_tray:
             # Cannot use --no-tray and --minimized at the same time. Ignoring --minimized
@@ -341,17 +750,34 @@ class WebApp(QMainWindow):
 
         exit_code = app.exec()
 
+        window.scheduler.close()
+        window.zoom_store.flush()
+        if window.history:
+            window.history.close()
+        if window.page_index:
+            window.page_index.close()
+        if window.netstats:
+            window.netstats.save()
+
+        if window.control_server:
+            window.control_server.stop()
+            window.control_server = None
+
         if window.lock:
             window.lock.release()
             window.lock = None
 
+        if Trace.enabled():
+            Trace.wait_for_chromium(app.processEvents)
+            Trace.finish()
+
         sys.exit(exit_code)
 
     def on_download_requested(self, download) -> None:
         """
         Handles file download requests from the web page.
         """
-        print('on_download_requested')
+        log.debug('Download requested: %s', download.downloadFileName())
         # Prompt the user to select a download location
         suggested_filename = download.downloadFileName()
         options = QFileDialog.Options()
@@ -364,13 +790,13 @@ class WebApp(QMainWindow):
         else:
             download.cancel()
 
-    def handle_permission_request(self, origin, feature) -> None:
+    def handle_permission_request(self, origin, feature, page: Optional[QWebEnginePage] = None) -> None:
         """
         Handle permission requests from the webpage.
         """
-        from PySide6.QtWebEngineCore import QWebEnginePage
-
-        self.dbug(f"Permission requested: {feature} from {origin}")
+        page = page if page is not None else self.page
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('Permission requested: %s from %s', feature, origin.toString())
 
         # Define all clipboard-related features
         clipboard_features = [
@@ -378,16 +804,23 @@ class WebApp(QMainWindow):
             QWebEnginePage.Feature.Clipboard,  # For backwards compatibility
         ]
 
-        if feature in clipboard_features:
-            self.dbug(f"Granting clipboard permission for feature: {feature}")
-            self.page.setFeaturePermission(
+        if feature == QWebEnginePage.Feature.Notifications and self.notifications:
+            log.debug('Granting notifications permission')
+            page.setFeaturePermission(
+                origin,
+                feature,
+                QWebEnginePage.PermissionPolicy.PermissionGrantedByUser
+            )
+        elif feature in clipboard_features:
+            log.debug('Granting clipboard permission for feature: %s', feature)
+            page.setFeaturePermission(
                 origin,
                 feature,
                 QWebEnginePage.PermissionPolicy.PermissionGrantedByUser
             )
         else:
-            self.dbug(f"Denying permission for feature: {feature}")
-            self.page.setFeaturePermission(
+            log.debug('Denying permission for feature: %s', feature)
+            page.setFeaturePermission(
                 origin,
                 feature,
                 QWebEnginePage.PermissionPolicy.PermissionDeniedByUser
@@ -16,29 +16,47 @@
 
 # Target file: websiteapp/custom_web_view.py
 
-import re
+import logging
 from typing import Optional
 
 from PySide6.QtWidgets import QMenu, QApplication, QMessageBox
 from PySide6.QtGui import QAction, QWheelEvent
 from PySide6.QtWebEngineCore import QWebEnginePage
 from PySide6.QtWebEngineWidgets import QWebEngineView
-from PySide6.QtCore import Qt, QUrl
+from PySide6.QtCore import Qt, QTimer, QUrl
 
 from websiteapp.bookmarks import BookmarkManager
+from websiteapp.clipboard import ClipboardWatcher
+from websiteapp.perf import PerfMonitor, PerfOverlay
+from websiteapp.utils import Utils
+from websiteapp.zoom import ZoomStore
+
+log = logging.getLogger(__name__)
 
 # Maximum length for bookmark title display in menu
 BOOKMARK_TITLE_MAX_LEN = 30
 
+# Zoom factor change per single wheel notch (angle delta of 120)
+ZOOM_STEP = 1.1
+# Pixel delta (i.e. from touchpads) equivalent of a single wheel notch
+ZOOM_PIXELS_PER_STEP = 60.0
+# Accumulated wheel deltas are applied at most once per that many milliseconds (~1 frame)
+ZOOM_APPLY_INTERVAL_MS = 16
+
 
 class CustomWebEngineView(QWebEngineView):
     def __init__(self, parent=None, debug=False, app_name=None,
-                 bookmark_manager: Optional[BookmarkManager] = None):
+                 bookmark_manager: Optional[BookmarkManager] = None,
+                 zoom_store: Optional[ZoomStore] = None):
         super().__init__(parent)
+        self.perf_monitor: Optional[PerfMonitor] = None
+        self.perf_overlay: Optional[PerfOverlay] = None
         self.debug = debug  # Store the debug flag to conditionally add the dump action
         self.loading = False  # Keep track of whether a page is loading
         self.search_toolbar = None  # Reference to search toolbar
         self.bookmark_manager = bookmark_manager
+        # Start tracking clipboard state early, so it is known once context menu is opened
+        ClipboardWatcher.instance()
 
         # Connect load progress to determine loading status
         self.loadStarted.connect(self.on_load_started)
@@ -48,8 +66,16 @@ class CustomWebEngineView(QWebEngineView):
         self._min_zoom = 0.25
         self._max_zoom = 5.0
 
-        # Store current zoom factor
-        self._current_zoom = 1.0
+        # Ctrl+wheel steps accumulated since zoom was last applied
+        self._pending_zoom_steps = 0.0
+        self._zoom_timer = QTimer(self)
+        self._zoom_timer.setSingleShot(True)
+        self._zoom_timer.setInterval(ZOOM_APPLY_INTERVAL_MS)
+        self._zoom_timer.timeout.connect(self.apply_pending_zoom)
+
+        # Per-host zoom factors, applied as soon as new page URL is committed (before first paint)
+        self.zoom_store = zoom_store
+        self.urlChanged.connect(self.on_url_changed)
 
         self.app_name = app_name if app_name else 'app'
 
@@ -84,24 +110,65 @@ class CustomWebEngineView(QWebEngineView):
         modifiers = QApplication.keyboardModifiers()
 
         if modifiers & Qt.KeyboardModifier.ControlModifier:
-            # Handle zooming with Ctrl+wheel
-            delta = event.angleDelta().y()
-            if delta > 0:
-                # Zoom in
-                new_zoom = min(self._current_zoom * 1.1, self._max_zoom)
+            # Handle zooming with Ctrl+wheel. Deltas are accumulated and applied at most once
+            # per frame, as each zoom change means full relayout of the page.
+            pixel_delta = event.pixelDelta().y()
+            if pixel_delta:
+                self._pending_zoom_steps += pixel_delta / ZOOM_PIXELS_PER_STEP
             else:
-                # Zoom out
-                new_zoom = max(self._current_zoom / 1.1, self._min_zoom)
-
-            if new_zoom != self._current_zoom:
-                self._current_zoom = new_zoom
-                self.setZoomFactor(self._current_zoom)
-
+                self._pending_zoom_steps += event.angleDelta().y() / 120.0
+            if not self._zoom_timer.isActive():
+                self._zoom_timer.start()
             event.accept()
         else:
             # Regular scrolling - pass the event to the parent class
             super().wheelEvent(event)
 
+    def apply_pending_zoom(self) -> None:
+        """
+        Applies zoom change accumulated from wheel events.
+        """
+        steps, self._pending_zoom_steps = self._pending_zoom_steps, 0.0
+        if not steps:
+            return
+        current_zoom = self.zoomFactor()
+        new_zoom = min(max(current_zoom * (ZOOM_STEP ** steps), self._min_zoom), self._max_zoom)
+        if abs(new_zoom - current_zoom) > 0.001:
+            self.setZoomFactor(new_zoom)
+            if self.zoom_store is not None:
+                self.zoom_store.set(self.url().host(), new_zoom)
+
+    def enable_perf_overlay(self) -> None:
+        """
+        Starts collecting page's jank metrics and shows them in the overlay panel. Must be called
+        once the page is set, as metrics are delivered through the page's bridge.
+        """
+        page = self.page()
+        if self.perf_monitor is not None or not hasattr(page, 'bridge'):
+            return
+        self.perf_monitor = PerfMonitor(page, self)
+        self.perf_overlay = PerfOverlay(self.perf_monitor, self)
+        self.perf_overlay.show()
+
+    def toggle_perf_overlay(self, visible: bool) -> None:
+        if self.perf_overlay:
+            self.perf_overlay.setVisible(visible)
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        if self.perf_overlay:
+            self.perf_overlay.place()
+
+    def on_url_changed(self, url: QUrl) -> None:
+        """
+        Applies zoom factor stored for the new URL's host.
+        """
+        if self.zoom_store is None or not url.host():
+            return
+        zoom = self.zoom_store.get(url.host())
+        if abs(self.zoomFactor() - zoom) > 0.001:
+            self.setZoomFactor(zoom)
+
     def contextMenuEvent(self, event):
         menu = QMenu(self)
 
@@ -149,11 +216,9 @@ class CustomWebEngineView(QWebEngineView):
         paste_url_action = QAction("Open URL from Clipboard", self)
         paste_url_action.triggered.connect(self.paste_url_from_clipboard)
 
-        # Check if clipboard contains a valid URL
-        if self.is_valid_url_in_clipboard():
-            paste_url_action.setEnabled(True)
-        else:
-            paste_url_action.setEnabled(False)
+        # Check if clipboard contains a valid URL (state is tracked by the watcher, so
+        # the menu never waits for the clipboard content)
+        paste_url_action.setEnabled(self.is_valid_url_in_clipboard())
 
         menu.addAction(paste_url_action)
 
@@ -197,6 +262,13 @@ class CustomWebEngineView(QWebEngineView):
 
             menu.addMenu(bookmarks_menu)
 
+        if self.perf_overlay:
+            perf_action = QAction("Performance Overlay", self)
+            perf_action.setCheckable(True)
+            perf_action.setChecked(self.perf_overlay.isVisible())
+            perf_action.toggled.connect(self.toggle_perf_overlay)
+            menu.addAction(perf_action)
+
         # # If debug mode is enabled, add the "Dump Back Stack" option
         # if self.debug:
         #     dump_stack_action = QAction("Dump Back Stack", self)
@@ -239,11 +311,9 @@ class CustomWebEngineView(QWebEngineView):
         """
         Pastes a URL from the clipboard into the web client if valid. Otherwise, shows an error dialog.
         """
-        clipboard = QApplication.clipboard()
-        clipboard_text = clipboard.text()
-
-        if self.is_valid_url(clipboard_text):
-            self.setUrl(clipboard_text)
+        url = ClipboardWatcher.instance().url
+        if url is not None:
+            self.setUrl(QUrl(url))
         else:
             QMessageBox.warning(self, "Invalid URL", "No valid URL in clipboard found.")
 
@@ -251,11 +321,11 @@ class CustomWebEngineView(QWebEngineView):
         """
         Dumps the list of all pages that can be navigated back to.
         """
+        if not log.isEnabledFor(logging.DEBUG):
+            return
         history = self.history()
         back_items = history.backItems(history.count())
-        print("Back Stack:")
-        for item in back_items:
-            print(f"  - {item.url().toString()}")
+        log.debug('Back stack:%s', ''.join(f'\n  - {item.url().toString()}' for item in back_items))
 
     def quit_app(self):
         """
@@ -267,19 +337,11 @@ class CustomWebEngineView(QWebEngineView):
         """
         Checks if the clipboard contains a valid URL.
         """
-        clipboard = QApplication.clipboard()
-        clipboard_text = clipboard.text()
-        return self.is_valid_url(clipboard_text)
+        return ClipboardWatcher.instance().has_url
 
     @staticmethod
     def is_valid_url(url):
         """
         Validates if the given string is a valid URL.
         """
-        url_pattern = re.compile(
-            r'^(https?|ftp)://'  # http:// or https:// or ftp://
-            r'(\w+(\-\w+)*\.)+[a-zA-Z]{2,}'  # domain name
-            r'(:\d+)?'  # optional port
-            r'(\/[^\s]*)?$'  # optional path
-        )
-        return bool(url_pattern.match(url))
+        return Utils.is_valid_url(url)
@@ -0,0 +1,122 @@
+"""
+##################################################################################
+#
+# Website As App
+# Run any website as standalone desktop application
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2023-2026 Marcin Orlowski
+# @license   https://www.opensource.org/licenses/mit-license.php MIT
+# @link      https://github.com/MarcinOrlowski/website-as-app
+#
+# @file      websiteapp/zoom.py
+#
+##################################################################################
+"""
+
+import json
+import logging
+import os
+from typing import Dict, Optional
+
+from PySide6.QtCore import QObject, QTimer
+
+from websiteapp.deferred import DeferredSave, SaveDeferrer
+
+log = logging.getLogger(__name__)
+
+
+class ZoomStore(QObject, DeferredSave):
+    """
+    Per-host zoom factors, persisted in profile's `zoom.json`. Hosts without stored factor use
+    the default one (as given with --zoom). Writes are debounced, so a zoom gesture results in
+    a single file write, and can be deferred (see DeferredSave).
+    """
+
+    FILE_NAME = 'zoom.json'
+    # Delay (in milliseconds) between the last change and writing the file.
+    SAVE_DELAY_MS = 1000
+
+    def __init__(self, storage_path: str, default_zoom: float = 1.0,
+                 defer_save: Optional[SaveDeferrer] = None, parent=None):
+        """
+        Initialize the zoom store.
+
+        Args:
+            storage_path: Profile storage directory
+            default_zoom: Zoom factor for hosts without stored one
+            defer_save: Runs saves later (see DeferredSave). Changes are saved once debounced
+                        if not given.
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self.storage_path = storage_path
+        self.zoom_file = os.path.join(storage_path, self.FILE_NAME)
+        self.default_zoom = default_zoom
+        self.defer_save = defer_save
+        self._zoom: Dict[str, float] = {}
+        self._load()
+
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(self.SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self._request_save)
+
+    def _load(self) -> None:
+        if not os.path.exists(self.zoom_file):
+            return
+        try:
+            with open(self.zoom_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._zoom = {str(host): float(factor) for host, factor in data.items()}
+        except (json.JSONDecodeError, IOError, AttributeError, TypeError, ValueError) as ex:
+            log.warning('Unable to load zoom factors from %s: %s', self.zoom_file, ex)
+            self._zoom = {}
+
+    def _request_save(self) -> None:
+        # Factors are copied here, as deferred save may run on another thread.
+        zoom = dict(self._zoom)
+        self.request_save(lambda: self._write(zoom))
+
+    def save(self) -> None:
+        """
+        Writes zoom factors to the file.
+        """
+        self._save_timer.stop()
+        self._write(dict(self._zoom))
+
+    def _write(self, zoom: Dict[str, float]) -> None:
+        os.makedirs(self.storage_path, exist_ok=True)
+        tmp_file = f'{self.zoom_file}.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(zoom, f, indent=2)
+        os.replace(tmp_file, self.zoom_file)
+
+    def flush(self) -> None:
+        """
+        Writes pending changes (if any) immediately.
+        """
+        if self._save_timer.isActive():
+            self.save()
+
+    def get(self, host: str) -> float:
+        """
+        Returns zoom factor for given host.
+        """
+        return self._zoom.get(host.lower(), self.default_zoom)
+
+    def set(self, host: str, factor: float) -> None:
+        """
+        Stores zoom factor for given host. Factor equal to the default one removes the entry.
+        """
+        if not host:
+            return
+        host = host.lower()
+        factor = round(factor, 3)
+        if abs(factor - self.default_zoom) < 0.001:
+            changed = self._zoom.pop(host, None) is not None
+        else:
+            changed = self._zoom.get(host) != factor
+            self._zoom[host] = factor
+        if changed:
+            self._save_timer.start()